@@ -1,40 +1,51 @@
 # app.py
-from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Header, Request, APIRouter, Body
+from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Header, Request, APIRouter, Body, WebSocket, WebSocketDisconnect
 from backend.models.user_model import UserSchema
-from backend.database import users_collection, interviews_collection
+from backend.data_access import store
+from backend.db_migrations import ensure_indexes, migrate_dates
+from backend.serialization import FastJSONResponse
 from datetime import datetime
 from pydantic import BaseModel
 from backend.auth import get_current_user, get_current_user_full
 from fastapi.middleware.cors import CORSMiddleware
 from backend.interview_session import InterviewSession
-from backend.resume_parser import parse_resume_with_llm
-from backend.coding_session import CodingSession
-from backend.speech_to_text import transcribe
-from langchain_ollama import OllamaLLM  
+from backend.resume_cache import parse_resume_cached
+from backend.coding_session import CodingSession, public_problem, public_results
+from backend.code_runner import code_runner
+from backend.controller_model import controller_batcher
+from backend.transcription_service import transcription_service, transcribe_async, TranscriptionQueueFull
+from backend.llm_gateway import ainvoke, LLMUnavailable
+from backend.llm_cache import llm_cache
+from backend.model_registry import registry
+from fastapi.responses import JSONResponse
 from uuid import uuid4
 from backend.interview_session import InterviewSession
+from backend.audio_pipeline import analyze_answer, decode_audio, AudioDecodeError, SAMPLE_RATE
+from backend.streaming_asr import StreamingTranscriber
 from backend.confidence_utils import get_confidence_score
 from typing import Optional
-from bson import ObjectId
 from backend.routes import dashboard
 
+import asyncio
 import json
 import numpy as np
 from backend.hr_session import HRInterviewSession
+from backend.session_store import user_sessions
+from backend.turn import history_to_dicts
 from backend.routes.user import router as user_router
+from backend.routes.metrics import router as metrics_router
 
 from langchain_core.prompts import PromptTemplate
-import tempfile
 import os
 import uvicorn
 import subprocess
 
 app = FastAPI()
-user_sessions = {}
 
 router = APIRouter()
 app.include_router(user_router)
 app.include_router(dashboard.router)
+app.include_router(metrics_router)
 
 # CORS setup
 app.add_middleware(
@@ -43,9 +54,103 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*", "X-User-Id", "X-User-Email"],  # ✅ explicitly allow Clerk headers
+    expose_headers=["X-Next-Cursor"],  # pagination cursor for /api/interviews and dashboard history
 )
 
 
+async def create_indexes():
+    try:
+        await asyncio.to_thread(ensure_indexes)
+    except Exception as e:
+        print(f"❌ Index bootstrap failed: {e}")
+    try:
+        # Leftover ISO-string dates; a no-op once every interview is migrated
+        migrated, _ = await asyncio.to_thread(migrate_dates)
+        if migrated:
+            print(f"✅ Migrated {migrated} interview dates to BSON datetimes")
+    except Exception as e:
+        print(f"❌ Date migration failed: {e}")
+
+
+@app.on_event("startup")
+async def start_index_bootstrap():
+    # Not awaited, so an unreachable Mongo can't hold startup for serverSelectionTimeoutMS
+    app.state.index_bootstrap = asyncio.create_task(create_indexes())
+
+
+@app.on_event("startup")
+async def start_model_warmup():
+    # In the background, so /healthz answers while Whisper and the embedding model load
+    app.state.model_warmup = asyncio.create_task(registry.warm_up())
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once every warm model is loaded, 503 (with per-model state) until then."""
+    ready = registry.ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "warming", "models": registry.status()},
+    )
+
+
+SESSION_SWEEP_INTERVAL = 60  # seconds
+
+
+async def sweep_idle_sessions():
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        try:
+            await asyncio.to_thread(user_sessions.sweep)
+            await asyncio.to_thread(llm_cache.purge)
+        except Exception as e:
+            print(f"❌ Session sweep failed: {e}")
+
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    app.state.session_sweeper = asyncio.create_task(sweep_idle_sessions())
+
+
+@app.on_event("shutdown")
+def stop_transcription_pool():
+    transcription_service.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_code_runner():
+    await code_runner.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_data_store():
+    await store.close()
+
+
+@app.on_event("shutdown")
+def stop_controller_batcher():
+    controller_batcher.close()
+
+
+@app.exception_handler(LLMUnavailable)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailable):
+    print(f"❌ {exc}")
+    return JSONResponse(status_code=503, content={"detail": "The interviewer model is busy. Please retry in a moment."})
+
+
+async def transcribe_or_503(audio):
+    try:
+        return await transcribe_async(audio)
+    except TranscriptionQueueFull:
+        raise HTTPException(status_code=503, detail="Transcription queue is full. Please retry shortly.")
+
+
 class CodeSubmission(BaseModel):
     code: str
 
@@ -61,9 +166,10 @@ class CodeSubmission(BaseModel):
 async def setup_session(
 
     body: dict = Body(None),
-    user: str = Depends(get_current_user)
+    user_data: dict = Depends(get_current_user_full)
 
 ):
+    user = user_data["clerkId"]
     
     if body:
         print("📦 JSON BODY RECEIVED:", body)
@@ -82,11 +188,7 @@ async def setup_session(
 
     session_id = str(uuid4())
 
-    # Load parsed resume text from DB using clerkId
-    user_data = users_collection.find_one({"clerkId": user})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found")
-
+    # Parsed resume fields come with the (cached) user document
     resume = {
         "name": user_data.get("name", ""),
         "skills": user_data.get("skills", []),
@@ -125,16 +227,16 @@ async def setup_session(
 
     # Session setup logic
     if interview_type == "technical":
-        user_sessions[user] = InterviewSession(role=role, resume_obj=resume_text, rounds=rounds, session_id=session_id)
+        user_sessions.put(user, InterviewSession(role=role, resume_obj=resume_text, rounds=rounds, session_id=session_id))
 
     elif interview_type == "behavioral":
-        user_sessions[user] = HRInterviewSession(role=role, rounds=rounds, session_id=session_id)
+        user_sessions.put(user, HRInterviewSession(role=role, rounds=rounds, session_id=session_id))
 
     elif interview_type == "coding":
         # Skip coding round for frontend roles if desired
         if role.lower() == "frontend developer":
             raise HTTPException(status_code=400, detail="Frontend developers do not have coding rounds.")
-        user_sessions[user] = CodingSession(role=role, rounds=rounds)
+        user_sessions.put(user, CodingSession(role=role, rounds=rounds))
 
     elif interview_type == "full":
         session_data = {
@@ -148,7 +250,7 @@ async def setup_session(
         if role.lower() != "frontend developer":
             session_data["code"] = CodingSession(role=role, rounds=rounds)
 
-        user_sessions[user] = session_data
+        user_sessions.put(user, session_data)
 
     else:
         raise HTTPException(status_code=400, detail="Invalid interview type")
@@ -159,13 +261,9 @@ async def setup_session(
 
 @app.post("/api/parse-resume")
 async def parse_resume_endpoint(resume: UploadFile = File(...), user: str = Depends(get_current_user)):
-    # Save resume to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        contents = await resume.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
-
-    result = parse_resume_with_llm(tmp_path)
+    # Parsed in memory; repeat uploads of the same file come from the cache
+    contents = await resume.read()
+    result = await parse_resume_cached(contents)
 
     if "error" in result:
         raise HTTPException(status_code=400, detail="Resume parsing failed")
@@ -180,44 +278,30 @@ async def handle_audio(audio: UploadFile = File(...), focus_score: Optional[floa
     if not session_info:
         raise HTTPException(status_code=404, detail="No active session")
 
-    # Save audio
     contents = await audio.read()
-    tmp_path = f"temp_{uuid4().hex}.wav"
-
-
-
-    with open(tmp_path, "wb") as f:
-        f.write(contents)
-    if os.path.getsize(tmp_path) < 1000:  # roughly <1KB = empty/silent
-        os.remove(tmp_path)
+    if len(contents) < 1000:  # roughly <1KB = empty/silent
         # Return initial question instead of transcribing
-        session = user_sessions[user]
+        session = session_info.get(session_info["current"]) if isinstance(session_info, dict) else session_info
         
-        first_question = session.ask_question()
+        first_question = await session.ask_question()
+        user_sessions.put(user, session_info)
         return {"text": first_question, "answer": "", "confidence": 0.0}
 
-    answer = transcribe(tmp_path)
-    """
-    wav_path=f"temp_wav_{uuid4().hex}.wav"
-    cmd = [
-        "ffmpeg", "-y",
-        "-fflags", "+genpts",
-        "-i", tmp_path,
-        "-acodec", "pcm_s16le",
-        "-ac", "1",
-        "-ar", "16000",
-        wav_path
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    print("FFMPEG STDERR:", result.stderr)
+    # Decode once in memory; Whisper and confidence scoring share the buffer
+    try:
+        answer, confidence = await analyze_answer(contents)
+    except AudioDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode audio: {e}")
+    except TranscriptionQueueFull:
+        raise HTTPException(status_code=503, detail="Transcription queue is full. Please retry shortly.")
 
-"""
-    confidence = get_confidence_score(tmp_path)
+    result = await advance_interview(session_info, answer, confidence, focus_score)
+    user_sessions.put(user, session_info)
+    return result
 
-    # cleanup
-    os.remove(tmp_path)
-    #os.remove(wav_path)
 
+async def advance_interview(session_info, answer, confidence, focus_score):
+    """Record an answer and its metrics on the session and return the next prompt."""
     # Get the current session object
     if isinstance(session_info, dict):
         session = session_info.get(session_info.get("current"))
@@ -243,15 +327,15 @@ async def handle_audio(audio: UploadFile = File(...), focus_score: Optional[floa
 
             if answer.strip():
                 session.provide_answer(answer)
-                next_q = session.ask_question()
+                next_q = await session.ask_question()
                 return {"text": next_q, "answer": answer, "confidence": confidence}
             
-            first_question = session.ask_question()
+            first_question = await session.ask_question()
             return {"text": first_question, "answer": "", "confidence": confidence}
 
         # Process answer
         session.provide_answer(answer)
-        next_q = session.ask_question()
+        next_q = await session.ask_question()
 
         if next_q:
             return {"text": next_q, "answer": answer, "confidence": confidence}
@@ -279,14 +363,14 @@ async def handle_audio(audio: UploadFile = File(...), focus_score: Optional[floa
 
             if answer.strip():
                 session.provide_answer(answer)
-                next_q = session.ask_question()
+                next_q = await session.ask_question()
                 return {"text": next_q, "answer": answer, "confidence": confidence}
             
-            first_question = session.ask_question()
+            first_question = await session.ask_question()
             return {"text": first_question, "answer": "", "confidence": confidence}
 
         session.provide_answer(answer)
-        next_q = session.ask_question()
+        next_q = await session.ask_question()
 
         if next_q:
             return {"text": next_q, "answer": answer, "confidence": confidence}
@@ -294,32 +378,141 @@ async def handle_audio(audio: UploadFile = File(...), focus_score: Optional[floa
             return {"text": "The interview is complete. Thank you!", "answer": answer, "confidence": confidence}
 
 
+@app.websocket("/ws/audio")
+async def stream_audio(websocket: WebSocket, user_id: str = None, email: str = None):
+    """
+    Streaming version of /api/audio.
+
+    Browsers can't set headers on a WebSocket, so the Clerk id/email come as
+    query params. The client sends binary frames of 16 kHz mono PCM16 while
+    the candidate talks; finished segments are transcribed as pauses are
+    detected. The answer is finalized when the VAD hears END_SILENCE_MS of
+    silence or the client sends {"event": "stop", "focus_score": ...}.
+
+    Server messages:
+      {"event": "partial", "text": ...}   transcript of the segments done so far
+      {"event": "final", "text": next_question, "answer": ..., "confidence": ...}
+      {"event": "error", "detail": ...}   malformed control message or lost session
+    """
+    await websocket.accept()
+    try:
+        user = await get_current_user(x_user_id=user_id, x_user_email=email)
+    except HTTPException as e:
+        await websocket.close(code=4401, reason=e.detail)
+        return
+
+    if not user_sessions.get(user):
+        await websocket.close(code=4404, reason="No active session")
+        return
+
+    streamer = StreamingTranscriber()
+    focus_score = 1.0
+    last_partial = ""
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            stop = False
+            if message.get("bytes"):
+                stop = streamer.feed(message["bytes"])
+            elif message.get("text"):
+                try:
+                    event = json.loads(message["text"])
+                    focus_score = float(event.get("focus_score", focus_score))
+                    stop = event.get("event") == "stop"
+                except (ValueError, TypeError, AttributeError, KeyError):
+                    await websocket.send_json({"event": "error", "detail": "Malformed control message"})
+                    continue
+
+            partial = streamer.completed_text()
+            if partial != last_partial:
+                last_partial = partial
+                await websocket.send_json({"event": "partial", "text": partial})
+
+            if not stop:
+                continue
+
+            # End of speech: only the last short segment is still in flight
+            answer, confidence = await asyncio.gather(
+                streamer.finish(),
+                asyncio.to_thread(get_confidence_score, streamer.audio, SAMPLE_RATE),
+            )
+            # Re-read the session: HTTP routes may have changed it during the answer
+            session_info = user_sessions.get(user)
+            if not session_info:
+                await websocket.send_json({"event": "error", "detail": "No active session"})
+                await websocket.close(code=4404, reason="No active session")
+                break
+            result = await advance_interview(session_info, answer, confidence, focus_score)
+            user_sessions.put(user, session_info)
+            await websocket.send_json({"event": "final", **result})
+
+            # Ready for the next answer on the same connection
+            streamer = StreamingTranscriber()
+            last_partial = ""
+
+    except WebSocketDisconnect:
+        pass
+    except (TranscriptionQueueFull, LLMUnavailable) as e:
+        print(f"❌ /ws/audio: {e}")
+        await websocket.close(code=1013, reason="Server busy, please retry")
+    finally:
+        streamer.cancel()
+
+
+# In-flight report builds, so concurrent GETs for one user share a single run
+_report_tasks = {}
+
+
+def _report_meta(session_info):
+    """Where the finished report is memoized: the full-mode envelope or the single session."""
+    if isinstance(session_info, dict):
+        return session_info.setdefault("meta", {})
+    if not hasattr(session_info, "meta") or session_info.meta is None:
+        session_info.meta = {}
+    return session_info.meta
+
+
 @app.get("/api/feedback")
-def get_feedback(user: str = Depends(get_current_user)):
+async def get_feedback(user: str = Depends(get_current_user)):
     session_info = user_sessions.get(user)
 
     if not session_info:
         raise HTTPException(status_code=404, detail="No active session")
 
+    meta = _report_meta(session_info)
+    if meta.get("report"):
+        return meta["report"]
+
+    task = _report_tasks.get(user)
+    if task is None:
+        task = asyncio.ensure_future(build_report(user, session_info, meta))
+        _report_tasks[user] = task
+        task.add_done_callback(lambda _: _report_tasks.pop(user, None))
+
+    # shield: a client disconnect shouldn't cancel the build other requests are awaiting
+    return await asyncio.shield(task)
+
+
+async def build_report(user, session_info, meta):
+    """Generate every round's feedback concurrently, save the interview once and memoize it."""
     feedback_data = {}
     transcript_data = ""
 
-    session = session_info if not isinstance(session_info, dict) else session_info.get(session_info["current"])
-    if not hasattr(session, "meta") or session.meta is None:
-        session.meta = {}
-
     # ----------- Build Feedback + Transcript -----------
     if isinstance(session_info, dict) and session_info.get("mode") == "full":
-        tech_fb = session_info["tech"].generate_feedback()
-        hr_fb = session_info["hr"].generate_feedback()
-        feedback_data = {
-            "technical": tech_fb,
-            "behavioral": hr_fb
+        jobs = {
+            "technical": session_info["tech"].generate_feedback(),
+            "behavioral": session_info["hr"].generate_feedback(),
         }
-
         if "code" in session_info:
-            code_fb = session_info["code"].generate_feedback()
-            feedback_data["coding"] = code_fb
+            jobs["coding"] = session_info["code"].generate_feedback()
+
+        results = await asyncio.gather(*jobs.values())
+        feedback_data = dict(zip(jobs.keys(), results))
 
         transcript_data = "\n".join([
             f"Q: {q['question']}\nA: {q['answer']}"
@@ -327,7 +520,8 @@ def get_feedback(user: str = Depends(get_current_user)):
         ])
 
     else:
-        summary = session.generate_feedback()
+        session = session_info
+        summary = await session.generate_feedback()
         feedback_data = json.loads(summary) if isinstance(summary, str) else summary
 
         transcript_data = "\n".join([
@@ -349,12 +543,12 @@ def get_feedback(user: str = Depends(get_current_user)):
         avg_focus = float(np.mean(session.meta.get("focus_scores", [])))
 
     # ----------- Save Interview Once -----------
-    inserted_id = None
-    if not session.meta.get("feedback_saved"):
+    inserted_id = meta.get("inserted_id")
+    if not meta.get("feedback_saved"):
         doc = {
             "userId": user,
             "role": session_info["tech"].role if isinstance(session_info, dict) else session.role,
-            "date": datetime.now().isoformat(),
+            "date": datetime.now(),  # BSON date, so time-range filters use the userId_date index
             "mode": session_info["mode"] if isinstance(session_info, dict) else getattr(session_info, "round_type", "custom"),
             "transcript": transcript_data,
             "feedback": feedback_data,
@@ -362,97 +556,26 @@ def get_feedback(user: str = Depends(get_current_user)):
             "average_focus": avg_focus
         }
 
-        result = interviews_collection.insert_one(doc)
-        inserted_id = str(result.inserted_id)
-
-        session.meta["feedback_saved"] = True
-        session.meta["inserted_id"] = inserted_id
+        inserted_id = await store.insert_interview(doc)
+        try:
+            await store.record_interview(doc)
+        except Exception as e:
+            # Stats can be rebuilt from interviews; never fail the report over them
+            print(f"❌ Could not update user stats for {user}: {e}")
 
-    else:
-        inserted_id = session.meta.get("inserted_id")
+        meta["feedback_saved"] = True
+        meta["inserted_id"] = inserted_id
 
-    # ----------- Return Everything Needed by Frontend -----------
-    return {
+    # ----------- Memoize Everything Needed by Frontend -----------
+    meta["report"] = {
         "id": inserted_id,
         "feedback": feedback_data,
         "average_confidence": avg_conf,
         "average_focus": avg_focus,
         "transcript": transcript_data,
     }
-
-    session_info = user_sessions.get(user)
-
-    if not session_info:
-        raise HTTPException(status_code=404, detail="No active session")
-
-    feedback_data = {}
-    transcript_data = ""
-
-    session = session_info if not isinstance(session_info, dict) else session_info.get(session_info["current"])
-    if not hasattr(session, "meta") or session.meta is None:
-        session.meta = {}
-
-    if isinstance(session_info, dict) and session_info.get("mode") == "full":
-        tech_fb = session_info["tech"].generate_feedback()
-        hr_fb = session_info["hr"].generate_feedback()
-
-        feedback_data = {
-            "technical": tech_fb,
-            "behavioral": hr_fb
-        }
-
-        if "code" in session_info:
-            code_fb = session_info["code"].generate_feedback()
-            feedback_data["coding"] = code_fb
-
-        transcript_data = "\n".join([
-            f"Q: {q['question']}\nA: {q['answer']}"
-            for q in session_info["tech"].history + session_info["hr"].history
-        ])
-
-    else:
-        summary = session.generate_feedback()
-        feedback_data = json.loads(summary) if isinstance(summary, str) else summary
-
-        transcript_data = "\n".join([
-            f"Q: {q['question']}\nA: {q['answer']}"
-            for q in session.history
-        ])
-
-    # Collect average metrics
-    if isinstance(session_info, dict):
-        all_conf, all_focus = [], []
-        for key in ["tech", "hr"]:
-            scores = getattr(session_info[key], "meta", {})
-            all_conf += scores.get("confidence_scores", [])
-            all_focus += scores.get("focus_scores", [])
-        avg_conf = float(np.mean(all_conf)) if all_conf else 0.0
-        avg_focus = float(np.mean(all_focus)) if all_focus else 0.0
-    else:
-        avg_conf = float(np.mean(session.meta.get("confidence_scores", [])))
-        avg_focus = float(np.mean(session.meta.get("focus_scores", [])))
-
-    # PREVENT DUPLICATE SAVES
-    if not session.meta.get("feedback_saved"):
-        interviews_collection.insert_one({
-            "userId": user,  # This is now clerkId
-            "role": session_info["tech"].role if isinstance(session_info, dict) else session.role,
-            "date": datetime.now().isoformat(),
-            "mode": session_info["mode"] if isinstance(session_info, dict) else getattr(session_info, "round_type", "custom"),
-            "transcript": transcript_data,
-            "feedback": feedback_data,
-            "average_confidence": avg_conf,
-            "average_focus": avg_focus
-        })
-        session.meta["feedback_saved"] = True
-    else:
-        print("🛑 Feedback already saved. Skipping DB insert.")
-
-    return {
-        **feedback_data,
-        "average_confidence": avg_conf,
-        "average_focus": avg_focus,
-    }
+    user_sessions.put(user, session_info)
+    return meta["report"]
 
 
 @app.get("/api/coding-problem")
@@ -479,10 +602,11 @@ def get_coding_problem(user: str = Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="No coding session active.")
 
     problem = session.get_next_problem()
+    user_sessions.put(user, session_info)
     if not problem:
         raise HTTPException(status_code=204, detail="No more coding problems.")
 
-    return problem
+    return public_problem(problem)
 
 
 @app.post("/api/submit-code")
@@ -496,28 +620,32 @@ async def submit_code(request: Request, user: str = Depends(get_current_user)):
 
     if isinstance(session_info, dict) and session_info.get("mode") == "full":
         session = session_info.get("code")
-        session.submit_solution(code)
+        results = public_results(await session.submit_solution(code))
 
         next_problem = session.get_next_problem()
         if next_problem:
-            return {"next": True, "problem": next_problem}
+            user_sessions.put(user, session_info)
+            return {"next": True, "problem": public_problem(next_problem), "results": results}
 
         session_info["current"] = "hr"
+        user_sessions.put(user, session_info)
         return {
             "next": False,
-            "message": "Coding round complete. Moving to HR."
+            "message": "Coding round complete. Moving to HR.",
+            "results": results
         }
 
     elif isinstance(session_info, CodingSession):
-        session_info.submit_solution(code)
-        return {"next": False, "message": "Thanks for your submission."}
+        results = public_results(await session_info.submit_solution(code))
+        user_sessions.put(user, session_info)
+        return {"next": False, "message": "Thanks for your submission.", "results": results}
 
     else:
         raise HTTPException(status_code=400, detail="Invalid coding session")
 
 
 from langchain_core.prompts import ChatPromptTemplate
-from backend.llm_groq_config import code_llm
+from backend.llm_groq_config import get_code_llm
 
 @app.post("/api/code-explanation")
 async def handle_code_explanation(audio: UploadFile = File(...), user: str = Depends(get_current_user)):
@@ -534,12 +662,12 @@ async def handle_code_explanation(audio: UploadFile = File(...), user: str = Dep
         raise HTTPException(status_code=400, detail="Not in coding session")
 
     contents = await audio.read()
-    tmp_path = f"temp_explain_{uuid4().hex}.wav"
-    with open(tmp_path, "wb") as f:
-        f.write(contents)
+    try:
+        samples = await asyncio.to_thread(decode_audio, contents)
+    except AudioDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode audio: {e}")
 
-    user_text = transcribe(tmp_path)
-    os.remove(tmp_path)
+    user_text = await transcribe_or_503(samples)
 
     session.explanation_history.append({"user": user_text})
 
@@ -557,9 +685,10 @@ async def handle_code_explanation(audio: UploadFile = File(...), user: str = Dep
         elif "ai" in msg:
             messages.append(AIMessage(content=msg["ai"]))
 
-    response = code_llm.invoke(messages).content
+    response = await ainvoke(get_code_llm(), messages, task="code")
 
     session.explanation_history.append({"ai": response})
+    user_sessions.put(user, session_info)
 
     return {
         "user_text": user_text,
@@ -567,21 +696,20 @@ async def handle_code_explanation(audio: UploadFile = File(...), user: str = Dep
     }
 
 
-@app.get("/api/interviews")
-def get_user_interviews(user: str = Depends(get_current_user)):
-    interviews = list(interviews_collection.find({"userId": user}))
-    for i in interviews:
-        i["_id"] = str(i["_id"])
-    return interviews
+@app.get("/api/interviews", response_class=FastJSONResponse)
+async def get_user_interviews(limit: int = 50, cursor: Optional[str] = None, user: str = Depends(get_current_user)):
+    """Newest-first interview summaries; pass the X-Next-Cursor header back as `cursor` for the next page."""
+    interviews, next_cursor = await store.interview_page(user, limit, cursor)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return FastJSONResponse(interviews, headers=headers)
 
 
-@app.get("/api/interviews/{interview_id}")
-def get_interview(interview_id: str, user: str = Depends(get_current_user)):
-    interview = interviews_collection.find_one({"_id": ObjectId(interview_id), "userId": user})
+@app.get("/api/interviews/{interview_id}", response_class=FastJSONResponse)
+async def get_interview(interview_id: str, user: str = Depends(get_current_user)):
+    interview = await store.get_interview(user, interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    interview["_id"] = str(interview["_id"])
-    return interview
+    return FastJSONResponse(interview)
 
 
 @app.get("/api/history")
@@ -597,7 +725,7 @@ def get_history(user: str = Depends(get_current_user)):
     else:
         history = session.history
 
-    return {"history": history}
+    return {"history": history_to_dicts(history)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+# backend/audio_pipeline.py
+import asyncio
+import subprocess
+
+import numpy as np
+
+from backend.confidence_utils import get_confidence_score
+from backend.transcription_service import transcribe_async
+
+SAMPLE_RATE = 16000  # what Whisper expects
+
+
+class AudioDecodeError(Exception):
+    """Raised when ffmpeg cannot decode an uploaded recording."""
+
+
+def decode_audio(data: bytes, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an uploaded recording (webm/ogg/wav/...) straight from memory
+    into a mono float32 buffer in [-1, 1] at `sr` Hz. ffmpeg reads from
+    stdin and writes raw PCM to stdout, so nothing touches the disk.
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner", "-loglevel", "error",
+        "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sr),
+        "pipe:1",
+    ]
+    result = subprocess.run(cmd, input=data, capture_output=True)
+    if result.returncode != 0:
+        raise AudioDecodeError(result.stderr.decode(errors="ignore").strip())
+
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+async def analyze_answer(data: bytes):
+    """
+    Decode the answer once, then run Whisper and confidence scoring on the
+    same buffer concurrently. Returns (transcript, confidence).
+    """
+    audio = await asyncio.to_thread(decode_audio, data)
+
+    answer, confidence = await asyncio.gather(
+        transcribe_async(audio),
+        asyncio.to_thread(get_confidence_score, audio, SAMPLE_RATE),
+    )
+    return answer, confidence
@@ -1,8 +1,41 @@
 from fastapi import HTTPException, Header, Depends
-from backend.database import users_collection
+from backend.data_access import store
+from backend.ttl_cache import TTLCache
 from typing import Optional
+import copy
+import os
+import time
 
-def get_current_user(x_user_id: Optional[str] = Header(None), x_user_email: Optional[str] = Header(None)):
+# Seconds a user document is served from memory. Invalidation is per worker,
+# so other workers may show a profile edit up to this long after it's made.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+
+_identity_cache = TTLCache(maxsize=AUTH_CACHE_SIZE)  # clerkId -> (user doc, loaded_at)
+
+
+async def _load_user(clerk_id, email):
+    user = await store.get_or_create_user(clerk_id, email)
+    user["_id"] = str(user["_id"])
+    return user
+
+
+async def _cached_user(clerk_id, email):
+    entry = _identity_cache.get(clerk_id)
+    if entry is not None and time.monotonic() - entry[1] <= AUTH_CACHE_TTL:
+        return entry[0]
+
+    user = await _load_user(clerk_id, email)
+    _identity_cache.set(clerk_id, (user, time.monotonic()))
+    return user
+
+
+def invalidate_user(clerk_id):
+    """Drop a cached user document after it has been changed in MongoDB."""
+    _identity_cache.pop(clerk_id)
+
+
+async def get_current_user(x_user_id: Optional[str] = Header(None), x_user_email: Optional[str] = Header(None)):
     """
     Get or create user based on Clerk data sent from frontend.
     Frontend sends:
@@ -11,69 +44,27 @@ def get_current_user(x_user_id: Optional[str] = Header(None), x_user_email: Opti
     """
     if not x_user_id or not x_user_email:
         raise HTTPException(
-            status_code=401, 
+            status_code=401,
             detail="Authentication required. Please sign in with Clerk."
         )
-    
-    # Check if user exists in MongoDB
-    user = users_collection.find_one({"clerkId": x_user_id})
-    
-    if not user:
-        # First time user - create new document
-        new_user = {
-            "clerkId": x_user_id,
-            "email": x_user_email,
-            "name": "",
-            "phone": "",
-            "linkedin": "",
-            "github": "",
-            "role": "",
-            "skills": [],
-            "education": [],
-            "experience": [],
-            "projects": [],
-            "groq_api_key": None,
-            "createdAt": None
-        }
-        users_collection.insert_one(new_user)
-        user = new_user
-    
+
+    # Cached for AUTH_CACHE_TTL, so hot paths skip the Mongo round trip
+    user = await _cached_user(x_user_id, x_user_email)
+
     # Return clerkId for session management
     return user["clerkId"]
 
 
-def get_current_user_full(x_user_id: Optional[str] = Header(None), x_user_email: Optional[str] = Header(None)):
+async def get_current_user_full(x_user_id: Optional[str] = Header(None), x_user_email: Optional[str] = Header(None)):
     """
     Returns full user object from MongoDB.
     Use this when you need complete user data.
     """
     if not x_user_id or not x_user_email:
         raise HTTPException(
-            status_code=401, 
+            status_code=401,
             detail="Authentication required"
         )
-    
-    user = users_collection.find_one({"clerkId": x_user_id})
-    
-    if not user:
-        # Create user if doesn't exist
-        new_user = {
-            "clerkId": x_user_id,
-            "email": x_user_email,
-            "name": "",
-            "phone": "",
-            "linkedin": "",
-            "github": "",
-            "role": "",
-            "skills": [],
-            "education": [],
-            "experience": [],
-            "projects": [],
-            "groq_api_key": None,
-            "createdAt": None
-        }
-        users_collection.insert_one(new_user)
-        return new_user
-    
-    user["_id"] = str(user["_id"])
-    return user
\ No newline at end of file
+
+    # A copy, so callers can't mutate the cached document
+    return copy.deepcopy(await _cached_user(x_user_id, x_user_email))
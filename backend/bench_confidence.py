@@ -0,0 +1,79 @@
+# backend/bench_confidence.py
+"""
+Compare the vectorized confidence engine with the original librosa scorer
+on synthetic speech-like audio.
+
+    python -m backend.bench_confidence --clips 40 --sr 16000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend import confidence_engine
+from backend.confidence_utils import librosa_confidence_score
+
+
+def synthetic_speech(rng, sr, seconds):
+    """Harmonic 'voice' with a syllable-rate envelope, pauses and background noise."""
+    t = np.arange(int(sr * seconds)) / sr
+    f0 = rng.uniform(90, 220) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(0.2, 1.0) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    syllable_rate = rng.uniform(2.5, 6.0)
+    envelope = np.clip(np.sin(2 * np.pi * syllable_rate * t), 0, None) ** 2
+    pauses = (np.sin(2 * np.pi * rng.uniform(0.1, 0.4) * t) > -0.6).astype(np.float32)
+
+    loudness = rng.uniform(0.002, 0.05)
+    noise = rng.normal(0, loudness * rng.uniform(0.05, 0.5), len(t))
+    return (loudness * voice * envelope * pauses + noise).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", type=int, default=40)
+    parser.add_argument("--sr", type=int, default=16000)
+    parser.add_argument("--min-seconds", type=float, default=3.0)
+    parser.add_argument("--max-seconds", type=float, default=45.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    clips = [
+        synthetic_speech(rng, args.sr, rng.uniform(args.min_seconds, args.max_seconds))
+        for _ in range(args.clips)
+    ]
+    total_audio = sum(len(c) for c in clips) / args.sr
+
+    # Warm up (numba JIT for librosa, FFT plans for numpy)
+    librosa_confidence_score(clips[0], args.sr)
+    confidence_engine.score(clips[0], args.sr)
+
+    start = time.perf_counter()
+    reference = [librosa_confidence_score(c, args.sr) for c in clips]
+    t_librosa = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [confidence_engine.score(c, args.sr) for c in clips]
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = confidence_engine.score_batch(clips, args.sr)
+    t_batch = time.perf_counter() - start
+
+    reference = np.array(reference)
+    single = np.array(single)
+    diff = np.abs(single - reference)
+    corr = float(np.corrcoef(single, reference)[0, 1]) if reference.std() > 0 else float("nan")
+
+    print(f"📊 {args.clips} clips, {total_audio:.0f}s of audio at {args.sr} Hz")
+    print(f"  librosa scorer : {t_librosa * 1000 / args.clips:8.2f} ms/clip")
+    print(f"  engine.score   : {t_single * 1000 / args.clips:8.2f} ms/clip  ({t_librosa / t_single:.1f}x)")
+    print(f"  score_batch    : {t_batch * 1000 / args.clips:8.2f} ms/clip  ({t_librosa / t_batch:.1f}x)")
+    print(f"  agreement      : mean |Δ| {diff.mean():.3f}, max |Δ| {diff.max():.3f}, pearson r {corr:.3f}")
+    print(f"  batch == single: {bool(np.allclose(batch, single))}")
+
+
+if __name__ == "__main__":
+    main()
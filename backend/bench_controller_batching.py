@@ -0,0 +1,84 @@
+# backend/bench_controller_batching.py
+"""
+Throughput and latency of the controller model versus batch window:
+`--concurrency` simulated interviews each ask for decisions back to back
+through a ControllerBatcher, once per window size. Window 0 with
+--max-batch 1 is the old one-request-per-forward-pass behaviour.
+
+    python -m backend.bench_controller_batching --requests 256 --concurrency 32 --windows 0 2 5 10 20
+    python -m backend.bench_controller_batching --simulate --base-ms 40 --per-item-ms 4
+
+--simulate swaps the phi-2 forward pass for a sleep of base + per-item
+cost, so the batching behaviour can be measured without the weights.
+"""
+import argparse
+import asyncio
+import time
+from functools import partial
+
+import numpy as np
+
+from backend.controller_model import ControllerBatcher, LABELS, decide_batch
+
+ANSWERS = [
+    "I handled conflicts by talking to my team.",
+    "I led a team during my college project.",
+    "My weakness is time management but I improved it.",
+    "I resolved a conflict between two teammates using mediation.",
+    "I have good leadership skills.",
+    "I prefer working independently.",
+]
+
+
+def simulated_infer(answers, base_ms, per_item_ms):
+    time.sleep((base_ms + per_item_ms * len(answers)) / 1000)
+    return [(LABELS[len(a) % len(LABELS)], 1.0) for a in answers]
+
+
+async def run(infer, window_ms, max_batch, requests, concurrency):
+    batcher = ControllerBatcher(window_ms=window_ms, max_batch=max_batch, infer=infer)
+    latencies = []
+    per_worker = requests // concurrency
+
+    async def interview(worker):
+        for i in range(per_worker):
+            start = time.perf_counter()
+            await batcher.decide(ANSWERS[(worker + i) % len(ANSWERS)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(interview(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = batcher.stats()
+    batcher.close()
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95), stats["mean_batch"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2, 5, 10, 20], help="batch windows in ms")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--simulate", action="store_true", help="sleep instead of running phi-2")
+    parser.add_argument("--base-ms", type=float, default=40.0, help="simulated fixed cost per forward pass")
+    parser.add_argument("--per-item-ms", type=float, default=4.0, help="simulated cost per sequence in a batch")
+    args = parser.parse_args()
+
+    if args.simulate:
+        infer = partial(simulated_infer, base_ms=args.base_ms, per_item_ms=args.per_item_ms)
+    else:
+        infer = decide_batch
+        infer(ANSWERS[:1])  # load weights outside the timings
+
+    print(f"📊 {args.requests} decisions from {args.concurrency} concurrent interviews "
+          f"({'simulated' if args.simulate else 'phi-2'})")
+    print(f"  {'window':>8} {'max batch':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>10}")
+    configs = [(0.0, 1)] + [(w, args.max_batch) for w in args.windows]
+    for window, max_batch in configs:
+        rps, p50, p95, mean_batch = asyncio.run(run(infer, window, max_batch, args.requests, args.concurrency))
+        print(f"  {window:>6.1f}ms {max_batch:>9} {rps:>8.1f} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} {mean_batch:>10}")
+
+
+if __name__ == "__main__":
+    main()
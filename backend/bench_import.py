@@ -0,0 +1,93 @@
+# backend/bench_import.py
+"""
+Measure how long importing the API takes in a fresh interpreter, list the
+slowest imports, and fail if a heavy model library is pulled in at import
+time (those belong behind backend.model_registry).
+
+    python -m backend.bench_import --runs 5
+    python -m backend.bench_import --module backend.app --budget 3.0 --top 15
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Must only be imported lazily, on first use or by the background warm-up
+HEAVY_MODULES = (
+    "torch", "transformers", "whisper", "sentence_transformers", "librosa", "numba",
+    "langchain_groq", "langchain_ollama", "langchain_community", "spacy",
+)
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(m for m in {heavy!r} if m in sys.modules)]))
+"""
+
+
+def run_once(module):
+    """(seconds, heavy modules loaded) for one cold import of `module`."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"❌ import {module} failed:\n{proc.stderr}")
+    seconds, heavy = json.loads(proc.stdout.strip().splitlines()[-1])  # the app itself may print first
+    return seconds, heavy
+
+
+def slowest_imports(module, top):
+    """Top-level packages by total self time from `python -X importtime` (no double counting)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True
+    ).stderr
+    totals = {}
+    for match in _IMPORTTIME_RE.finditer(stderr):
+        self_us, _, name = match.groups()
+        root = name.split(".")[0]
+        totals[root] = totals.get(root, 0) + int(self_us)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.app")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--budget", type=float, help="fail if the median import takes longer (seconds)")
+    args = parser.parse_args()
+
+    # Importing the app must not need secrets; dummies are enough (nothing connects)
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+    times, heavy = [], set()
+    for _ in range(args.runs):
+        seconds, loaded = run_once(args.module)
+        times.append(seconds)
+        heavy.update(loaded)
+
+    median = statistics.median(times)
+    print(f"📊 import {args.module}: median {median:.2f}s, min {min(times):.2f}s, max {max(times):.2f}s "
+          f"over {args.runs} runs")
+    for name, micros in slowest_imports(args.module, args.top):
+        print(f"  {name:<28} {micros / 1000:8.1f} ms")
+
+    failed = False
+    if heavy:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(sorted(heavy))}")
+        failed = True
+    if args.budget is not None and median > args.budget:
+        print(f"❌ Median import {median:.2f}s is over the {args.budget:.2f}s budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# backend/bulk_ingest.py
+"""
+Bulk-parse a batch of resume PDFs, e.g. a partner college's onboarding dump.
+
+PDF text/section extraction runs in a process pool; the LLM stage runs with
+at most --concurrency resumes in flight. Results are streamed to a JSONL
+file and/or upserted into users_collection (keyed by email). Finished files
+are appended to a checkpoint (upserted ones only after their batch is
+written), so an interrupted run picks up where it left off when started
+again with the same arguments.
+
+    python -m backend.bulk_ingest resumes/ --out parsed.jsonl
+    python -m backend.bulk_ingest manifest.jsonl --upsert --workers 8 --concurrency 16
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from backend.resume_sections import extract_sections
+
+UPSERT_BATCH = 100
+
+
+def load_items(source):
+    """
+    Resumes to ingest as dicts with at least "path". `source` is a directory
+    (every *.pdf below it), a .jsonl manifest of {"path", ...extra fields} or
+    a text manifest with one path per line. Relative manifest paths are
+    resolved against the manifest's folder.
+    """
+    source = Path(source)
+    if source.is_dir():
+        return [{"path": str(p)} for p in sorted(source.rglob("*.pdf"))]
+
+    items = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line) if source.suffix == ".jsonl" else {"path": line}
+            path = Path(item["path"])
+            item["path"] = str(path if path.is_absolute() else source.parent / path)
+            items.append(item)
+    return items
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {json.loads(line)["path"] for line in f if line.strip()}
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def to_user_doc(item, parsed):
+    """users_collection fields for a parsed resume; manifest fields win over parsed ones."""
+    links = parsed.get("links") or []
+    doc = {
+        "name": parsed.get("name", ""),
+        "email": parsed.get("email", ""),
+        "phone": parsed.get("phone", ""),
+        "linkedin": next((l for l in links if "linkedin.com" in l), ""),
+        "github": next((l for l in links if "github.com" in l), ""),
+        "skills": parsed.get("skills", []),
+        "education": parsed.get("education", []),
+        "experience": parsed.get("experience", []),
+        "projects": parsed.get("projects", []),
+    }
+    doc.update({k: v for k, v in item.items() if k != "path"})
+    if not doc.get("clerkId"):
+        # Set at sign-up; a null would collide in the unique clerkId index
+        doc.pop("clerkId", None)
+    return doc
+
+
+class Ingestor:
+    def __init__(self, args):
+        self.args = args
+        self.timings = {"extract": [], "parse": [], "write": []}
+        self.counts = {"ok": 0, "failed": 0, "skipped": 0}
+        self._llm_slots = asyncio.Semaphore(args.concurrency)
+        self._extract_slots = asyncio.Semaphore(args.workers)
+        self._pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._out = open(args.out, "a", encoding="utf-8") if args.out else None
+        self._checkpoint = open(args.checkpoint, "a", encoding="utf-8") if args.checkpoint else None
+        self._pending_upserts = []
+
+    async def run(self, items):
+        from backend.resume_parser import parse_extracted  # pulls in the LLM client
+
+        self._parse = parse_extracted
+        self.started = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._ingest(item) for item in items))
+            await self._flush_upserts()
+        finally:
+            self._pool.shutdown()
+            for f in (self._out, self._checkpoint):
+                if f:
+                    f.close()
+
+    async def _ingest(self, item):
+        loop = asyncio.get_running_loop()
+        digest = None
+        try:
+            async with self._extract_slots:
+                t0 = time.perf_counter()
+                data = await asyncio.to_thread(Path(item["path"]).read_bytes)
+                digest = hashlib.sha256(data).hexdigest()
+                pre = await loop.run_in_executor(self._pool, extract_sections, data)
+                self.timings["extract"].append(time.perf_counter() - t0)
+
+            async with self._llm_slots:
+                t0 = time.perf_counter()
+                parsed = await self._parse_with_retries(pre)
+                self.timings["parse"].append(time.perf_counter() - t0)
+        except Exception as e:
+            parsed = {"error": f"{type(e).__name__}: {e}"}
+
+        t0 = time.perf_counter()
+        await self._write(item, digest, parsed)
+        self.timings["write"].append(time.perf_counter() - t0)
+        self._progress()
+
+    async def _parse_with_retries(self, pre):
+        for attempt in range(self.args.retries + 1):
+            parsed = await self._parse(pre)
+            if "error" not in parsed or attempt == self.args.retries:
+                return parsed
+            delay = random.uniform(0, min(30, 2 ** attempt))
+            print(f"⚠️ Parse failed ({parsed['error']}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _write(self, item, digest, parsed):
+        ok = "error" not in parsed
+        self.counts["ok" if ok else "failed"] += 1
+
+        if self._out:
+            self._out.write(json.dumps({"path": item["path"], "sha256": digest, **parsed}, default=str) + "\n")
+            self._out.flush()
+
+        # Only successes are checkpointed, so a rerun retries failures
+        if not ok:
+            return
+
+        if self.args.upsert:
+            doc = to_user_doc(item, parsed)
+            if doc["email"]:
+                # Checkpointed by _flush_upserts once the profile is in Mongo
+                self._pending_upserts.append((item["path"], doc))
+                if len(self._pending_upserts) >= UPSERT_BATCH:
+                    await self._flush_upserts()
+                return
+            print(f"⚠️ {item['path']}: no email found, not upserted")
+
+        self._mark_done([item["path"]])
+
+    def _mark_done(self, paths):
+        if not self._checkpoint:
+            return
+        self._checkpoint.write("".join(json.dumps({"path": path}) + "\n" for path in paths))
+        self._checkpoint.flush()
+
+    async def _flush_upserts(self):
+        if not self._pending_upserts:
+            return
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+        from backend.database import users_collection
+
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {"email": doc["email"]},
+                {"$set": {**doc, "updatedAt": now}, "$setOnInsert": {"createdAt": now, "source": "bulk_ingest"}},
+                upsert=True,
+            )
+            for _, doc in self._pending_upserts
+        ]
+        paths = [path for path, _ in self._pending_upserts]
+        self._pending_upserts = []
+        try:
+            await asyncio.to_thread(users_collection.bulk_write, ops, ordered=False)
+        except BulkWriteError as e:
+            # Unordered, so every other op was still applied
+            errors = {err["index"]: err.get("errmsg", "") for err in e.details.get("writeErrors", [])}
+            for index, message in errors.items():
+                print(f"❌ {paths[index]}: upsert failed: {message}")
+            self.counts["ok"] -= len(errors)
+            self.counts["failed"] += len(errors)
+            paths = [path for index, path in enumerate(paths) if index not in errors]
+            if e.details.get("writeConcernErrors"):
+                print(f"⚠️ Write concern not met for this batch; {len(paths)} resumes will be re-upserted on the next run")
+                paths = []
+        self._mark_done(paths)
+
+    def _progress(self):
+        done = self.counts["ok"] + self.counts["failed"]
+        if done % self.args.report_every == 0:
+            elapsed = time.perf_counter() - self.started
+            print(f"… {done} done ({self.counts['failed']} failed), {done / elapsed:.2f} docs/s")
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        done = self.counts["ok"] + self.counts["failed"]
+        print(f"📊 {done} resumes in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.2f} docs/s): "
+              f"{self.counts['ok']} ok, {self.counts['failed']} failed, {self.counts['skipped']} skipped (checkpoint)")
+        for stage, values in self.timings.items():
+            if values:
+                print(f"  {stage:<8} total {sum(values):8.1f}s  p50 {_percentile(values, 0.5) * 1000:8.1f} ms"
+                      f"  p95 {_percentile(values, 0.95) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory of PDFs, or a .jsonl / .txt manifest")
+    parser.add_argument("--out", help="append results to this JSONL file")
+    parser.add_argument("--upsert", action="store_true", help="upsert parsed profiles into users_collection by email")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="PDF extraction processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="resumes in the LLM stage at once")
+    parser.add_argument("--retries", type=int, default=2, help="extra attempts for a resume whose parse failed")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <out>.checkpoint or bulk_ingest.checkpoint)")
+    parser.add_argument("--limit", type=int, help="stop after this many new resumes")
+    parser.add_argument("--report-every", type=int, default=50)
+    args = parser.parse_args()
+
+    if not args.out and not args.upsert:
+        parser.error("nothing to do: pass --out and/or --upsert")
+    args.checkpoint = args.checkpoint or (f"{args.out}.checkpoint" if args.out else "bulk_ingest.checkpoint")
+
+    items = load_items(args.source)
+    done = load_checkpoint(args.checkpoint)
+    todo = [item for item in items if item["path"] not in done]
+    skipped = len(items) - len(todo)
+    if args.limit:
+        todo = todo[:args.limit]
+
+    print(f"🔄 {len(items)} resumes found, {skipped} already done, ingesting {len(todo)}")
+    ingestor = Ingestor(args)
+    ingestor.counts["skipped"] = skipped
+    asyncio.run(ingestor.run(todo))
+    ingestor.report()
+
+
+if __name__ == "__main__":
+    main()
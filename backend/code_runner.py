@@ -0,0 +1,244 @@
+# backend/code_runner.py
+"""
+Runs coding-round submissions against the test cases in problems.json.
+
+Each submission gets a fresh interpreter from a pool of pre-forked
+workers (backend/sandbox_worker.py), so interpreter start-up is paid ahead
+of time and nothing one candidate's code does can leak into the next run.
+Only each test's arguments are sent to the worker; it runs the code in a
+forked child and returns the raw return values, which are compared with
+the expected values here, so the submission can neither read the answers
+nor report its own tests as passed. The child runs under:
+
+- an unprivileged uid (CODE_RUNNER_UID, "nobody") when the API runs as
+  root, in an empty temporary working directory
+- a seccomp filter denying sockets, fork/clone/exec, ptrace and signals to
+  other processes
+- rlimits: CPU seconds, address space, no file writes (RLIMIT_FSIZE=0), no
+  child processes (RLIMIT_NPROC=0), no core dumps
+- an audit hook rejects sockets, subprocess/exec/fork, ctypes and any
+  file open outside the Python installation
+- each test runs under an interval timer; the first timeout ends the run,
+  and the parent kills the worker if the job overruns its wall-clock limit
+
+If the uid drop or the seccomp filter can't be applied (e.g. on a
+platform without seccomp), submissions are refused rather than run with
+only the in-process checks, unless CODE_RUNNER_REQUIRE_ISOLATION=0.
+"""
+import asyncio
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+
+CODE_RUNNER_POOL = int(os.getenv("CODE_RUNNER_POOL", 4))               # idle pre-forked workers
+CODE_RUNNER_CONCURRENCY = int(os.getenv("CODE_RUNNER_CONCURRENCY", 8))  # submissions running at once
+CODE_RUNNER_TEST_TIMEOUT_MS = int(os.getenv("CODE_RUNNER_TEST_TIMEOUT_MS", 1000))
+CODE_RUNNER_WALL_TIMEOUT = float(os.getenv("CODE_RUNNER_WALL_TIMEOUT", 5))
+CODE_RUNNER_CPU_SECONDS = int(os.getenv("CODE_RUNNER_CPU_SECONDS", 3))
+CODE_RUNNER_MEMORY_MB = int(os.getenv("CODE_RUNNER_MEMORY_MB", 256))
+CODE_RUNNER_UID = int(os.getenv("CODE_RUNNER_UID", 65534))             # submissions run as this uid/gid under root
+CODE_RUNNER_REQUIRE_ISOLATION = os.getenv("CODE_RUNNER_REQUIRE_ISOLATION", "1") == "1"
+MAX_CODE_CHARS = 20000
+
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+MAX_SHOWN_CHARS = 200
+
+
+def _short(value):
+    text = json.dumps(value)
+    return text if len(text) <= MAX_SHOWN_CHARS else text[:MAX_SHOWN_CHARS] + "…"
+
+
+def _matches(output, expected):
+    if isinstance(output, float) or isinstance(expected, float):
+        try:
+            return abs(float(output) - float(expected)) <= 1e-9 * max(1.0, abs(float(expected)))
+        except (TypeError, ValueError):
+            return False
+    return output == expected
+
+
+def _grade(test, reported):
+    """One test's result from the worker's (untrusted) report of what the code returned."""
+    result = {"args": _short(test.get("args", [])), "expected": _short(test["expected"]), "passed": False}
+    if not isinstance(reported, dict):
+        reported = {"error": "No result reported"}
+    if "value" in reported:
+        result["output"] = _short(reported["value"])
+        result["passed"] = _matches(reported["value"], test["expected"])
+    elif "repr" in reported:
+        # Not JSON-serializable, so it can't equal the expected value
+        result["output"] = str(reported["repr"])[:MAX_SHOWN_CHARS]
+    else:
+        result["error"] = str(reported.get("error") or "No result reported")[:MAX_SHOWN_CHARS]
+    ms = reported.get("ms")
+    result["ms"] = ms if isinstance(ms, (int, float)) else 0
+    return result
+
+
+def _kill_group(proc):
+    # The worker and the child running the submission share a session (start_new_session)
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _failed(tests, error, elapsed_ms):
+    return {
+        "passed": 0,
+        "total": len(tests),
+        "solved": False,
+        "error": error,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "tests": [],
+    }
+
+
+class CodeRunner:
+    """
+    Pool of pre-forked sandbox workers; `run()` never blocks the event loop.
+    Every worker runs exactly one submission and exits, and a replacement is
+    forked in the background.
+    """
+
+    def __init__(self, pool_size=CODE_RUNNER_POOL, concurrency=CODE_RUNNER_CONCURRENCY,
+                 test_timeout_ms=CODE_RUNNER_TEST_TIMEOUT_MS, wall_timeout=CODE_RUNNER_WALL_TIMEOUT,
+                 cpu_seconds=CODE_RUNNER_CPU_SECONDS, memory_mb=CODE_RUNNER_MEMORY_MB,
+                 uid=CODE_RUNNER_UID, require_isolation=CODE_RUNNER_REQUIRE_ISOLATION):
+        self.pool_size = pool_size
+        self.concurrency = concurrency
+        self.test_timeout_ms = test_timeout_ms
+        self.wall_timeout = wall_timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.uid = uid
+        self.require_isolation = require_isolation
+        self._idle = []
+        self._loop = None
+        self._slots = None
+        self._refill = None
+        self._workdir = None
+
+    def _bind_loop(self):
+        # Subprocess transports belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._kill_idle()
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._refill = None
+
+    async def _spawn(self):
+        if self._workdir is None:
+            self._workdir = tempfile.mkdtemp(prefix="code_runner_")
+        return await asyncio.create_subprocess_exec(
+            sys.executable, "-I", "-S", WORKER_PATH, str(self.cpu_seconds), str(self.memory_mb),
+            str(self.uid), "1" if self.require_isolation else "0",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self._workdir,
+            env={"PATH": os.defpath},
+            start_new_session=True,
+        )
+
+    async def warm_up(self):
+        """Fork workers until `pool_size` are idle."""
+        self._bind_loop()
+        while len(self._idle) < self.pool_size:
+            self._idle.append(await self._spawn())
+
+    def _schedule_refill(self):
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.ensure_future(self.warm_up())
+
+    async def _take(self):
+        while self._idle:
+            proc = self._idle.pop()
+            if proc.returncode is None:
+                return proc
+        return await self._spawn()
+
+    async def run(self, code, problem):
+        """
+        Run `code` against `problem["tests"]`. Returns passed / total /
+        solved, per-test pass/fail with timings, and `error` when the code
+        couldn't be run at all.
+        """
+        tests = problem.get("tests") or []
+        if not tests or not problem.get("entry_point"):
+            return _failed(tests, "No test cases for this problem", 0)
+        if not code or not code.strip():
+            return _failed(tests, "No code submitted", 0)
+        if len(code) > MAX_CODE_CHARS:
+            return _failed(tests, f"Submission is longer than {MAX_CODE_CHARS} characters", 0)
+
+        self._bind_loop()
+        job = {
+            "code": code,
+            "entry_point": problem["entry_point"],
+            "args": [test.get("args", []) for test in tests],   # never the expected values
+            "test_timeout_ms": self.test_timeout_ms,
+        }
+        async with self._slots:
+            proc = await self._take()
+            self._schedule_refill()
+            start = time.perf_counter()
+            try:
+                out, _ = await asyncio.wait_for(
+                    proc.communicate((json.dumps(job) + "\n").encode("utf-8")), self.wall_timeout
+                )
+            except asyncio.TimeoutError:
+                _kill_group(proc)
+                await proc.wait()
+                return _failed(tests, "Time limit exceeded", (time.perf_counter() - start) * 1000)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            result = json.loads(out.decode("utf-8").strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            return _failed(tests, f"Runner crashed (exit {proc.returncode})", elapsed_ms)
+        if not isinstance(result, dict):
+            return _failed(tests, "Runner returned a malformed result", elapsed_ms)
+        if "error" in result:
+            return _failed(tests, str(result["error"])[:MAX_SHOWN_CHARS], elapsed_ms)
+
+        reported = result.get("tests")
+        if not isinstance(reported, list) or len(reported) != len(tests):
+            return _failed(tests, "Runner returned a malformed result", elapsed_ms)
+        graded = [_grade(test, r) for test, r in zip(tests, reported)]
+        passed = sum(t["passed"] for t in graded)
+        return {
+            "passed": passed,
+            "total": len(tests),
+            "solved": passed == len(tests),
+            "error": None,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "tests": graded,
+            "stdout": str(result.get("stdout", ""))[:MAX_SHOWN_CHARS],
+        }
+
+    def _kill_idle(self):
+        for proc in self._idle:
+            if proc.returncode is None:
+                _kill_group(proc)
+        self._idle = []
+
+    async def shutdown(self):
+        """Stop refilling and reap the idle workers."""
+        if self._refill is not None:
+            self._refill.cancel()
+            self._refill = None
+        idle = self._idle
+        self._kill_idle()
+        for proc in idle:
+            await proc.wait()
+
+
+code_runner = CodeRunner()
+
@@ -1,7 +1,42 @@
 # backend/coding_session.py
+import os
 import random
 import json
 from backend.feedback_utils import generate_coding_feedback  # We'll add this next
+from backend.code_runner import code_runner
+from backend.model_registry import registry
+
+PROBLEMS_PATH = os.path.join(os.path.dirname(__file__), "problems.json")
+
+def load_problems():
+    with open(PROBLEMS_PATH, "r") as f:
+        return json.load(f)
+
+
+# Pre-fork the sandbox workers with the other start-up warm-ups
+registry.register("code_runner", code_runner.warm_up)
+
+EXAMPLE_TESTS = 2  # test cases shown to the candidate; the rest stay hidden
+
+
+def public_problem(problem):
+    """The problem as sent to the browser: hidden test cases (and their answers) left out."""
+    if not problem:
+        return problem
+    public = {k: v for k, v in problem.items() if k != "tests"}
+    public["examples"] = problem.get("tests", [])[:EXAMPLE_TESTS]
+    return public
+
+
+def public_results(results):
+    """Test results as sent to the browser: hidden tests report pass/fail and timing only."""
+    if not results:
+        return results
+    tests = [
+        t if i < EXAMPLE_TESTS else {"passed": t["passed"], "ms": t.get("ms", 0), "hidden": True}
+        for i, t in enumerate(results.get("tests", []))
+    ]
+    return {**results, "tests": tests}
 
 class CodingSession:
     def __init__(self, role, rounds=2):
@@ -15,8 +50,7 @@ class CodingSession:
 
         # Define basic coding problems
         # 🔹 Load all problems from a JSON file
-        with open("backend\problems.json", "r") as f:
-            self.all_problems = json.load(f)
+        self.all_problems = load_problems()
 
         # 🔀 Shuffle to randomize order and avoid repeat
         self.randomized_problems = random.sample(self.all_problems, len(self.all_problems))
@@ -31,9 +65,42 @@ class CodingSession:
         self.history.append({ "problem": problem, "code": "" })
         return problem
 
-    def submit_solution(self, code: str):
-        if self.history:
-            self.history[-1]["code"] = code
+    async def submit_solution(self, code: str):
+        """Store the code and run it against the problem's test cases; returns the results."""
+        if not self.history:
+            return None
+        latest = self.history[-1]
+        latest["code"] = code
+        latest["results"] = await code_runner.run(code, latest["problem"])
+        return latest["results"]
+
+    async def generate_feedback(self):
+        return await generate_coding_feedback(self.history)
+
+    def to_dict(self):
+        return {
+            "role": self.role,
+            "rounds": self.rounds,
+            "current_round": self.current_round,
+            "history": self.history,
+            "explanation_history": self.explanation_history,
+            "meta": self.meta,
+            # Problems are stored by title and re-read from problems.json on load
+            "problem_order": [p["title"] for p in self.randomized_problems],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls.__new__(cls)
+        session.role = data["role"]
+        session.rounds = data["rounds"]
+        session.current_round = data["current_round"]
+        session.history = data["history"]
+        session.explanation_history = data["explanation_history"]
+        session.meta = data["meta"]
+        session.round_type = "Coding"
+        session.all_problems = load_problems()
 
-    def generate_feedback(self):
-        return generate_coding_feedback(self.history)
+        by_title = {p["title"]: p for p in session.all_problems}
+        session.randomized_problems = [by_title[t] for t in data["problem_order"] if t in by_title]
+        return session
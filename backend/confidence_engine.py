@@ -0,0 +1,123 @@
+# backend/confidence_engine.py
+"""
+Vectorized speech-confidence features.
+
+Every clip is framed once; RMS and zero-crossing rate are read off those
+frames and the tempo estimate comes from one short STFT of the same frames
+(spectral-flux onset envelope + autocorrelation), replacing the separate
+librosa rms / zero_crossing_rate / beat_track passes.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+N_FFT = 2048             # frame length for RMS / ZCR (librosa defaults)
+HOP = 512
+SPEC_FFT = 512           # centred slice of each frame used for the spectrogram
+MIN_DURATION = 1.0       # seconds; shorter answers get SHORT_SCORE
+SHORT_SCORE = 0.2
+
+# Tempo search range and prior (log-normal around 120 bpm, like librosa)
+MIN_BPM = 30.0
+MAX_BPM = 320.0
+PRIOR_BPM = 120.0
+PRIOR_STD_OCTAVES = 1.0
+TOP_DB = 80.0
+
+_WINDOW = np.hanning(SPEC_FFT).astype(np.float32)
+_SPEC = slice((N_FFT - SPEC_FFT) // 2, (N_FFT + SPEC_FFT) // 2)
+
+
+def _frame(y: np.ndarray):
+    """
+    Centre-pad `y` and frame it once. Returns per-frame RMS and ZCR (from
+    running sums, so the 2048-sample frames are never materialized) and a
+    view of each frame's centred SPEC_FFT-sample slice for the spectrogram.
+    """
+    y = np.pad(y, N_FFT // 2)
+    n_frames = 1 + (len(y) - N_FFT) // HOP
+    starts = np.arange(n_frames) * HOP
+
+    energy = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+    rms = np.sqrt(np.maximum(energy[starts + N_FFT] - energy[starts], 0.0) / N_FFT)
+
+    signs = np.signbit(y)
+    crossings = np.concatenate(([0], np.cumsum(signs[1:] != signs[:-1])))
+    zcr = (crossings[starts + N_FFT - 1] - crossings[starts]) / N_FFT
+
+    spec_frames = sliding_window_view(y[_SPEC.start:], SPEC_FFT)[::HOP][:n_frames]
+    return rms, zcr, spec_frames
+
+
+def _log_power(spec_frames: np.ndarray) -> np.ndarray:
+    power = np.abs(np.fft.rfft(spec_frames * _WINDOW, axis=1)) ** 2
+    return 10.0 * np.log10(np.maximum(power, 1e-10))
+
+
+def _onset_envelope(log_power: np.ndarray) -> np.ndarray:
+    """Spectral flux of the log-power spectrum, averaged over frequency."""
+    log_power = np.maximum(log_power, log_power.max() - TOP_DB)
+    flux = np.maximum(np.diff(log_power, axis=0), 0.0)
+    return flux.mean(axis=1)
+
+
+def _tempo(onset_env: np.ndarray, sr: int) -> float:
+    """Global tempo (bpm) from the autocorrelation of the onset envelope."""
+    n = len(onset_env)
+    if n < 4:
+        return 0.0
+
+    env = onset_env - onset_env.mean()
+    spectrum = np.fft.rfft(env, n=2 * n)
+    ac = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+    if ac[0] <= 0:
+        return 0.0
+    ac /= ac[0]
+
+    lags = np.arange(1, n)
+    bpms = 60.0 * sr / (HOP * lags)
+    valid = (bpms >= MIN_BPM) & (bpms <= MAX_BPM)
+    if not valid.any():
+        return 0.0
+
+    prior = -0.5 * ((np.log2(bpms) - np.log2(PRIOR_BPM)) / PRIOR_STD_OCTAVES) ** 2
+    strength = np.log1p(1e6 * np.maximum(ac[1:], 0.0)) + prior
+    strength[~valid] = -np.inf
+    return float(bpms[np.argmax(strength)])
+
+
+def _features(y: np.ndarray, sr: int):
+    rms, zcr, spec_frames = _frame(y)
+    tempo = _tempo(_onset_envelope(_log_power(spec_frames)), sr)
+    return float(rms.mean()), tempo, float(zcr.mean())
+
+
+def _combine(rms: float, tempo: float, zcr: float) -> float:
+    # Same normalization and weights as the original librosa scorer
+    rms_score = min(rms * 100, 1.0)
+    tempo_score = min(tempo / 150, 1.0)
+    zcr_score = min(zcr * 10, 1.0)
+    return round(float(0.4 * rms_score + 0.3 * tempo_score + 0.3 * zcr_score), 2)
+
+
+def extract_features(y: np.ndarray, sr: int) -> dict:
+    """Raw features for one mono clip: {'duration', 'rms', 'tempo', 'zcr'}."""
+    y = np.asarray(y, dtype=np.float32)
+    rms, tempo, zcr = _features(y, sr)
+    return {"duration": len(y) / sr, "rms": rms, "tempo": tempo, "zcr": zcr}
+
+
+def score(y: np.ndarray, sr: int) -> float:
+    """Confidence in [0, 1] for one mono clip."""
+    y = np.asarray(y, dtype=np.float32)
+    if len(y) < MIN_DURATION * sr:
+        return SHORT_SCORE
+    return _combine(*_features(y, sr))
+
+
+def score_batch(buffers, sr: int) -> list:
+    """
+    Score many mono clips sampled at `sr`. A plain loop over `score()`:
+    each clip's FFT is already vectorized over its frames, and stacking
+    every clip's frames into one array measured slower than this.
+    """
+    return [score(b, sr) for b in buffers]
@@ -1,9 +1,31 @@
-import librosa
 import numpy as np
+from backend import confidence_engine
 
-def get_confidence_score(audio_path: str) -> float:
+def get_confidence_score(audio, sr: int = None) -> float:
+    """Score a file path, or an already-decoded mono buffer sampled at `sr`."""
     try:
-        y, sr = librosa.load(audio_path)
+        if isinstance(audio, str):
+            import librosa
+            y, sr = librosa.load(audio, sr=None, mono=True)
+        else:
+            y = np.asarray(audio, dtype=np.float32)
+
+        return confidence_engine.score(y, sr)
+
+    except Exception as e:
+        print(f"[Confidence Error] {e}")
+        return 0.5  # fallback
+
+
+def librosa_confidence_score(audio, sr: int = None) -> float:
+    """Original librosa-based scorer, kept as the reference for bench_confidence.py."""
+    import librosa
+
+    try:
+        if isinstance(audio, str):
+            y, sr = librosa.load(audio)
+        else:
+            y = np.asarray(audio, dtype=np.float32)
 
         duration = librosa.get_duration(y=y, sr=sr)
         if duration < 1.0:
@@ -12,7 +34,7 @@ def get_confidence_score(audio_path: str) -> float:
         # Extract features
         rms = float(np.mean(librosa.feature.rms(y=y)))
         tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-        tempo = float(tempo)   # convert numpy scalar → python float
+        tempo = float(np.atleast_1d(tempo)[0])   # convert numpy scalar → python float
         zcr = float(np.mean(librosa.feature.zero_crossing_rate(y)))
 
         # Normalize scores
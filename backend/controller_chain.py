@@ -1,7 +1,25 @@
 # backend/controller_chain.py
 
+import asyncio
+import json
+import os
+import re
+
 from langchain_core.prompts import ChatPromptTemplate
-from backend.llm_groq_config import llm
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke
+from backend.controller_classifier import classify, CONTROLLER_CLASSIFIER_THRESHOLD
+from backend.controller_model import get_controller_decision_async as phi2_controller_decision
+
+# Ask for decision + next question in a single call (falls back to two calls on bad output)
+FUSED_CONTROLLER = os.getenv("FUSED_CONTROLLER", "0") == "1"
+
+# HR decisions from the fine-tuned phi-2 (./controller-phi2), batched across
+# concurrent interviews; the LLM is used if the local model can't run
+PHI2_CONTROLLER = os.getenv("PHI2_CONTROLLER", "0") == "1"
+
+# Optional JSONL of LLM-made HR decisions, for retraining the local classifier
+CONTROLLER_DECISION_LOG = os.getenv("CONTROLLER_DECISION_LOG")
 
 controller_prompt = ChatPromptTemplate.from_template("""
 You are the decision-making controller in an HR interview system.
@@ -88,7 +106,7 @@ def _sanitize_label(text: str) -> str:
     t = text.strip().lower().split()[0]
     return t if t in VALID_LABELS else "follow_up_question"
 
-def get_tech_controller_decision(prev_question, candidate_answer, role, resume_excerpt, recent_topics):
+async def get_tech_controller_decision(prev_question, candidate_answer, role, resume_excerpt, recent_topics):
     prompt = tech_controller_prompt.format(
         prev_question=prev_question or "",
         candidate_answer=candidate_answer or "",
@@ -97,13 +115,141 @@ def get_tech_controller_decision(prev_question, candidate_answer, role, resume_e
         recent_topics=", ".join(recent_topics) if recent_topics else "none"
     )
 
-    resp = llm.invoke(prompt).content
+    resp = await ainvoke(get_llm(), prompt, task="controller", cache=True)
     return _sanitize_label(resp)
 
 
-def get_controller_decision(question: str, answer: str):
-    result = llm.invoke(
-        controller_prompt.format(question=question, answer=answer)
-    ).content.strip().lower()
-    valid = ["probe", "clarify", "example", "next_topic", "behavior_check"]
-    return result if result in valid else "probe"
+HR_VALID_LABELS = ["probe", "clarify", "example", "next_topic", "behavior_check"]
+
+async def get_controller_decision(question: str, answer: str):
+    # Confident local prediction skips the LLM hop (~1 ms instead of a Groq round trip)
+    local = classify(answer)
+    if local and local[1] >= CONTROLLER_CLASSIFIER_THRESHOLD and local[0] in HR_VALID_LABELS:
+        return local[0]
+
+    if PHI2_CONTROLLER:
+        try:
+            return await phi2_controller_decision(answer)
+        except Exception as e:
+            print(f"⚠️ phi-2 controller failed, asking the LLM: {e}")
+
+    result = (await ainvoke(
+        get_llm(), controller_prompt.format(question=question, answer=answer), task="controller", cache=True
+    )).strip().lower()
+    if result in HR_VALID_LABELS:
+        if CONTROLLER_DECISION_LOG:
+            await asyncio.to_thread(_log_decision, question, answer, result)
+        return result
+    return "probe"
+
+
+def _log_decision(question, answer, label):
+    """Append LLM-labelled turns to CONTROLLER_DECISION_LOG as training data for the classifier."""
+    if not CONTROLLER_DECISION_LOG:
+        return
+    try:
+        with open(CONTROLLER_DECISION_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"question": question, "answer": answer, "label": label}) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not log controller decision: {e}")
+
+
+# ---------- Fused controller + generator (one LLM call per turn) ----------
+
+tech_fused_prompt = ChatPromptTemplate.from_template("""
+You are a technical interviewer for the role of {role}. In ONE step, pick the next
+interviewer action and write the next question that follows it.
+
+Actions (choose exactly one):
+- depth_probe           → deeper sub-question within the SAME topic.
+- concept_clarification → ask them to clarify a vague, incorrect or incomplete part of the answer.
+- edge_case             → tricky corner cases, constraints or performance boundaries of the same topic.
+- follow_up_question    → the next logical follow-up in the SAME topic.
+- topic_transition      → a NEW topic from the resume skills or role, avoiding recently covered topics.
+
+Guidance:
+- If the previous question's topic appears in recently covered topics, prefer topic_transition.
+- If the answer is vague or partially correct, choose concept_clarification.
+- If the answer is good but shallow, choose depth_probe.
+- If the answer is solid, choose follow_up_question or edge_case.
+
+Previous question:
+\"\"\"{prev_question}\"\"\"
+
+Candidate answer:
+\"\"\"{candidate_answer}\"\"\"
+
+Resume skills excerpt:
+{resume_excerpt}
+
+Recently covered topic keywords:
+{recent_topics}
+
+Respond with ONLY this JSON object, no other text:
+{{"decision": "<action>", "question": "<exactly one interview question>"}}
+""")
+
+
+hr_fused_prompt = ChatPromptTemplate.from_template("""
+You are an HR interviewer for the role of {role}. In ONE step, pick the next
+interviewer action and write the next question that follows it.
+
+Actions (choose exactly one):
+- probe           → ask a deeper follow-up on the same topic
+- clarify         → the answer is vague or unclear; ask what they meant
+- example         → ask for a real incident
+- next_topic      → ask a new HR competency question
+- behavior_check  → ask a STAR-style behavioral question
+
+Previous question:
+\"\"\"{prev_question}\"\"\"
+
+Candidate answer:
+\"\"\"{last_answer}\"\"\"
+
+Rules for the question: exactly one HR question, natural professional tone.
+
+Respond with ONLY this JSON object, no other text:
+{{"decision": "<action>", "question": "<the question>"}}
+""")
+
+
+def _parse_fused(text: str, valid_labels):
+    """Return (decision, question) or None if the model didn't follow the format."""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+    decision = str(data.get("decision", "")).strip().lower()
+    question = str(data.get("question", "")).strip()
+    if decision not in valid_labels or not question:
+        return None
+    return decision, question
+
+
+async def get_tech_decision_and_question(prev_question, candidate_answer, role, resume_excerpt, recent_topics):
+    prompt = tech_fused_prompt.format(
+        prev_question=prev_question or "",
+        candidate_answer=candidate_answer or "",
+        role=role or "general",
+        resume_excerpt=resume_excerpt[:1200],
+        recent_topics=", ".join(recent_topics) if recent_topics else "none"
+    )
+    text = await ainvoke(get_llm(), prompt, task="question",
+                         cache=lambda t: _parse_fused(t, VALID_LABELS) is not None)
+    return _parse_fused(text, VALID_LABELS)
+
+
+async def get_hr_decision_and_question(role, prev_question, last_answer):
+    prompt = hr_fused_prompt.format(
+        role=role,
+        prev_question=prev_question or "",
+        last_answer=last_answer or ""
+    )
+    text = await ainvoke(get_llm(), prompt, task="question",
+                         cache=lambda t: _parse_fused(t, HR_VALID_LABELS) is not None)
+    return _parse_fused(text, HR_VALID_LABELS)
@@ -0,0 +1,251 @@
+# backend/controller_classifier.py
+"""
+Local HR controller: picks probe / clarify / example / next_topic /
+behavior_check from the candidate's answer without an LLM round trip.
+
+A multinomial logistic regression over hashed word and character n-grams,
+trained with NumPy alone; one prediction is a sparse feature lookup and a
+(n_features x n_labels) dot product, well under a millisecond on CPU.
+
+Off unless CONTROLLER_CLASSIFIER=1. Even then an artifact is only used if
+its recorded training run had at least CONTROLLER_CLASSIFIER_MIN_EXAMPLES
+examples and CONTROLLER_CLASSIFIER_MIN_CV_ACCURACY cross-validated
+accuracy, and `get_controller_decision` only trusts predictions at or
+above CONTROLLER_CLASSIFIER_THRESHOLD, asking the LLM otherwise.
+
+Training data is controller_interview_data.jsonl ({"instruction":
+"User answer: ...", "response": label}, one object per line or
+pretty-printed) plus any decision logs written via CONTROLLER_DECISION_LOG
+({"question", "answer", "label"}), so LLM fallbacks become training data.
+
+    python -m backend.controller_classifier --train
+    python -m backend.controller_classifier --train --data backend/controller_interview_data.jsonl decisions.jsonl
+    python -m backend.controller_classifier --predict "I prefer working alone."
+"""
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from backend.model_registry import registry
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_DATA = HERE / "controller_interview_data.jsonl"
+ARTIFACT_PATH = Path(os.getenv("CONTROLLER_CLASSIFIER_PATH", HERE / "artifacts" / "controller_classifier.npz"))
+CONTROLLER_CLASSIFIER = os.getenv("CONTROLLER_CLASSIFIER", "0") == "1"
+CONTROLLER_CLASSIFIER_THRESHOLD = float(os.getenv("CONTROLLER_CLASSIFIER_THRESHOLD", 0.6))
+CONTROLLER_CLASSIFIER_MIN_EXAMPLES = int(os.getenv("CONTROLLER_CLASSIFIER_MIN_EXAMPLES", 200))
+CONTROLLER_CLASSIFIER_MIN_CV_ACCURACY = float(os.getenv("CONTROLLER_CLASSIFIER_MIN_CV_ACCURACY", 0.8))
+
+N_FEATURES = 2 ** 13
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_PREFIX_RE = re.compile(r"^\s*user answer:\s*", re.IGNORECASE)
+
+
+# ---------- Data ----------
+
+def _records(text):
+    """JSON objects from JSONL or concatenated pretty-printed JSON."""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            return
+        record, pos = decoder.raw_decode(text, pos)
+        yield record
+
+
+def load_examples(paths):
+    """(answers, labels) from the training files; unlabeled records are skipped."""
+    answers, labels = [], []
+    for path in paths:
+        for record in _records(Path(path).read_text(encoding="utf-8")):
+            answer = record.get("answer") or _PREFIX_RE.sub("", record.get("instruction", ""))
+            label = (record.get("label") or record.get("response") or "").strip().lower()
+            if answer.strip() and label:
+                answers.append(answer.strip())
+                labels.append(label)
+    return answers, labels
+
+
+# ---------- Features ----------
+
+def _hash(token):
+    return zlib.crc32(token.encode("utf-8")) % N_FEATURES
+
+
+def _feature_ids(text):
+    words = _WORD_RE.findall(text.lower())
+    tokens = [f"w:{w}" for w in words]
+    tokens += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    tokens += [f"c:{padded[i:i + n]}" for n in (3, 4, 5) for i in range(len(padded) - n + 1)]
+    return [_hash(t) for t in tokens]
+
+
+def featurize(texts):
+    """(len(texts), N_FEATURES) float32: log term counts, L2-normalized per row."""
+    X = np.zeros((len(texts), N_FEATURES), dtype=np.float32)
+    for row, text in enumerate(texts):
+        ids, counts = np.unique(_feature_ids(text), return_counts=True)
+        if len(ids):
+            X[row, ids] = 1.0 + np.log(counts)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.maximum(norms, 1e-12)
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+# ---------- Model ----------
+
+class ControllerClassifier:
+    def __init__(self, weights, bias, labels, meta=None):
+        self.weights = weights
+        self.bias = bias
+        self.labels = list(labels)
+        self.meta = meta or {}    # training-run stats saved with the artifact
+
+    @classmethod
+    def fit(cls, texts, labels, epochs=300, lr=2.0, l2=1e-3):
+        """Full-batch gradient descent on the softmax cross-entropy."""
+        classes = sorted(set(labels))
+        y = np.array([classes.index(label) for label in labels])
+        X = featurize(texts)
+        Y = np.eye(len(classes), dtype=np.float32)[y]
+        W = np.zeros((N_FEATURES, len(classes)), dtype=np.float32)
+        b = np.zeros(len(classes), dtype=np.float32)
+        for _ in range(epochs):
+            grad = (_softmax(X @ W + b) - Y) / len(texts)
+            W -= lr * (X.T @ grad + l2 * W)
+            b -= lr * grad.sum(axis=0)
+        return cls(W, b, classes)
+
+    def predict_proba(self, texts):
+        return _softmax(featurize(texts) @ self.weights + self.bias)
+
+    def predict(self, answer):
+        """(label, probability) for one candidate answer."""
+        probs = self.predict_proba([answer or ""])[0]
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    def save(self, path=ARTIFACT_PATH, **meta):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path, weights=self.weights, bias=self.bias, labels=np.array(self.labels),
+            n_features=N_FEATURES, meta=json.dumps(meta),
+        )
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH):
+        with np.load(path) as data:
+            if int(data["n_features"]) != N_FEATURES:
+                raise ValueError(f"{path} was trained with {int(data['n_features'])} features, expected {N_FEATURES}")
+            meta = json.loads(str(data["meta"])) if "meta" in data else {}
+            return cls(data["weights"], data["bias"], [str(label) for label in data["labels"]], meta)
+
+    def quality_problem(self):
+        """Why this artifact shouldn't replace the LLM, or None if its training stats pass."""
+        examples = self.meta.get("examples", 0)
+        cv_accuracy = self.meta.get("cv_accuracy", 0.0)
+        if examples < CONTROLLER_CLASSIFIER_MIN_EXAMPLES:
+            return f"trained on {examples} examples (minimum {CONTROLLER_CLASSIFIER_MIN_EXAMPLES})"
+        if cv_accuracy < CONTROLLER_CLASSIFIER_MIN_CV_ACCURACY:
+            return f"cross-val accuracy {cv_accuracy:.2f} (minimum {CONTROLLER_CLASSIFIER_MIN_CV_ACCURACY})"
+        return None
+
+
+def _load_artifact():
+    if not CONTROLLER_CLASSIFIER:
+        return None
+    if not ARTIFACT_PATH.exists():
+        print(f"⚠️ No controller classifier at {ARTIFACT_PATH}; HR decisions go to the LLM")
+        return None
+    model = ControllerClassifier.load(ARTIFACT_PATH)
+    problem = model.quality_problem()
+    if problem:
+        print(f"⚠️ Controller classifier at {ARTIFACT_PATH} not used: {problem}; HR decisions go to the LLM")
+        return None
+    return model
+
+
+# Tiny; loaded on the first HR turn
+registry.register("controller_classifier", _load_artifact, warm=False)
+
+
+def classify(answer):
+    """(label, probability), or None when the classifier is off, untrained or below the quality bar."""
+    model = registry.get("controller_classifier")
+    return model.predict(answer) if model is not None else None
+
+
+# ---------- Training CLI ----------
+
+def cross_validate(texts, labels, folds=5, seed=0):
+    """k-fold accuracy (leave-one-out when there are fewer examples than folds)."""
+    order = np.random.default_rng(seed).permutation(len(texts))
+    folds = min(folds, len(texts))
+    correct = 0
+    for k in range(folds):
+        held = set(order[k::folds].tolist())
+        train = [i for i in range(len(texts)) if i not in held]
+        if len({labels[i] for i in train}) < 2:
+            continue
+        model = ControllerClassifier.fit([texts[i] for i in train], [labels[i] for i in train])
+        correct += sum(model.predict(texts[i])[0] == labels[i] for i in held)
+    return correct / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train", action="store_true", help="train and save the artifact")
+    parser.add_argument("--data", nargs="+", default=[str(DEFAULT_DATA)], help="training files")
+    parser.add_argument("--out", default=str(ARTIFACT_PATH))
+    parser.add_argument("--predict", metavar="ANSWER", help="classify one answer with the saved artifact")
+    args = parser.parse_args()
+
+    if not (args.train or args.predict):
+        parser.error("nothing to do: pass --train and/or --predict ANSWER")
+
+    if args.train:
+        texts, labels = load_examples(args.data)
+        counts = {label: labels.count(label) for label in sorted(set(labels))}
+        print(f"🔄 {len(texts)} examples: {counts}")
+        model = ControllerClassifier.fit(texts, labels)
+        train_acc = float(np.mean([model.predict(t)[0] == l for t, l in zip(texts, labels)]))
+        cv_acc = cross_validate(texts, labels)
+
+        start = time.perf_counter()
+        for text in texts * max(1, 200 // len(texts)):
+            model.predict(text)
+        per_call = (time.perf_counter() - start) / (len(texts) * max(1, 200 // len(texts)))
+
+        model.save(args.out, examples=len(texts), labels=counts, train_accuracy=train_acc, cv_accuracy=cv_acc)
+        print(f"✅ Saved {args.out}: train acc {train_acc:.2f}, cross-val acc {cv_acc:.2f}, "
+              f"{per_call * 1000:.3f} ms/prediction")
+        problem = ControllerClassifier.load(args.out).quality_problem()
+        if problem:
+            print(f"⚠️ The API won't use this artifact: {problem}")
+
+    if args.predict:
+        model = ControllerClassifier.load(args.out)
+        label, prob = model.predict(args.predict)
+        verdict = "local" if prob >= CONTROLLER_CLASSIFIER_THRESHOLD else "LLM fallback"
+        if not CONTROLLER_CLASSIFIER or model.quality_problem():
+            verdict = "LLM (classifier disabled or below the quality bar)"
+        print(f"{label} ({prob:.2f}, threshold {CONTROLLER_CLASSIFIER_THRESHOLD} -> {verdict})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,162 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-# Load controller model
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+from backend.model_registry import registry
+
+CONTROLLER_MODEL_PATH = "./controller-phi2"
+LABELS = ["probe", "clarify", "next_topic", "example", "behavior_check"]
+
+# Concurrent requests arriving within this window share one forward pass
+CONTROLLER_BATCH_WINDOW_MS = float(os.getenv("CONTROLLER_BATCH_WINDOW_MS", 5))
+CONTROLLER_MAX_BATCH = int(os.getenv("CONTROLLER_MAX_BATCH", 32))
+
+
+def _prompt(user_answer):
+    return f"User answer: {user_answer}\nAction:"
+
+
+def _prepare(tokenizer, model, device):
+    """(tokenizer, model, device, label token ids) as `decide_batch` expects them."""
+    import torch
+
+    # Left padding keeps every row's last real token at position -1
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    # The fine-tune answers " <label>"; its first token identifies the label
+    label_ids = [tokenizer.encode(" " + label, add_special_tokens=False)[0] for label in LABELS]
+    if len(set(label_ids)) != len(LABELS):
+        raise ValueError(f"Controller labels don't start with distinct tokens: {dict(zip(LABELS, label_ids))}")
+    return tokenizer, model.to(device).eval(), device, torch.tensor(label_ids, device=device)
+
+
+def _load_controller():
+    # torch/transformers and the phi-2 weights load on first decision, not at import
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    import torch
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print("Loading controller model…")
+    tokenizer = AutoTokenizer.from_pretrained(CONTROLLER_MODEL_PATH)
+    model = AutoModelForCausalLM.from_pretrained(CONTROLLER_MODEL_PATH)
+    return _prepare(tokenizer, model, device)
+
+
+# Optional local model, so it doesn't gate readiness
+registry.register("controller_phi2", _load_controller, warm=False)
+
+
+def decide_batch(user_answers):
+    """
+    (label, probability) per answer from ONE padded forward pass. Only the
+    next-token logits of the five label tokens are compared, so the output
+    is always a valid label and nothing is generated or decoded.
+    """
+    import torch
+
+    tokenizer, model, device, label_ids = registry.get("controller_phi2")
+    inputs = tokenizer([_prompt(a) for a in user_answers], return_tensors="pt", padding=True).to(device)
+    # phi-2 uses rotary positions: count from each row's first real token so
+    # left padding doesn't shift them and a row scores the same in any batch
+    position_ids = (inputs["attention_mask"].cumsum(-1) - 1).clamp(min=0)
+    with torch.inference_mode():
+        logits = model(**inputs, position_ids=position_ids).logits[:, -1, :]
+    probs = torch.softmax(logits.index_select(1, label_ids).float(), dim=-1)
+    best = probs.argmax(dim=-1)
+    return [(LABELS[i], float(probs[row, i])) for row, i in enumerate(best.tolist())]
 
-print("Loading controller model…")
-tokenizer = AutoTokenizer.from_pretrained("./controller-phi2")
-model = AutoModelForCausalLM.from_pretrained("./controller-phi2").to(DEVICE)
 
 # Function to get controller decision
 def get_controller_decision(user_answer: str):
-    prompt = f"User answer: {user_answer}\nAction:"
-    inputs = tokenizer(prompt, return_tensors="pt").to(DEVICE)
-
-    outputs = model.generate(
-        **inputs,
-        max_new_tokens=1,
-        do_sample=False,
-        temperature=0.0,
-        num_beams=1,
-        pad_token_id=tokenizer.pad_token_id,
-        eos_token_id=tokenizer.eos_token_id
-    )
-
-    decoded = tokenizer.decode(outputs[0], skip_special_tokens=True).lower()
-
-    # Extract decision keyword
-    for d in ["probe", "clarify", "next_topic", "example", "behavior_check"]:
-        if d in decoded:
-            return d
-
-    return "probe"
+    return decide_batch([user_answer])[0][0]
+
+
+class ControllerBatcher:
+    """
+    In-process dynamic batching for the controller. `decide()` queues the
+    answer; a worker task takes the first waiting request, collects more for
+    up to `window_ms` (or until `max_batch`), and runs them as one forward
+    pass on a dedicated thread so the event loop keeps serving.
+    """
+
+    def __init__(self, window_ms=CONTROLLER_BATCH_WINDOW_MS, max_batch=CONTROLLER_MAX_BATCH, infer=decide_batch):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.infer = infer
+        self.batches = 0
+        self.requests = 0
+        self._queue = None
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="controller")
+
+    async def decide(self, user_answer):
+        """(label, probability) for one answer, batched with concurrent callers."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((user_answer, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            # Requests that queued up during the last forward pass join without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return [(answer, future) for answer, future in batch if not future.cancelled()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                results = await loop.run_in_executor(self._executor, self.infer, [a for a, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0,
+        }
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+controller_batcher = ControllerBatcher()
+
+
+async def get_controller_decision_async(user_answer: str):
+    label, _ = await controller_batcher.decide(user_answer)
+    return label
 
 
 # Interactive testing loop
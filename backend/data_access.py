@@ -0,0 +1,195 @@
+# backend/data_access.py
+"""
+Async MongoDB access for request handlers.
+
+Everything an `async def` route or auth dependency reads or writes goes
+through the `store` singleton, which runs on PyMongo's native
+AsyncMongoClient, so a Mongo round trip no longer stalls the event loop
+that is also serving live interviews. CLIs, migrations and the session
+archiver keep using the sync client in backend.database.
+
+The client is created on first use and its pool is tuned with:
+
+    MONGO_MAX_POOL               connections per worker (default 50)
+    MONGO_MIN_POOL               kept open while idle (default 5)
+    MONGO_MAX_IDLE_MS            idle connections closed after this (default 60000)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS  fail instead of queueing forever for a connection (default 5000)
+    MONGO_SERVER_SELECTION_MS    fail fast when no server is reachable (default 5000)
+"""
+import os
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from backend.pagination import INTERVIEW_SUMMARY_PROJECTION, PAGE_SORT, keyset_filter, page_size, split_page
+from backend.user_stats import STATS_PROJECTION, fold_interviews, stats_update
+
+MONGO_MAX_POOL = int(os.getenv("MONGO_MAX_POOL", 50))
+MONGO_MIN_POOL = int(os.getenv("MONGO_MIN_POOL", 5))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", 60000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_MS = int(os.getenv("MONGO_SERVER_SELECTION_MS", 5000))
+
+# Dashboard chart fields only
+TREND_PROJECTION = {
+    "_id": 0, "date": 1, "role": 1, "mode": 1, "average_confidence": 1, "average_focus": 1,
+    **{f"feedback.{section}.score": 1 for section in ("technical", "behavioral", "coding")},
+}
+
+
+def new_user_fields(email):
+    return {
+        "email": email,
+        "name": "",
+        "phone": "",
+        "linkedin": "",
+        "github": "",
+        "role": "",
+        "skills": [],
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "groq_api_key": None,
+        "createdAt": datetime.utcnow()
+    }
+
+
+class DataStore:
+    """
+    Users, interviews, user_stats and resume_cache for the request path.
+    Pass `database` (any async driver database, e.g. an in-memory stand-in
+    in tests) to skip building the real client.
+    """
+
+    def __init__(self, database=None):
+        self._db = database
+        self._client = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            from pymongo import AsyncMongoClient
+            from backend.database import MONGODB_URI, DB_NAME
+
+            self._client = AsyncMongoClient(
+                MONGODB_URI,
+                maxPoolSize=MONGO_MAX_POOL,
+                minPoolSize=MONGO_MIN_POOL,
+                maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_MS,
+            )
+            self._db = self._client[DB_NAME]
+        return self._db
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._db = None
+
+    # ---------- Users ----------
+
+    async def get_or_create_user(self, clerk_id, email):
+        """Fetch the user, creating it on first sight in the same atomic upsert."""
+        users = self.db["users"]
+        try:
+            return await users.find_one_and_update(
+                {"clerkId": clerk_id},
+                {"$setOnInsert": new_user_fields(email)},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # A concurrent first request won the insert (unique clerkId index)
+            return await users.find_one({"clerkId": clerk_id})
+
+    async def update_user(self, clerk_id, fields):
+        """$set `fields` on the user; returns the updated document or None if there is no such user."""
+        return await self.db["users"].find_one_and_update(
+            {"clerkId": clerk_id},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def soft_delete_user(self, clerk_id):
+        """Mark the user deleted; returns False if there is no such user."""
+        result = await self.db["users"].update_one(
+            {"clerkId": clerk_id},
+            {"$set": {"deleted": True, "deletedAt": datetime.utcnow()}},
+        )
+        return result.matched_count > 0
+
+    # ---------- Interviews ----------
+
+    async def insert_interview(self, doc):
+        result = await self.db["interviews"].insert_one(doc)
+        return str(result.inserted_id)
+
+    async def interview_page(self, user_id, limit=50, cursor=None, projection=INTERVIEW_SUMMARY_PROJECTION):
+        """(docs, next_cursor) for one newest-first page of the user's interviews."""
+        limit = page_size(limit)
+        docs = await (
+            self.db["interviews"]
+            .find(keyset_filter({"userId": user_id}, cursor), projection)
+            .sort(PAGE_SORT)
+            .limit(limit + 1)
+            .to_list(None)
+        )
+        return split_page(docs, limit)
+
+    async def get_interview(self, user_id, interview_id):
+        """One of the user's interviews in full, or None (also for malformed ids)."""
+        if not ObjectId.is_valid(interview_id):
+            return None
+        return await self.db["interviews"].find_one({"_id": ObjectId(interview_id), "userId": user_id})
+
+    async def interview_trend(self, user_id):
+        """TREND_PROJECTION fields of every interview, oldest first."""
+        cursor = self.db["interviews"].find({"userId": user_id}, TREND_PROJECTION).sort("date", 1)
+        return await cursor.to_list(None)
+
+    # ---------- User stats ----------
+
+    async def record_interview(self, interview):
+        """Fold a just-inserted interview into its owner's stats document (one atomic update)."""
+        result = await self.db["user_stats"].update_one(
+            {"_id": interview["userId"], "rebuilt": True}, stats_update(interview)
+        )
+        if result.matched_count == 0:
+            # No complete document yet: build it from history, which already has this interview
+            await self.rebuild_user_stats(interview["userId"])
+
+    async def rebuild_user_stats(self, user_id):
+        interviews = await (
+            self.db["interviews"].find({"userId": user_id}, STATS_PROJECTION).sort("date", 1).to_list(None)
+        )
+        for doc in fold_interviews(interviews, user_id):
+            await self.db["user_stats"].replace_one({"_id": doc["_id"]}, doc, upsert=True)
+
+    async def get_user_stats(self, user_id):
+        """The user's stats document, built from their history on first access."""
+        stats = self.db["user_stats"]
+        doc = await stats.find_one({"_id": user_id})
+        if not doc or not doc.get("rebuilt"):
+            await self.rebuild_user_stats(user_id)
+            doc = await stats.find_one({"_id": user_id}) or {}
+        return doc
+
+    # ---------- Resume cache ----------
+
+    async def load_resume(self, digest, version):
+        doc = await self.db["resume_cache"].find_one({"_id": digest, "version": version}, {"parsed": 1})
+        return doc["parsed"] if doc else None
+
+    async def save_resume(self, digest, parsed, version, size):
+        await self.db["resume_cache"].update_one(
+            {"_id": digest},
+            {"$set": {"parsed": parsed, "version": version, "bytes": size, "createdAt": datetime.utcnow()}},
+            upsert=True,
+        )
+
+
+store = DataStore()
@@ -0,0 +1,174 @@
+# backend/db_migrations.py
+"""
+Index bootstrap, data migrations and a query-plan check for MongoDB.
+
+`ensure_indexes()` and `migrate_dates()` run at app startup (both
+idempotent). They can also be run by hand for deploys and CI:
+
+    python -m backend.db_migrations --indexes          # create indexes
+    python -m backend.db_migrations --migrate-dates    # ISO-string dates -> BSON datetimes
+    python -m backend.db_migrations --explain USER_ID  # fail on collection scans
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import OperationFailure
+
+from backend.database import db
+
+# collection -> [(keys, options)]
+INDEXES = {
+    "users": [
+        # Partial: profiles upserted by bulk_ingest have no clerkId until their
+        # owner signs up, and a plain unique index would treat them all as null
+        ([("clerkId", ASCENDING)], {
+            "name": "clerkId_unique", "unique": True,
+            "partialFilterExpression": {"clerkId": {"$type": "string"}},
+        }),
+        ([("email", ASCENDING)], {"name": "email"}),  # bulk_ingest's upsert key
+    ],
+    "interviews": [
+        # Per-user listings, keyset pages on (date, _id) and date-range filters
+        ([("userId", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], {"name": "userId_date"}),
+    ],
+}
+
+INDEX_CONFLICT_CODES = {85, 86}   # IndexOptionsConflict, IndexKeySpecsConflict
+
+
+def _create_index(collection, keys, options):
+    try:
+        return db[collection].create_index(keys, **options)
+    except OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES:
+            raise
+    # Same name, older options (e.g. clerkId_unique from before it was partial)
+    print(f"⚠️ Rebuilding index {options['name']} on {collection} with new options")
+    db[collection].drop_index(options["name"])
+    return db[collection].create_index(keys, **options)
+
+
+def ensure_indexes():
+    """Create every index in INDEXES; returns the names that are in place."""
+    created = []
+    for collection, specs in INDEXES.items():
+        for keys, options in specs:
+            try:
+                created.append(_create_index(collection, keys, options))
+            except OperationFailure as e:
+                # e.g. duplicate clerkIds left over from the old insert race
+                print(f"❌ Could not create index {options['name']} on {collection}: {e}")
+    return created
+
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def migrate_dates(batch_size=500):
+    """
+    Rewrite interviews whose `date` is an ISO string as a BSON datetime. A
+    string that doesn't parse falls back to the document's ObjectId creation
+    time (the original is kept in `date_unparsed`), so no interview is left
+    behind as a string. Safe to re-run. Returns (migrated, fallbacks).
+    """
+    interviews = db["interviews"]
+    migrated = fallbacks = 0
+    ops = []
+
+    for doc in interviews.find({"date": {"$type": "string"}}, {"date": 1}):
+        value = _parse_date(doc["date"])
+        update = {"date": value}
+        if value is None:
+            fallbacks += 1
+            print(f"⚠️ Unparseable date on interview {doc['_id']}: {doc['date']!r}, using its creation time")
+            update = {"date": doc["_id"].generation_time.replace(tzinfo=None), "date_unparsed": doc["date"]}
+        # Guard on the old value so a concurrent write isn't clobbered
+        ops.append(UpdateOne({"_id": doc["_id"], "date": doc["date"]}, {"$set": update}))
+        if len(ops) >= batch_size:
+            migrated += interviews.bulk_write(ops, ordered=False).modified_count
+            ops = []
+
+    if ops:
+        migrated += interviews.bulk_write(ops, ordered=False).modified_count
+    return migrated, fallbacks
+
+
+# ---------- Query-plan check ----------
+
+def dashboard_queries(user_id, now=None):
+    """(label, cursor) for each query the API runs on a dashboard/history page load."""
+    from backend.pagination import INTERVIEW_SUMMARY_PROJECTION
+    from backend.data_access import TREND_PROJECTION
+
+    week_ago = (now or datetime.now()) - timedelta(days=7)
+    interviews = db["interviews"]
+    return [
+        ("auth: user by clerkId", db["users"].find({"clerkId": user_id}).limit(1)),
+        ("user stats document", db["user_stats"].find({"_id": user_id}).limit(1)),
+        ("interview list page", interviews.find({"userId": user_id}, INTERVIEW_SUMMARY_PROJECTION)
+            .sort([("date", -1), ("_id", -1)]).limit(51)),
+        ("performance trend", interviews.find({"userId": user_id}, TREND_PROJECTION).sort("date", 1)),
+        ("interviews this week", interviews.find({"userId": user_id, "date": {"$gte": week_ago}})),
+        ("stats rebuild", interviews.find({"userId": user_id}).sort("date", 1)),
+    ]
+
+
+def _stages(plan):
+    """Every stage name in an explain() plan tree (classic and SBE formats)."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+def check_query_plans(user_id):
+    """Explain each dashboard query; returns the labels that fell back to a COLLSCAN."""
+    failures = []
+    for label, cursor in dashboard_queries(user_id):
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = list(_stages(plan))
+        status = "✅"
+        if "COLLSCAN" in stages:
+            status = "❌"
+            failures.append(label)
+        elif "SORT" in stages:
+            status = "⚠️ in-memory sort"
+        print(f"{status} {label}: {' <- '.join(stages)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indexes", action="store_true", help="create indexes")
+    parser.add_argument("--migrate-dates", action="store_true", help="convert ISO-string interview dates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--explain", metavar="USER_ID", help="explain dashboard queries for this user")
+    args = parser.parse_args()
+
+    if not (args.indexes or args.migrate_dates or args.explain):
+        parser.error("nothing to do: pass --indexes, --migrate-dates and/or --explain USER_ID")
+
+    if args.indexes:
+        print(f"✅ Indexes in place: {', '.join(ensure_indexes())}")
+    if args.migrate_dates:
+        migrated, fallbacks = migrate_dates(args.batch_size)
+        print(f"✅ Migrated {migrated} interview dates ({fallbacks} unparseable, set to creation time)")
+    if args.explain:
+        failures = check_query_plans(args.explain)
+        if failures:
+            print(f"❌ Collection scans in: {', '.join(failures)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
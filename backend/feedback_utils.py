@@ -1,12 +1,12 @@
-from langchain_ollama import OllamaLLM
 from langchain_core.prompts import PromptTemplate
 import json
-from backend.llm_groq_config import llm , code_llm
+from backend.llm_groq_config import get_llm, get_code_llm
+from backend.llm_gateway import ainvoke
 # You can tune these as needed
 #llm = OllamaLLM(model='mistral', temperature=0.7)
 #code_llm = OllamaLLM(model='codellama')
 
-def generate_hr_feedback(history):
+async def generate_hr_feedback(history):
     transcript = "\n".join(
         [f"Q: {item['question']}\nA: {item['answer']}" for item in history if item['answer']]
     )
@@ -45,8 +45,8 @@ Respond **only** with a well-formatted JSON object like this:
 """
     )
 
-    chain = prompt | llm
-    raw_output = chain.invoke({"transcript": transcript}).content
+    chain = prompt | get_llm()
+    raw_output = await ainvoke(chain, {"transcript": transcript}, task="feedback")
 
     # Try parsing the response into JSON
     try:
@@ -64,15 +64,49 @@ Respond **only** with a well-formatted JSON object like this:
 
     return feedback
 
-def generate_coding_feedback(history):
+MAX_FAILURES_IN_PROMPT = 5
+
+
+def _test_report(results):
+    """Plain-text test results for the review prompt."""
+    if not results:
+        return "Not run."
+    if results.get("error"):
+        return f"0/{results['total']} tests passed. The code could not be run: {results['error']}"
+    lines = [f"{results['passed']}/{results['total']} tests passed."]
+    failures = [t for t in results.get("tests", []) if not t["passed"]]
+    for t in failures[:MAX_FAILURES_IN_PROMPT]:
+        got = t.get("error") or f"returned {t.get('output')}"
+        lines.append(f"- args {t['args']}: expected {t['expected']}, {got}")
+    return "\n".join(lines)
+
+
+async def generate_coding_feedback(history):
     # Take last submitted solution
     latest = history[-1] if history else {}
 
     problem = latest.get("problem", {})
     code = latest.get("code", "")
+    results = latest.get("results")
+
+    # Graded by the test runner, not the LLM
+    attempted = sum(1 for item in history if (item.get("code") or "").strip())
+    solved = sum(1 for item in history if (item.get("results") or {}).get("solved"))
+    graded = {
+        "attempted": attempted,
+        "solved": solved,
+        "problems": [
+            {
+                "title": item.get("problem", {}).get("title"),
+                "passed": (item.get("results") or {}).get("passed", 0),
+                "total": (item.get("results") or {}).get("total", 0),
+            }
+            for item in history
+        ],
+    }
 
     prompt = PromptTemplate(
-        input_variables=["description", "function_signature", "code"],
+        input_variables=["description", "function_signature", "code", "test_results"],
         template="""
 You are a senior software engineer evaluating a candidate's coding submission.
 
@@ -85,9 +119,13 @@ Function Signature:
 Candidate's Code:
 {code}
 
+The code has already been run against the hidden test cases. These results
+are ground truth; do not re-derive correctness yourself, explain them:
+{test_results}
+
 Evaluate the solution on:
 
-- Correctness
+- Correctness (as shown by the test results)
 - Code clarity
 - Edge case handling
 - Time & space complexity
@@ -101,20 +139,22 @@ Respond only with a JSON object like:
   "edge_cases": 3.8,
   "efficiency": 4.0,
   "overall": 4.1,
+  "common_mistakes": ["Does not handle an empty list"],
   "summary": "The code solves the problem and is mostly clean. Could improve edge case handling and comments."
 }}
 """
     )
 
-    chain = prompt | code_llm
-    raw_output = chain.invoke({
+    chain = prompt | get_code_llm()
+    raw_output = await ainvoke(chain, {
         "description": problem.get("description", ""),
         "function_signature": problem.get("function_signature", ""),
-        "code": code
-    }).content
+        "code": code,
+        "test_results": _test_report(results),
+    }, task="feedback")
 
     try:
-        return json.loads(raw_output)
+        feedback = json.loads(raw_output)
     except Exception:
         return {
             "correctness": 0,
@@ -122,5 +162,11 @@ Respond only with a JSON object like:
             "edge_cases": 0,
             "efficiency": 0,
             "overall": 0,
-            "summary": "Feedback generation failed. Please retry or check the submitted code."
+            "summary": "Feedback generation failed. Please retry or check the submitted code.",
+            **graded,
         }
+
+    if results and results.get("total"):
+        feedback["correctness"] = round(5 * results["passed"] / results["total"], 1)
+    feedback.update(graded)
+    return feedback
@@ -1,7 +1,8 @@
 # backend/hr_interview_chain.py
 
 from langchain_core.prompts import ChatPromptTemplate
-from backend.llm_groq_config import llm
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke
 
 hr_question_prompt = ChatPromptTemplate.from_template("""
 You are an HR interviewer for the role of {role}.
@@ -27,12 +28,14 @@ Rules:
 - Natural, professional tone
 """)
 
-def generate_hr_question(role, prev_question, last_answer, decision):
-    return llm.invoke(
+async def generate_hr_question(role, prev_question, last_answer, decision):
+    return await ainvoke(
+        get_llm(),
         hr_question_prompt.format(
             role=role,
             prev_question=prev_question,
             last_answer=last_answer,
             decision=decision
-        )
-    ).content
+        ),
+        task="question"
+    )
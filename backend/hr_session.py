@@ -1,23 +1,24 @@
 # backend/hr_session.py
 
 from backend.hr_interview_chain import generate_hr_question
-from backend.controller_chain import get_controller_decision
+from backend.controller_chain import get_controller_decision, get_hr_decision_and_question, FUSED_CONTROLLER
 from backend.feedback_utils import generate_hr_feedback
+from backend.incremental_evaluator import IncrementalEvaluator
+from backend.turn import Turn
 
 class HRInterviewSession:
-    def __init__(self, role, session_id, rounds=5):
+    def __init__(self, role, session_id, rounds=5, fused=None):
         self.role = role
         self.session_id = session_id
         self.current_round = 0
         self.rounds = rounds
         self.round_type = "HR"
+        self.fused = FUSED_CONTROLLER if fused is None else fused
+        self.evaluator = IncrementalEvaluator("HR / behavioral")
 
-        self.history = [{
-            "question": "Welcome to the HR round of your interview. Tell me about yourself.",
-            "answer": None
-        }]
+        self.history = [Turn("Welcome to the HR round of your interview. Tell me about yourself.")]
 
-    def ask_question(self):
+    async def ask_question(self):
         """Return the next HR question."""
 
         if self.current_round >= self.rounds:
@@ -32,17 +33,25 @@ class HRInterviewSession:
         prev_question = self.history[-1]["question"]
         prev_answer = self.history[-1]["answer"]
 
-        decision = get_controller_decision(prev_question, prev_answer)
+        # Fused mode: decision + question in one call
+        fused = None
+        if self.fused:
+            fused = await get_hr_decision_and_question(self.role, prev_question, prev_answer)
 
-        # Generate next HR question
-        question = generate_hr_question(
-            role=self.role,
-            prev_question=prev_question,
-            last_answer=prev_answer,
-            decision=decision
-        )
+        if fused:
+            decision, question = fused
+        else:
+            decision = await get_controller_decision(prev_question, prev_answer)
 
-        self.history.append({"question": question, "answer": None})
+            # Generate next HR question
+            question = await generate_hr_question(
+                role=self.role,
+                prev_question=prev_question,
+                last_answer=prev_answer,
+                decision=decision
+            )
+
+        self.history.append(Turn(question))
         self.current_round += 1
         return question
 
@@ -50,6 +59,35 @@ class HRInterviewSession:
         """Store answer."""
         if self.history:
             self.history[-1]["answer"] = answer
+            self.evaluator.submit(self.history[-1]["question"], answer)
+
+    async def generate_feedback(self):
+        # Answers were scored as they came in; only aggregate + summarize
+        report = await self.evaluator.report()
+        if report:
+            return report
+
+        # Fallback: score the whole transcript in one call
+        return await generate_hr_feedback(self.history)
+
+    def to_dict(self):
+        return {
+            "role": self.role,
+            "session_id": self.session_id,
+            "rounds": self.rounds,
+            "current_round": self.current_round,
+            "fused": self.fused,
+            "history": [[t.question, t.answer] for t in self.history],
+            "meta": getattr(self, "meta", None),
+            "evaluator": self.evaluator.to_dict(),
+        }
 
-    def generate_feedback(self):
-        return generate_hr_feedback(self.history)
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data["role"], data["session_id"], rounds=data["rounds"], fused=data["fused"])
+        session.current_round = data["current_round"]
+        session.history = [Turn(q, a) for q, a in data["history"]]
+        if data.get("meta") is not None:
+            session.meta = data["meta"]
+        session.evaluator = IncrementalEvaluator.from_dict(data["evaluator"])
+        return session
@@ -0,0 +1,228 @@
+# backend/incremental_evaluator.py
+import asyncio
+import json
+import re
+import time
+import uuid
+
+from langchain_core.prompts import ChatPromptTemplate
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke, LLMUnavailable
+
+CATEGORIES = ["relevance", "clarity", "depth", "examples", "communication", "overall"]
+
+# Another worker's in-flight score is waited for (polling) until its claim is this old
+SCORE_CLAIM_TTL = 120
+SCORE_POLL_SECONDS = 0.5
+
+# Shared per-answer results when sessions live in a persistent store (see session_store.py)
+_score_store = None
+
+
+def set_score_store(store):
+    """
+    Route finished answer scores through `store` (get_answer_scores /
+    set_answer_score). Needed when sessions are deserialized per request:
+    the scoring task's own evaluator object is thrown away after the
+    request, so its result has to land somewhere the next reader looks.
+    """
+    global _score_store
+    _score_store = store
+
+answer_eval_prompt = ChatPromptTemplate.from_template("""
+You are an expert {interview_type} interview evaluator. Score this single answer.
+
+Question:
+\"\"\"{question}\"\"\"
+
+Candidate answer:
+\"\"\"{answer}\"\"\"
+
+Score each category out of 100 (0 = extremely poor, 100 = exceptional):
+relevance, clarity, depth, examples (use of real-world examples),
+communication (communication & confidence), overall.
+
+Respond ONLY with a JSON object like:
+{{"relevance": 70, "clarity": 65, "depth": 50, "examples": 40, "communication": 72, "overall": 60,
+  "note": "One short sentence on the main strength or gap in this answer."}}
+""")
+
+summary_prompt = ChatPromptTemplate.from_template("""
+You are an expert {interview_type} interview evaluator. Below are average scores (out of 100)
+and one-line notes on each of the candidate's answers.
+
+Scores: {scores}
+
+Notes:
+{notes}
+
+Write a 2-3 sentence summary of the candidate's performance addressed to them ("You...").
+Output ONLY the summary text.
+""")
+
+
+class IncrementalEvaluator:
+    """
+    Scores each Q/A pair in the background as soon as it is answered and
+    keeps running per-category totals, so the end-of-interview report is
+    an aggregation plus one short summary call instead of a long
+    full-transcript prompt.
+    """
+
+    def __init__(self, interview_type="technical"):
+        self.interview_type = interview_type
+        self.key = uuid.uuid4().hex    # names this evaluator's answers in the shared score store
+        self.totals = {c: 0.0 for c in CATEGORIES}
+        self.scored = 0
+        self.notes = {}          # answer index -> note
+        self._submitted = 0
+        self._pending = []       # (index, question, answer) not folded into totals yet
+        self._inflight = {}      # index -> (question, answer) being scored right now
+        self._tasks = set()
+
+    def submit(self, question, answer):
+        """Queue one answered question for scoring without waiting for it."""
+        if not answer or not answer.strip():
+            return
+
+        index = self._submitted
+        self._submitted += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts/tests) - score when the report is requested
+            self._pending.append((index, question, answer))
+            return
+
+        self._schedule(loop, index, question, answer)
+
+    def _schedule(self, loop, index, question, answer):
+        self._inflight[index] = (question, answer)
+        task = loop.create_task(self._score(index, question, answer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda _: self._inflight.pop(index, None))
+
+    async def _score(self, index, question, answer):
+        if _score_store is not None:
+            await asyncio.to_thread(_score_store.set_answer_score, self.key, index, {"claimed": time.time()})
+        result = await self._evaluate(index, question, answer)
+        self._apply(index, result)
+        if _score_store is not None:
+            await asyncio.to_thread(_score_store.set_answer_score, self.key, index, result)
+
+    async def _evaluate(self, index, question, answer):
+        """{"scores": {...}, "note": ...} for one answer, or {"failed": reason}."""
+        try:
+            raw = await ainvoke(get_llm(), answer_eval_prompt.format(
+                interview_type=self.interview_type,
+                question=question,
+                answer=answer
+            ), task="evaluate")
+        except LLMUnavailable as e:
+            print(f"⚠️ Answer {index + 1} not scored: {e}")
+            return {"failed": str(e)}
+
+        try:
+            match = re.search(r"\{.*\}", raw.replace("N/A", "null"), re.DOTALL)
+            data = json.loads(match.group(0)) if match else {}
+            scores = {c: min(max(float(data[c]), 0.0), 100.0) for c in CATEGORIES}
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Answer {index + 1} evaluation unparseable: {e}")
+            return {"failed": str(e)}
+
+        return {"scores": scores, "note": str(data.get("note") or "").strip()}
+
+    def _apply(self, index, result):
+        if "scores" not in result:
+            return
+        for c in CATEGORIES:
+            self.totals[c] += result["scores"][c]
+        self.scored += 1
+        if result.get("note"):
+            self.notes[index] = result["note"]
+
+    async def _collect_shared(self, pending):
+        """
+        Fold in scores that tasks (in any worker) already finished for
+        `pending`, waiting on ones still claimed. Returns what nobody scored.
+        """
+        while True:
+            stored = await asyncio.to_thread(_score_store.get_answer_scores, self.key)
+            unscored, claimed = [], []
+            for item in pending:
+                result = stored.get(item[0])
+                if result is None:
+                    unscored.append(item)
+                elif "claimed" in result:
+                    fresh = time.time() - result["claimed"] < SCORE_CLAIM_TTL
+                    (claimed if fresh else unscored).append(item)
+                else:
+                    self._apply(item[0], result)
+            if not claimed:
+                return unscored
+            await asyncio.sleep(SCORE_POLL_SECONDS)
+            pending = unscored + claimed
+
+    async def drain(self):
+        """Wait for in-flight scoring, then fold in or score whatever is still pending."""
+        await asyncio.gather(*list(self._tasks))
+        pending, self._pending = self._pending, []
+        if pending and _score_store is not None:
+            pending = await self._collect_shared(pending)
+        await asyncio.gather(*[self._score(i, q, a) for i, q, a in pending])
+
+    def averages(self):
+        if not self.scored:
+            return {}
+        return {c: round(self.totals[c] / self.scored) for c in CATEGORIES}
+
+    async def report(self):
+        """Final feedback dict, or None if no answer could be scored."""
+        await self.drain()
+        if not self.scored:
+            return None
+
+        result = self.averages()
+        notes = [self.notes[i] for i in sorted(self.notes)]
+
+        try:
+            summary = await ainvoke(get_llm(), summary_prompt.format(
+                interview_type=self.interview_type,
+                scores=json.dumps(result),
+                notes="\n".join(f"- {n}" for n in notes) or "- (none)"
+            ), task="evaluate")
+        except LLMUnavailable:
+            summary = " ".join(notes[:3])
+
+        result["summary"] = summary.strip()
+        return result
+
+    # ---------- Serialization (see session_store.py) ----------
+
+    def to_dict(self):
+        # Answers still being scored are saved as pending; their results are
+        # picked up from the shared score store (or scored) at report time
+        pending = self._pending + [(i, q, a) for i, (q, a) in self._inflight.items()]
+        return {
+            "interview_type": self.interview_type,
+            "key": self.key,
+            "totals": self.totals,
+            "scored": self.scored,
+            "notes": {str(i): n for i, n in self.notes.items()},
+            "submitted": self._submitted,
+            "pending": sorted(pending),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # Never reschedules: a read-only request must not score answers again
+        evaluator = cls(data["interview_type"])
+        evaluator.key = data.get("key") or evaluator.key
+        evaluator.totals = {c: float(data["totals"].get(c, 0.0)) for c in CATEGORIES}
+        evaluator.scored = data["scored"]
+        evaluator.notes = {int(i): n for i, n in data["notes"].items()}
+        evaluator._submitted = data["submitted"]
+        evaluator._pending = [tuple(item) for item in data["pending"]]
+        return evaluator
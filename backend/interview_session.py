@@ -1,15 +1,19 @@
 # interviewsession.py
 
+import asyncio
 import json
 from backend.vector_memory import VectorMemory
-from backend.controller_chain import get_tech_controller_decision
+from backend.controller_chain import get_tech_controller_decision, get_tech_decision_and_question, FUSED_CONTROLLER
 from backend.memory_interview_chain import generate_technical_question
 from langchain_core.prompts import ChatPromptTemplate
-from backend.llm_groq_config import llm
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke
+from backend.incremental_evaluator import IncrementalEvaluator
+from backend.turn import Turn, history_to_dicts
 import re
 
 class InterviewSession:
-    def __init__(self, resume_path=None, resume_obj=None, role='', rounds=3, session_id='default_user'):
+    def __init__(self, resume_path=None, resume_obj=None, role='', rounds=3, session_id='default_user', fused=None):
         # Load resume
         if resume_path:
             with open(resume_path, 'r', encoding='utf-8') as f:
@@ -24,12 +28,13 @@ class InterviewSession:
         self.rounds = rounds
         self.current_round = 0
         self.session_id = session_id
+        self.fused = FUSED_CONTROLLER if fused is None else fused
         self.vector_memory = VectorMemory()
+        self.evaluator = IncrementalEvaluator("technical")
 
-        self.history = [{
-            'question': "Can you briefly describe one technical project from your resume and the technologies you used?",
-            'answer': None
-        }]
+        self.history = [Turn(
+            "Can you briefly describe one technical project from your resume and the technologies you used?"
+        )]
 
     def _extract_recent_topics(self, limit=5):
         """
@@ -44,7 +49,7 @@ class InterviewSession:
                     recent.extend(keywords[:3])  # take top 3 keywords per question
         return list(set(recent))  # dedupe
 
-    def ask_question(self):
+    async def ask_question(self):
         if self.current_round >= self.rounds:
             return None
 
@@ -63,26 +68,51 @@ class InterviewSession:
         # Topic repetition avoidance
         recent_topics = self._extract_recent_topics()
 
-        # Stage 1: Controller decides action
-        decision = get_tech_controller_decision(
-            prev_question=prev_question,
-            candidate_answer=prev_answer,
-            role=self.role,
-            resume_excerpt=resume_excerpt,
-            recent_topics=recent_topics
-        )
-
-        # Stage 2: Generator produces the actual next question
-        next_q = generate_technical_question(
-            role=self.role,
-            decision=decision,
-            prev_question=prev_question,
-            candidate_answer=prev_answer,
-            resume_excerpt=resume_excerpt,
-            recent_topics=recent_topics
-        )
-
-        self.history.append({'question': next_q, 'answer': None})
+        # Fused mode: decision + question in one call
+        fused = None
+        if self.fused:
+            fused = await get_tech_decision_and_question(
+                prev_question=prev_question,
+                candidate_answer=prev_answer,
+                role=self.role,
+                resume_excerpt=resume_excerpt,
+                recent_topics=recent_topics
+            )
+
+        if fused:
+            decision, next_q = fused
+        else:
+            # Stage 1: Controller decides action
+            decision = await get_tech_controller_decision(
+                prev_question=prev_question,
+                candidate_answer=prev_answer,
+                role=self.role,
+                resume_excerpt=resume_excerpt,
+                recent_topics=recent_topics
+            )
+
+            # Stage 2: Generator produces the actual next question
+            next_q = await generate_technical_question(
+                role=self.role,
+                decision=decision,
+                prev_question=prev_question,
+                candidate_answer=prev_answer,
+                resume_excerpt=resume_excerpt,
+                recent_topics=recent_topics
+            )
+
+        # A "new topic" that is semantically a repeat gets one regeneration
+        if decision == "topic_transition" and await asyncio.to_thread(self.vector_memory.is_duplicate_topic, next_q):
+            next_q = await generate_technical_question(
+                role=self.role,
+                decision=decision,
+                prev_question=prev_question,
+                candidate_answer=prev_answer,
+                resume_excerpt=resume_excerpt,
+                recent_topics=recent_topics + list(self.vector_memory._extract_keywords(next_q))[:5]
+            )
+
+        self.history.append(Turn(next_q))
         self.current_round += 1
         return next_q
 
@@ -91,15 +121,22 @@ class InterviewSession:
             q = self.history[-1]['question']
             self.history[-1]['answer'] = answer
             self.vector_memory.add_qa(q, answer)
+            self.evaluator.submit(q, answer)
 
     def is_complete(self):
         return self.current_round >= self.rounds
 
     def summary(self):
-        return self.history
+        return history_to_dicts(self.history)
+
 
+    async def generate_feedback(self):
+        # Answers were scored as they came in; only aggregate + summarize
+        report = await self.evaluator.report()
+        if report:
+            return report
 
-    def generate_feedback(self):
+        # Fallback: score the whole transcript in one call
         qa_summary = ""
 
         for i, qa in enumerate(self.history, 1):
@@ -133,10 +170,9 @@ class InterviewSession:
             ("human", "{qa_summary}")
         ])
 
-        chain = feedback_prompt | llm
+        chain = feedback_prompt | get_llm()
 
-        raw = chain.invoke({"qa_summary": qa_summary})
-        raw_text = getattr(raw, "content", str(raw))
+        raw_text = await ainvoke(chain, {"qa_summary": qa_summary}, task="feedback")
 
         # Replace invalid JSON literals
         raw_text = raw_text.replace("N/A", "null")  # or use '"N/A"' if you prefer keeping it as a string
@@ -147,4 +183,33 @@ class InterviewSession:
         except Exception as e:
             parsed = {"error": f"Could not parse feedback: {str(e)}"}
 
-        return parsed
\ No newline at end of file
+        return parsed
+
+    def to_dict(self):
+        return {
+            "resume": self.resume,
+            "role": self.role,
+            "rounds": self.rounds,
+            "current_round": self.current_round,
+            "session_id": self.session_id,
+            "fused": self.fused,
+            "history": [[t.question, t.answer] for t in self.history],
+            "meta": getattr(self, "meta", None),
+            "evaluator": self.evaluator.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(resume_obj=data["resume"], role=data["role"], rounds=data["rounds"],
+                      session_id=data["session_id"], fused=data["fused"])
+        session.current_round = data["current_round"]
+        session.history = [Turn(q, a) for q, a in data["history"]]
+        if data.get("meta") is not None:
+            session.meta = data["meta"]
+        session.evaluator = IncrementalEvaluator.from_dict(data["evaluator"])
+
+        # Rebuild topic memory from the answered turns
+        for turn in session.history:
+            if turn.answer is not None:
+                session.vector_memory.add_qa(turn.question, turn.answer)
+        return session
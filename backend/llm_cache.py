@@ -0,0 +1,183 @@
+# backend/llm_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from backend.ttl_cache import TTLCache
+
+LLM_CACHE = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 2048))        # responses kept in memory
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 24 * 3600))     # seconds a response stays valid
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")               # SQLite file for the disk tier; empty = off
+
+_PARAM_TYPES = (str, int, float, bool, type(None), list, tuple)
+
+
+def split_runnable(runnable, input):
+    """
+    (model, prompt) for a bare chat model or a `prompt | model` chain, with
+    the prompt already rendered. None for anything else, which isn't cached.
+    """
+    steps = getattr(runnable, "steps", None)
+    if steps is None:
+        return runnable, input
+    if len(steps) != 2:
+        return None
+    return steps[1], steps[0].invoke(input)
+
+
+def _render(prompt):
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    return json.dumps(prompt, default=str, sort_keys=True)
+
+
+def _model_params(model):
+    params = getattr(model, "_identifying_params", None) or {}
+    return {k: v for k, v in params.items() if isinstance(v, _PARAM_TYPES)}
+
+
+def cache_key(model, prompt) -> str:
+    """Content address of a call: model class + params and a hash of the rendered prompt."""
+    payload = json.dumps({
+        "model": type(model).__name__,
+        "name": getattr(model, "model_name", None),
+        "params": _model_params(model),
+        "prompt": hashlib.sha256(_render(prompt).encode("utf-8")).hexdigest(),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """Responses in a SQLite file, shared by the worker processes on a node."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def get(self, key, ttl):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if not row or time.time() - row[1] > ttl:
+            return None
+        return row[0], row[1]
+
+    def set(self, key, value, created_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, created_at),
+            )
+
+    def purge(self, ttl):
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - ttl,))
+        return cur.rowcount
+
+
+class LLMCache:
+    """
+    Two-tier response cache for deterministic prompts: an in-memory LRU and
+    an optional SQLite file, both expiring `ttl` seconds after the response
+    was produced. Concurrent misses for the same key share one upstream
+    call (single-flight).
+    """
+
+    def __init__(self, maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL, path=LLM_CACHE_PATH):
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=maxsize)   # key -> (text, created_at)
+        self._disk = _DiskTier(path) if path else None
+        self._inflight = {}                        # key -> Task
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "coalesced": 0, "misses": 0, "rejected": 0}
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry[1] <= self.ttl
+
+    async def lookup(self, key):
+        entry = self._memory.get(key)
+        if self._fresh(entry):
+            self.counters["memory_hits"] += 1
+            return entry[0]
+
+        if self._disk:
+            entry = await asyncio.to_thread(self._disk.get, key, self.ttl)
+            if entry:
+                self._memory.set(key, entry)
+                self.counters["disk_hits"] += 1
+                return entry[0]
+        return None
+
+    async def store(self, key, text):
+        entry = (text, time.time())
+        self._memory.set(key, entry)
+        if self._disk:
+            await asyncio.to_thread(self._disk.set, key, *entry)
+
+    async def get_or_call(self, key, call, keep=None):
+        """
+        Cached text for `key`, or the result of awaiting `call()`. Only one
+        `call` per key runs at a time; `keep(text)` can veto storing a bad
+        response so the next request tries again.
+        """
+        text = await self.lookup(key)
+        if text is not None:
+            return text
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        self.counters["misses"] += 1
+        task = asyncio.ensure_future(self._fill(key, call, keep))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fill(self, key, call, keep):
+        text = await call()
+        if keep is None or keep(text):
+            await self.store(key, text)
+        else:
+            self.counters["rejected"] += 1
+        return text
+
+    def purge(self):
+        """Drop expired entries from both tiers; returns how many memory entries went."""
+        stale = [key for key, entry in self._memory.items() if not self._fresh(entry)]
+        for key in stale:
+            self._memory.pop(key)
+        if self._disk:
+            self._disk.purge(self.ttl)
+        return len(stale)
+
+    def stats(self):
+        c = self.counters
+        hits = c["memory_hits"] + c["disk_hits"] + c["coalesced"]
+        lookups = hits + c["misses"]
+        return {
+            **c,
+            "upstream_calls_saved": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_max": self._memory.maxsize,
+            "ttl_seconds": self.ttl,
+            "disk": bool(self._disk),
+            "inflight": len(self._inflight),
+        }
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,86 @@
+# backend/llm_gateway.py
+import asyncio
+import os
+import random
+
+import httpx
+
+from backend.llm_cache import LLM_CACHE, llm_cache, split_runnable, cache_key
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 16))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_CAP = float(os.getenv("LLM_BACKOFF_CAP", 8.0))
+
+# Seconds per attempt, by kind of call
+TASK_TIMEOUTS = {
+    "controller": 10,
+    "question": 20,
+    "evaluate": 20,
+    "feedback": 60,
+    "resume": 60,
+    "code": 60,
+}
+DEFAULT_TIMEOUT = 30
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# One global cap on in-flight LLM requests for this worker
+_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+
+class LLMUnavailable(Exception):
+    """The LLM call failed after all retries (timeout, rate limit, outage)."""
+
+
+def _is_retryable(exc):
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # groq SDK connection / timeout errors carry no status code
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+async def ainvoke(runnable, input, task="default", timeout=None, retries=LLM_MAX_RETRIES, cache=False):
+    """
+    Await `runnable.ainvoke(input)` under the global concurrency limit with a
+    per-attempt timeout and jittered exponential backoff between attempts.
+    Returns the message text.
+
+    `cache=True` (or a `keep(text) -> bool` predicate) serves repeated
+    prompts from llm_cache and coalesces identical in-flight calls; only use
+    it for prompts whose answer doesn't need to vary between calls.
+    """
+    if cache and LLM_CACHE:
+        split = split_runnable(runnable, input)
+        if split is not None:
+            model, prompt = split
+            keep = cache if callable(cache) else None
+            return await llm_cache.get_or_call(
+                cache_key(model, prompt),
+                lambda: _call(model, prompt, task, timeout, retries),
+                keep=keep,
+            )
+    return await _call(runnable, input, task, timeout, retries)
+
+
+async def _call(runnable, input, task, timeout, retries):
+    timeout = timeout or TASK_TIMEOUTS.get(task, DEFAULT_TIMEOUT)
+
+    for attempt in range(retries + 1):
+        try:
+            async with _semaphore:
+                result = await asyncio.wait_for(runnable.ainvoke(input), timeout)
+            return getattr(result, "content", result)
+
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                raise LLMUnavailable(f"LLM {task} call failed: {e!r}") from e
+
+            delay = random.uniform(0, min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * 2 ** attempt))
+            print(f"⚠️ LLM {task} attempt {attempt + 1} failed ({e!r}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
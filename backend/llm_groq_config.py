@@ -1,15 +1,42 @@
 # backend/llm_groq_config.py
 import os
-from langchain_groq import ChatGroq
+import httpx
 from dotenv import load_dotenv
 
+from backend.model_registry import registry
+
 # Load .env from root folder
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("DEFAULT_GROQ_API_KEY")
 
-if not GROQ_API_KEY:
-    raise ValueError("DEFAULT_GROQ_API_KEY not found in environment variables. Check your .env file in root folder.")
+# Keep-alive connection pool shared by both models; retries/timeouts live in llm_gateway
+_limits = httpx.Limits(
+    max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 64)),
+    max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", 32)),
+    keepalive_expiry=30,
+)
+http_client = httpx.Client(limits=_limits)
+http_async_client = httpx.AsyncClient(limits=_limits)
+
+
+def _groq(model):
+    # Imported and validated on first use, so importing the app needs neither the SDK nor the key
+    from langchain_groq import ChatGroq
+
+    if not GROQ_API_KEY:
+        raise ValueError("DEFAULT_GROQ_API_KEY not found in environment variables. Check your .env file in root folder.")
+    return ChatGroq(groq_api_key=GROQ_API_KEY, model=model,
+                    http_client=http_client, http_async_client=http_async_client, max_retries=0)
+
+
+registry.register("llm", lambda: _groq("llama-3.1-8b-instant"))
+registry.register("code_llm", lambda: _groq("llama-3.3-70b-versatile"))
+
+
+def get_llm():
+    return registry.get("llm")
+
 
-llm = ChatGroq(groq_api_key=GROQ_API_KEY, model="llama-3.1-8b-instant")
-code_llm = ChatGroq(groq_api_key=GROQ_API_KEY, model="llama-3.3-70b-versatile")
\ No newline at end of file
+def get_code_llm():
+    return registry.get("code_llm")
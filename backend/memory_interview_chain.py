@@ -4,11 +4,12 @@ import json
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
 # backend/technical_question_chain.py
 
 from langchain_core.prompts import ChatPromptTemplate
-from backend.llm_groq_config import llm
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke
+from backend.ttl_cache import TTLCache
 
 _question_prompt = ChatPromptTemplate.from_template("""
 You are an interviewer generating the next technical question for the candidate.
@@ -47,12 +48,12 @@ Rules per decision:
 Output ONLY the question. No explanations, no multiple questions.
 """)
 
-def generate_technical_question(role,
-                                decision,
-                                prev_question,
-                                candidate_answer,
-                                resume_excerpt,
-                                recent_topics):
+async def generate_technical_question(role,
+                                      decision,
+                                      prev_question,
+                                      candidate_answer,
+                                      resume_excerpt,
+                                      recent_topics):
     prompt = _question_prompt.format(
         role=role or "general",
         decision=decision,
@@ -62,18 +63,21 @@ def generate_technical_question(role,
         recent_topics=", ".join(recent_topics) if recent_topics else "none"
     )
 
-    resp = llm.invoke(prompt).content.strip()
+    resp = (await ainvoke(get_llm(), prompt, task="question", cache=True)).strip()
     
     # return only the first question-like sentence if model misbehaves
     return resp
 
 
 
-# Memory session store
-session_store = {}
+# Memory session store (bounded: idle histories expire, oldest dropped past the cap)
+session_store = TTLCache(maxsize=1000, ttl=2 * 3600)
 
 def get_session_history(session_id):
-    if session_id not in session_store:
-        session_store[session_id] = ChatMessageHistory()
-    return session_store[session_id]
+    history = session_store.get(session_id)
+    if history is None:
+        from langchain_community.chat_message_histories import ChatMessageHistory  # slow import, first session only
+        history = ChatMessageHistory()
+        session_store.set(session_id, history)
+    return history
 
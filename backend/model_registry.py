@@ -0,0 +1,104 @@
+# backend/model_registry.py
+import asyncio
+import threading
+import time
+
+
+class ModelRegistry:
+    """
+    Heavy models by name, each built at most once per process: on first
+    `get()`, or ahead of time by `warm_up()` running as a background task so
+    the server answers health checks while models load.
+
+    A loader is a zero-argument callable returning the model. Coroutine
+    loaders (e.g. spinning up a worker pool) are only run by `warm_up()`.
+    Models registered with `warm=False` load on demand and don't gate
+    readiness.
+    """
+
+    def __init__(self):
+        self._loaders = {}    # name -> (loader, warm)
+        self._models = {}
+        self._errors = {}
+        self._load_seconds = {}
+        self._locks = {}
+        self._loading = set()
+
+    def register(self, name, loader, warm=True):
+        self._loaders[name] = (loader, warm)
+        self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        if name in self._models:
+            return self._models[name]
+        loader, _ = self._loaders[name]
+        if asyncio.iscoroutinefunction(loader):
+            raise TypeError(f"{name} loads asynchronously; use `await registry.aget({name!r})`")
+
+        with self._locks[name]:
+            if name not in self._models:
+                self._loading.add(name)
+                start = time.perf_counter()
+                try:
+                    self._models[name] = loader()
+                except Exception as e:
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    self._loading.discard(name)
+                self._load_seconds[name] = round(time.perf_counter() - start, 2)
+                self._errors.pop(name, None)
+        return self._models[name]
+
+    async def aget(self, name):
+        if name in self._models:
+            return self._models[name]
+        loader, _ = self._loaders[name]
+        if not asyncio.iscoroutinefunction(loader):
+            return await asyncio.to_thread(self.get, name)
+
+        self._loading.add(name)
+        start = time.perf_counter()
+        try:
+            self._models[name] = await loader()
+        except Exception as e:
+            self._errors[name] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._loading.discard(name)
+        self._load_seconds[name] = round(time.perf_counter() - start, 2)
+        self._errors.pop(name, None)
+        return self._models[name]
+
+    async def warm_up(self):
+        """Load every warm model concurrently; failures are recorded, not raised."""
+        async def load(name):
+            try:
+                await self.aget(name)
+                print(f"✅ {name} ready in {self._load_seconds[name]}s")
+            except Exception as e:
+                print(f"❌ Could not load {name}: {e}")
+
+        await asyncio.gather(*(load(name) for name, (_, warm) in self._loaders.items() if warm))
+
+    def ready(self):
+        return all(name in self._models for name, (_, warm) in self._loaders.items() if warm)
+
+    def status(self):
+        """name -> {"state": ready|loading|error|cold, ...} for the readiness probe."""
+        status = {}
+        for name, (_, warm) in self._loaders.items():
+            if name in self._models:
+                entry = {"state": "ready", "seconds": self._load_seconds.get(name)}
+            elif name in self._loading:
+                entry = {"state": "loading"}
+            elif name in self._errors:
+                entry = {"state": "error", "error": self._errors[name]}
+            else:
+                entry = {"state": "cold"}
+            entry["warm"] = warm
+            status[name] = entry
+        return status
+
+
+registry = ModelRegistry()
@@ -0,0 +1,78 @@
+# backend/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 200
+PAGE_SORT = [("date", -1), ("_id", -1)]
+
+# List views only need these; transcripts and feedback text stay on the detail endpoint
+INTERVIEW_SUMMARY_PROJECTION = {
+    "userId": 1, "date": 1, "role": 1, "mode": 1, "average_confidence": 1, "average_focus": 1,
+    "feedback.overall": 1, "feedback.overall_score": 1,
+    **{
+        f"feedback.{section}.{field}": 1
+        for section in ("technical", "behavioral", "coding")
+        for field in ("score", "overall", "overall_score")
+    },
+}
+
+
+def encode_cursor(doc) -> str:
+    date = doc.get("date")
+    payload = {"i": str(doc["_id"])}
+    if isinstance(date, datetime):
+        payload.update(d=date.isoformat(), t="date")
+    else:
+        payload["d"] = date
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        date = datetime.fromisoformat(payload["d"]) if payload.get("t") == "date" else payload["d"]
+        return date, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_filter(query, cursor=None):
+    """
+    `query` narrowed to the documents after `cursor` in (date, _id) descending
+    order (PAGE_SORT). Each page is then a bounded index range scan however
+    deep into the history it is.
+
+    Dates not yet migrated to BSON datetimes are still ISO strings. BSON
+    orders by type first (datetime > string > null, descending) and range
+    operators never cross types, so the types that sort after the cursor's
+    are added as their own branches.
+    """
+    if not cursor:
+        return query
+    date, oid = decode_cursor(cursor)
+    after = [{"date": date, "_id": {"$lt": oid}}]
+    if date is not None:
+        after.append({"date": {"$lt": date}})
+        after.append({"date": None})
+    if isinstance(date, datetime):
+        after.append({"date": {"$type": "string"}})
+    return {"$and": [query, {"$or": after}]}
+
+
+def split_page(docs, limit):
+    """
+    (page, next_cursor) from up to limit + 1 documents fetched in PAGE_SORT
+    order; next_cursor is None on the last page.
+    """
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
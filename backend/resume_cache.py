@@ -0,0 +1,65 @@
+# backend/resume_cache.py
+import asyncio
+import hashlib
+import os
+
+from backend.data_access import store
+from backend.resume_parser import parse_resume_with_llm
+from backend.ttl_cache import TTLCache
+
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", 256))        # parsed resumes kept in memory
+RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", 24 * 3600))    # idle seconds in the memory tier
+
+# Bump when the parse prompt or output schema changes so old results are re-parsed
+PARSER_VERSION = 2
+
+_front = TTLCache(maxsize=RESUME_CACHE_SIZE, ttl=RESUME_CACHE_TTL)
+_inflight = {}   # digest -> Task, so simultaneous uploads of one file parse once
+
+
+def resume_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def get_cached_resume(digest):
+    parsed = _front.get(digest)
+    if parsed is not None:
+        return parsed
+    try:
+        parsed = await store.load_resume(digest, PARSER_VERSION)
+    except Exception as e:
+        print(f"⚠️ Resume cache lookup failed: {e}")
+        return None
+    if parsed is not None:
+        _front.set(digest, parsed)
+    return parsed
+
+
+async def _parse_and_store(digest, data):
+    result = await parse_resume_with_llm(data)
+    if "error" not in result:
+        _front.set(digest, result)
+        try:
+            await store.save_resume(digest, result, PARSER_VERSION, len(data))
+        except Exception as e:
+            print(f"⚠️ Could not persist parsed resume: {e}")
+    return result
+
+
+async def parse_resume_cached(data: bytes):
+    """
+    Parsed resume for the PDF bytes in `data`. Identical files (same SHA-256)
+    are served from memory or the `resume_cache` collection; failures are
+    never cached.
+    """
+    digest = resume_digest(data)
+    cached = await get_cached_resume(digest)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(digest)
+    if task is None:
+        task = asyncio.ensure_future(_parse_and_store(digest, data))
+        _inflight[digest] = task
+        task.add_done_callback(lambda _: _inflight.pop(digest, None))
+    return await asyncio.shield(task)
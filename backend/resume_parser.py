@@ -1,19 +1,25 @@
-import fitz  # PyMuPDF
 import json
+import os
 import re
-from langchain_ollama import OllamaLLM
+import time
 from langchain_core.prompts import PromptTemplate
-from backend.llm_groq_config import llm
+import asyncio
+from backend.llm_groq_config import get_llm
+from backend.llm_gateway import ainvoke, LLMUnavailable
+from backend.resume_sections import open_pdf, extract_sections
+
+# Longer sections are sent in several calls instead of being cut off
+SECTION_CHUNK_CHARS = int(os.getenv("RESUME_SECTION_CHUNK_CHARS", 6000))
 
 
 # Step 1: Extract text from PDF
-def extract_text_from_pdf(file_path):
+def extract_text_from_pdf(source):
     """
     Extract text from PDF using PyMuPDF
     """
     text = ""
     try:
-        with fitz.open(file_path) as pdf:
+        with open_pdf(source) as pdf:
             for page in pdf:
                 text += page.get_text()
         return text.strip()
@@ -39,6 +45,28 @@ def clean_json_response(response):
     return response.strip()
 
 
+def _is_json_response(response):
+    try:
+        json.loads(clean_json_response(response))
+        return True
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+
+def clean_json_array(response):
+    """Like clean_json_response, for replies that should be a JSON list"""
+    response = re.sub(r'```(json)?\s*', '', response)
+    json_match = re.search(r'\[.*\]', response, re.DOTALL)
+    return json_match.group(0) if json_match else response.strip()
+
+
+def _is_json_array(response):
+    try:
+        return isinstance(json.loads(clean_json_array(response)), list)
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+
 # Step 3: Define the LangChain LLM + Prompt
 def setup_llm_chain():
     """
@@ -90,7 +118,7 @@ Resume Text:
             template=template
         )
 
-        chain = prompt | llm
+        chain = prompt | get_llm()
         return chain
     
     except Exception as e:
@@ -101,36 +129,78 @@ Resume Text:
 
 
 
-# Step 4: Parse resume with error handling
-def parse_resume_with_llm(pdf_path, max_retries=3):
-    """
-    Parse resume with retry logic and error handling
-    """
-    # Extract text from PDF
-    resume_text = extract_text_from_pdf(pdf_path)
-    if not resume_text:
-        return {"error": "Could not extract text from PDF"}
-    
-    # Setup LLM chain
+# Step 4: Per-section prompts for the parts that need interpretation
+SECTION_SCHEMAS = {
+    "education": '[{"degree": "degree name", "institution": "school name", "year": "graduation year"}]',
+    "experience": '[{"title": "job title", "company": "company name", "duration": "time period", '
+                  '"description": "job description"}]',
+    "projects": '[{"title": "project name", "tech": ["technology1", "technology2"], '
+                '"description": "project description"}]',
+}
+
+section_prompt = PromptTemplate(
+    input_variables=["section", "schema", "text"],
+    template="""
+You are an intelligent resume parser. Below is the {section} section of a resume.
+Return ONLY a valid JSON array with one object per entry, in this exact format:
+
+{schema}
+
+Important: Return ONLY the JSON array, no additional text or explanation.
+
+{section} section:
+{text}
+"""
+)
+
+
+def _chunks(text, limit=SECTION_CHUNK_CHARS):
+    """Split on line boundaries into pieces of at most ~limit chars."""
+    chunks, current = [], ""
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > limit:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+async def _parse_section(kind, text, max_retries):
+    response = ""
+    for attempt in range(max_retries):
+        response = await ainvoke(section_prompt | get_llm(), {
+            "section": kind,
+            "schema": SECTION_SCHEMAS[kind],
+            "text": text,
+        }, task="resume", cache=_is_json_array)
+        try:
+            items = json.loads(clean_json_array(response))
+            if isinstance(items, list):
+                return [item for item in items if isinstance(item, dict)]
+        except json.JSONDecodeError as e:
+            print(f"❌ JSON parsing error in {kind} on attempt {attempt + 1}: {e}")
+    print(f"❌ Giving up on {kind} section; raw response: {response[:200]!r}")
+    return []
+
+
+async def _parse_full_text(resume_text, max_retries):
+    """Whole-resume prompt, used when no section headings were recognized."""
     chain = setup_llm_chain()
     if not chain:
         return {"error": "Could not setup LLM chain"}
-    
+
     # Try parsing with retries
     for attempt in range(max_retries):
         try:
-            
-            
-            # Get response from LLM
-            response = chain.invoke({"text":resume_text[:4000]})  # Limit text length
-            
+            # Cached by prompt hash, so a re-uploaded resume skips the LLM; unparseable replies aren't kept
+            response = await ainvoke(chain, {"text": resume_text}, task="resume", cache=_is_json_response)
+
             # Clean and parse JSON
             cleaned_response = clean_json_response(response)
-            parsed_data = json.loads(cleaned_response)
-            
-            
-            return parsed_data
-            
+            return json.loads(cleaned_response)
+
         except json.JSONDecodeError as e:
             print(f"❌ JSON parsing error on attempt {attempt + 1}: {e}")
             if attempt == max_retries - 1:
@@ -139,15 +209,80 @@ def parse_resume_with_llm(pdf_path, max_retries=3):
                     "raw_response": response,
                     "cleaned_response": cleaned_response
                 }
-        
+
+        except LLMUnavailable as e:
+            # Transport-level retries already happened in the gateway
+            return {"error": f"Failed to process resume: {str(e)}"}
+
         except Exception as e:
             print(f"❌ General error on attempt {attempt + 1}: {e}")
             if attempt == max_retries - 1:
                 return {"error": f"Failed to process resume: {str(e)}"}
-    
+
     return {"error": "Unexpected failure"}
 
 
+async def parse_resume_with_llm(pdf, max_retries=3):
+    """
+    Parse resume (a file path or the PDF bytes). Contact details, links and
+    skills are extracted deterministically; only education, experience and
+    projects go to the LLM, one concurrent call per section (chunk).
+    """
+    try:
+        pre = await asyncio.to_thread(extract_sections, pdf)
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return {"error": "Could not extract text from PDF"}
+    return await parse_extracted(pre, max_retries)
+
+
+async def parse_extracted(pre, max_retries=3):
+    """LLM stage for an `extract_sections` result (also used by bulk_ingest)."""
+    if not pre["text"]:
+        return {"error": "Could not extract text from PDF"}
+
+    jobs = [
+        (kind, chunk)
+        for kind in SECTION_SCHEMAS
+        for chunk in _chunks(pre["sections"].get(kind, ""))
+    ]
+    if not jobs:
+        # No recognizable headings: let the model read the whole resume
+        parsed = await _parse_full_text(pre["text"], max_retries)
+        if "error" not in parsed:
+            parsed.setdefault("links", pre["links"])
+        return parsed
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(_parse_section(kind, chunk, max_retries) for kind, chunk in jobs))
+    except LLMUnavailable as e:
+        # Transport-level retries already happened in the gateway
+        return {"error": f"Failed to process resume: {str(e)}"}
+
+    parsed = {
+        "name": pre["name"],
+        "email": pre["email"],
+        "phone": pre["phone"],
+        "links": pre["links"],
+        "education": [],
+        "skills": pre["skills"],
+        "experience": [],
+        "projects": [],
+    }
+    for (kind, _), items in zip(jobs, results):
+        parsed[kind].extend(items)
+
+    if not parsed["skills"]:
+        # No skills section: fall back to the technologies named in projects
+        tech = [t for p in parsed["projects"] for t in p.get("tech") or [] if isinstance(t, str)]
+        parsed["skills"] = list(dict.fromkeys(tech))
+
+    print(f"📄 Parsed resume in {time.perf_counter() - started:.2f}s: "
+          f"{len(jobs)} LLM calls, {sum(len(c) for _, c in jobs)} of {len(pre['text'])} chars sent")
+    return parsed
+
+
 # Step 5: Main execution with better error handling
 def main():
     """
@@ -171,7 +306,7 @@ def main():
         return
     
     # Parse the resume
-    result = parse_resume_with_llm(pdf_path)
+    result = asyncio.run(parse_resume_with_llm(pdf_path))
     
     # Display results
     print("\n" + "="*50)
@@ -0,0 +1,159 @@
+# backend/resume_sections.py
+"""
+Deterministic first pass over a resume PDF using PyMuPDF's block/span data.
+
+Contact details, links, the candidate's name and the skills list are read
+directly; the rest of the text is split at section headings so the LLM
+only sees the sections that need interpretation (education, experience,
+projects), each on its own and in full.
+"""
+import re
+
+import fitz  # PyMuPDF
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s|,;]+|\b(?:github|gitlab|linkedin|leetcode)\.com/[^\s|,;]+", re.I)
+
+SECTION_PATTERNS = {
+    "education": re.compile(r"(education(al background)?|academic background|academics|qualifications)"),
+    "experience": re.compile(
+        r"((work|professional|relevant|industry)\s+)?(experience|employment( history)?|work history|internships?)"
+    ),
+    "projects": re.compile(r"((academic|personal|key|selected|technical|major)\s+)?projects?"),
+    "skills": re.compile(
+        r"((technical|key|core|relevant)\s+)?(skills|technologies|tech stack|competencies)(\s+(and|&)\s+[a-z]+)?"
+    ),
+}
+OTHER_HEADING_RE = re.compile(
+    r"(summary|objective|profile|about me|certifications?|achievements|awards|honou?rs|publications|"
+    r"interests|hobbies|languages|activities|extra[- ]?curricular activities|positions? of responsibility|"
+    r"leadership|volunteering|references|courses|(relevant )?coursework|declaration)"
+)
+SKILL_SPLIT_RE = re.compile(r"[,|;•·▪●]")
+BULLET_RE = re.compile(r"^[\s•·▪●◦\-–*]+")
+
+
+def open_pdf(source):
+    """Open a PDF from a path or straight from uploaded bytes (nothing written to disk)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    return fitz.open(source)
+
+
+def _normalize_heading(text):
+    return re.sub(r"\s+", " ", text.strip().strip(":").strip()).lower()
+
+
+def _read_lines(doc):
+    """Every text line as {"text", "size", "page"} in reading order."""
+    lines = []
+    for page_no, page in enumerate(doc):
+        for block in page.get_text("dict", sort=True)["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block["lines"]:
+                spans = [s for s in line["spans"] if s["text"].strip()]
+                if not spans:
+                    continue
+                lines.append({
+                    "text": " ".join(s["text"].strip() for s in spans),
+                    "size": max(s["size"] for s in spans),
+                    "page": page_no,
+                })
+    return lines
+
+
+def _read_links(doc):
+    return [link["uri"] for page in doc for link in page.get_links() if link.get("uri")]
+
+
+def _heading_kind(line):
+    """
+    Section key for a heading line, "other" for a known unrelated heading,
+    else None. Only whole-line matches count, so bold job titles and
+    company names inside a section never split it.
+    """
+    text = _normalize_heading(line["text"])
+    if not text or len(text.split()) > 5:
+        return None
+    for kind, pattern in SECTION_PATTERNS.items():
+        if pattern.fullmatch(text):
+            return kind
+    if OTHER_HEADING_RE.fullmatch(text):
+        return "other"
+    return None
+
+
+def _find_name(header_lines):
+    candidates = [
+        l for l in header_lines
+        if l["page"] == 0 and not re.search(r"[\d@/:|]", l["text"]) and 1 < len(l["text"].split()) <= 5
+    ]
+    if not candidates:
+        return ""
+    return max(candidates, key=lambda l: l["size"])["text"].strip()
+
+
+def parse_skills(text):
+    """Skill names from a skills section: "Languages: Python, C++ | SQL" -> ["Python", "C++", "SQL"]."""
+    skills, seen = [], set()
+    for line in text.splitlines():
+        line = BULLET_RE.sub("", line)
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .()")
+            if item and len(item) <= 40 and item.lower() not in seen:
+                seen.add(item.lower())
+                skills.append(item)
+    return skills
+
+
+def _first_phone(text):
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(0))
+        if 10 <= len(digits) <= 15:
+            return match.group(0).strip()
+    return ""
+
+
+def extract_sections(source):
+    """
+    Deterministic pre-extraction from a PDF path or bytes. Returns
+    {"name", "email", "phone", "links", "skills", "sections", "text"} where
+    `sections` maps education / experience / projects / skills / other to
+    their full text (missing sections are absent).
+    """
+    with open_pdf(source) as doc:
+        lines = _read_lines(doc)
+        links = _read_links(doc)
+
+    text = "\n".join(l["text"] for l in lines)
+
+    sections, header, current = {}, [], None
+    for line in lines:
+        kind = _heading_kind(line)
+        if kind:
+            current = kind
+            sections.setdefault(kind, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line["text"])
+    sections = {kind: "\n".join(body) for kind, body in sections.items() if body}
+
+    email = EMAIL_RE.search(text)
+    for url in URL_RE.findall(text):
+        links.append(url.rstrip(".)"))
+    links = list(dict.fromkeys(l for l in links if not l.startswith("mailto:")))
+
+    return {
+        "name": _find_name(header),
+        "email": email.group(0) if email else "",
+        "phone": _first_phone(text),
+        "links": links,
+        "skills": parse_skills(sections.get("skills", "")),
+        "sections": sections,
+        "text": text,
+    }
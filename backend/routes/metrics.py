@@ -0,0 +1,26 @@
+# backend/routes/metrics.py
+from fastapi import APIRouter, Depends
+from backend.auth import get_current_user
+from backend.session_store import user_sessions
+from backend.llm_cache import llm_cache
+from backend.controller_model import controller_batcher
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/sessions")
+def get_session_metrics(user: str = Depends(get_current_user)):
+    """Live interview sessions in this worker and their approximate memory use"""
+    return user_sessions.stats()
+
+
+@router.get("/llm-cache")
+def get_llm_cache_metrics(user: str = Depends(get_current_user)):
+    """Hit/miss counters of the LLM response cache in this worker"""
+    return llm_cache.stats()
+
+
+@router.get("/controller-batching")
+def get_controller_batching_metrics(user: str = Depends(get_current_user)):
+    """Forward passes and mean batch size of the phi-2 controller in this worker"""
+    return controller_batcher.stats()
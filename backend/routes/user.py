@@ -1,7 +1,7 @@
 # backend/routes/user.py
 from fastapi import APIRouter, Depends, HTTPException
-from backend.auth import get_current_user, get_current_user_full
-from backend.database import users_collection
+from backend.auth import get_current_user, get_current_user_full, invalidate_user
+from backend.data_access import store
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
@@ -25,13 +25,13 @@ class UserProfileUpdate(BaseModel):
 
 
 @router.get("/profile")
-def get_profile(user_data: dict = Depends(get_current_user_full)):
+async def get_profile(user_data: dict = Depends(get_current_user_full)):
     """Get full user profile"""
     return user_data
 
 
 @router.put("/profile")
-def update_profile(
+async def update_profile(
     profile_data: UserProfileUpdate,
     user: str = Depends(get_current_user)
 ):
@@ -47,41 +47,33 @@ def update_profile(
     update_data["updatedAt"] = datetime.utcnow()
     update_data["profileCompleted"] = True
     
-    # Update user in database
-    result = users_collection.update_one(
-        {"clerkId": user},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
+    # Update user in database and get the updated document back in one round trip
+    updated_user = await store.update_user(user, update_data)
+    invalidate_user(user)
+
+    if updated_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Return updated user data
-    updated_user = users_collection.find_one({"clerkId": user})
     updated_user["_id"] = str(updated_user["_id"])
     
     return {"message": "Profile updated successfully", "user": updated_user}
 
 
 @router.delete("/profile")
-def delete_profile(user: str = Depends(get_current_user)):
+async def delete_profile(user: str = Depends(get_current_user)):
     """Delete user profile (soft delete - marks as deleted)"""
-    result = users_collection.update_one(
-        {"clerkId": user},
-        {"$set": {"deleted": True, "deletedAt": datetime.utcnow()}}
-    )
+    deleted = await store.soft_delete_user(user)
+    invalidate_user(user)
     
-    if result.matched_count == 0:
+    if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
     
     return {"message": "Profile deleted successfully"}
 
 
 @router.get("/check-profile")
-def check_profile_completion(user: str = Depends(get_current_user)):
+async def check_profile_completion(user_data: dict = Depends(get_current_user_full)):
     """Check if user has completed their profile"""
-    user_data = users_collection.find_one({"clerkId": user})
-    
     if not user_data:
         return {"profileCompleted": False}
     
@@ -0,0 +1,379 @@
+# backend/sandbox_worker.py
+"""
+One sandboxed run of a coding submission; started (pre-forked) by
+backend.code_runner as
+`python -I -S sandbox_worker.py CPU_SECONDS MEMORY_MB UID REQUIRE_ISOLATION`.
+
+The worker blocks on stdin for one JSON job {code, entry_point, args,
+test_timeout_ms}; `args` holds each test's arguments only, the expected
+values never leave the API process. It then forks:
+
+- the child isolates itself (see `_isolate`), applies rlimits, installs
+  the audit hook and runs the code. Its only channel is the write end of
+  a pipe to the worker, on which it sends one JSON message with each
+  test's return value (or error) and timing, then exits
+- the worker runs no submission code. It reads at most MAX_MESSAGE_BYTES
+  from the pipe, reaps the child and writes the message (or why there was
+  none) to its stdout, which only it holds, for code_runner to grade
+
+Stdlib-only and import-light, since it runs as a plain script in a fresh
+interpreter for every submission.
+"""
+import io
+import json
+import os
+import signal
+import sys
+import time
+
+MAX_OUTPUT_CHARS = 200            # captured prints returned with the results
+MAX_VALUE_CHARS = 100_000         # one test's JSON-encoded return value
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+SIGXCPU = 24
+
+_BLOCKED_EVENT_PREFIXES = (
+    "socket.", "subprocess.", "os.system", "os.exec", "os.spawn", "os.posix_spawn", "os.fork",
+    "os.forkpty", "os.kill", "os.killpg", "ctypes.", "os.remove", "os.rename", "os.rmdir",
+    "os.mkdir", "os.chmod", "os.chown", "os.symlink", "os.link", "os.truncate", "os.putenv",
+    "os.chdir", "shutil.", "urllib.", "http.", "ftplib.", "smtplib.", "webbrowser.", "sqlite3.",
+    # Ways to reach the hook's own state: the object graph, tracers and frames
+    "gc.", "sys.settrace", "sys.setprofile", "sys.monitoring.", "sys._current_frames",
+)
+_FRAME_ATTRIBUTES = ("tb_frame", "gi_frame", "cr_frame", "ag_frame")
+_CODE_ATTRIBUTES = ("__code__", "__defaults__", "__kwdefaults__")
+
+# Syscalls the child never needs, denied with EPERM by a seccomp filter:
+# sockets, new processes and threads, exec, and signalling or reading
+# other processes. (audit arch, syscall numbers) per machine
+_DENIED_SYSCALLS = {
+    # socket, connect, clone, fork, vfork, execve, kill, ptrace, tkill, tgkill,
+    # process_vm_readv, process_vm_writev, execveat, clone3
+    "x86_64": (0xC000003E, (41, 42, 56, 57, 58, 59, 62, 101, 200, 234, 310, 311, 322, 435)),
+    # socket, connect, ptrace, kill, tkill, tgkill, clone, execve,
+    # process_vm_readv, process_vm_writev, execveat, clone3
+    "aarch64": (0xC00000B7, (198, 203, 117, 129, 130, 131, 220, 221, 270, 271, 281, 435)),
+}
+
+
+def _apply_limits(cpu_seconds, memory_mb):
+    import resource
+
+    def limit(name, value):
+        try:
+            resource.setrlimit(name, (value, value))
+        except (ValueError, OSError):
+            pass  # not permitted / not supported on this platform
+
+    # SIGXCPU at the soft limit, SIGKILL a second later
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    except (ValueError, OSError):
+        pass
+    limit(resource.RLIMIT_AS, memory_mb * 1024 * 1024)
+    limit(resource.RLIMIT_FSIZE, 0)
+    limit(resource.RLIMIT_CORE, 0)
+    limit(resource.RLIMIT_NPROC, 0)
+
+
+def _seccomp_program(machine):
+    """The classic-BPF filter for `machine` as packed sock_filter structs, or None if unsupported."""
+    import struct
+
+    if machine not in _DENIED_SYSCALLS:
+        return None
+    arch, denied = _DENIED_SYSCALLS[machine]
+    load, jeq, jge, ret = 0x20, 0x15, 0x35, 0x06
+    allow, kill, eperm = 0x7FFF0000, 0x80000000, 0x00050000 | 1
+
+    program = [(load, 0, 0, 4), (jeq, 1, 0, arch), (ret, 0, 0, kill), (load, 0, 0, 0)]
+    if machine == "x86_64":
+        # x32 syscall numbers would slip past the list below
+        program += [(jge, 0, 1, 0x40000000), (ret, 0, 0, kill)]
+    for nr in denied:
+        program += [(jeq, 0, 1, nr), (ret, 0, 0, eperm)]
+    program.append((ret, 0, 0, allow))
+    return b"".join(struct.pack("HBBI", *op) for op in program)
+
+
+def _load_isolation():
+    """
+    Callable that installs the seccomp filter in the calling process, or
+    None where that isn't possible. Loaded by the worker before it forks,
+    so the child only makes the system calls.
+    """
+    program = _seccomp_program(os.uname().machine)
+    if program is None:
+        return None
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+    except (ImportError, OSError):
+        return None
+
+    class SockFprog(ctypes.Structure):
+        _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_char_p)]
+
+    fprog = SockFprog(len(program) // 8, program)
+    pr_set_no_new_privs, pr_set_seccomp, seccomp_mode_filter = 38, 22, 2
+
+    def install():
+        for args in ((pr_set_no_new_privs, 1, 0, 0, 0),
+                     (pr_set_seccomp, seccomp_mode_filter, ctypes.addressof(fprog), 0, 0)):
+            if libc.prctl(*(ctypes.c_ulong(a) for a in args)) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno))
+
+    return install
+
+
+def _world_readable(path):
+    """True if every directory up to `path` lets other users in, as the sandbox uid must to import the stdlib."""
+    while True:
+        try:
+            if os.stat(path).st_mode & 0o005 != 0o005:
+                return False
+        except OSError:
+            return False
+        parent = os.path.dirname(path)
+        if parent == path:
+            return True
+        path = parent
+
+
+def _isolate(install_seccomp, uid):
+    """
+    OS-level isolation, applied before any submission code runs: drop to
+    `uid` when running as root (so file permissions and RLIMIT_NPROC apply),
+    then install the seccomp filter. The working directory is already an
+    empty temporary one. Returns what couldn't be applied.
+    """
+    missing = []
+    stdlib = os.path.dirname(os.__file__)
+    extensions = os.path.join(stdlib, "lib-dynload")
+    if os.geteuid() == 0 and not _world_readable(extensions if os.path.isdir(extensions) else stdlib):
+        missing.append(f"unprivileged uid (uid {uid} can't read the Python installation in {stdlib})")
+    elif os.geteuid() == 0:
+        try:
+            os.setgroups([])
+            os.setgid(uid)
+            os.setuid(uid)
+        except OSError as e:
+            missing.append(f"unprivileged uid ({e})")
+    try:
+        if install_seccomp is None:
+            raise OSError(f"not supported on {os.uname().machine}")
+        install_seccomp()
+    except OSError as e:
+        missing.append(f"seccomp filter ({e})")
+    return missing
+
+
+def _install_audit_hook():
+    """
+    Everything the hook uses is bound to a local here, before the submission
+    runs: the code can rebind this module's globals, builtins or os.path,
+    but not these, and the hook never calls back into anything it could
+    have replaced. Object-graph, tracing and frame access are blocked, so
+    the hook itself can't be reached either.
+    """
+    blocked, frame_attributes, code_attributes = _BLOCKED_EVENT_PREFIXES, _FRAME_ATTRIBUTES, _CODE_ATTRIBUTES
+    allowed_roots = tuple({os.path.realpath(p) + "/" for p in (sys.prefix, sys.base_prefix, sys.exec_prefix)})
+    cwd, encoding = os.getcwd(), sys.getfilesystemencoding()
+    lstat, readlink = os.lstat, os.readlink
+    str_type, bytes_type, get_type = str, bytes, type
+    os_error, denied = OSError, PermissionError
+
+    def resolve(path):
+        # os.path.realpath, without the module globals it goes through
+        if not path.startswith("/"):
+            path = cwd + "/" + path
+        todo = path.split("/")
+        todo.reverse()
+        parts = []
+        links = 0
+        while todo:
+            name = todo.pop()
+            if name == "" or name == ".":
+                continue
+            if name == "..":
+                if parts:
+                    parts.pop()
+                continue
+            parts.append(name)
+            current = "/" + "/".join(parts)
+            try:
+                mode = lstat(current).st_mode
+            except os_error:
+                continue
+            if mode & 0o170000 == 0o120000:
+                links += 1
+                if links > 40:
+                    raise denied(f"too many symbolic links: {path}")
+                parts.pop()
+                target = readlink(current).split("/")
+                if target[0] == "":
+                    parts.clear()
+                target.reverse()
+                todo.extend(target)
+        return "/" + "/".join(parts) + "/"
+
+    def hook(event, args):
+        if event.startswith(blocked):
+            raise denied(f"{event} is not allowed in submissions")
+        if (event == "object.__getattr__" and args[1] in frame_attributes
+                or event == "object.__setattr__" and args[1] in code_attributes):
+            raise denied(f"{event} {args[1]} is not allowed in submissions")
+        if event == "open":
+            path = args[0]
+            if get_type(path) is bytes_type:
+                path = path.decode(encoding, "surrogateescape")
+            elif get_type(path) is not str_type:
+                raise denied("opening file descriptors or path objects is not allowed in submissions")
+            if not resolve(path).startswith(allowed_roots):
+                raise denied(f"file access is not allowed in submissions: {path}")
+
+    sys.addaudithook(hook)
+
+
+class _TestTimeout(BaseException):
+    """BaseException, so a bare `except Exception` in the submission can't swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _TestTimeout()
+
+
+def _encode(value):
+    """{"value": ...} after a JSON round trip (tuples become lists), or {"repr": ...} if that fails."""
+    try:
+        text = json.dumps(value)
+    except (TypeError, ValueError, RecursionError):
+        return {"repr": repr(value)[:MAX_OUTPUT_CHARS]}
+    if len(text) > MAX_VALUE_CHARS:
+        return {"error": f"Return value is larger than {MAX_VALUE_CHARS} characters"}
+    return {"value": json.loads(text)}
+
+
+def _run_job(job):
+    timeout = job["test_timeout_ms"] / 1000
+    signal.signal(signal.SIGALRM, _on_alarm)
+    captured = io.StringIO()
+    sys.stdout = sys.stderr = captured   # the submission's prints stay out of the protocol
+
+    namespace = {"__name__": "submission"}
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        exec(compile(job["code"], "<submission>", "exec"), namespace)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        fn = namespace.get(job["entry_point"])
+        if not callable(fn):
+            return {"error": f"Function `{job['entry_point']}` is not defined"}
+    except _TestTimeout:
+        return {"error": "Time limit exceeded while loading the code"}
+    except SyntaxError as e:
+        return {"error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+    except BaseException as e:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    results = []
+    timed_out = False
+    for args in job["args"]:
+        if timed_out:
+            results.append({"error": "Not run: an earlier test timed out", "ms": 0})
+            continue
+        start = time.perf_counter()
+        try:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+            output = fn(*args)
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            result = _encode(output)
+        except _TestTimeout:
+            result = {"error": f"Time limit exceeded ({job['test_timeout_ms']} ms)"}
+            timed_out = True
+        except RecursionError:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            result = {"error": "RecursionError: maximum recursion depth exceeded"}
+        except BaseException as e:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            result = {"error": f"{type(e).__name__}: {e}"}
+        result["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        results.append(result)
+
+    return {"tests": results, "stdout": captured.getvalue()[:MAX_OUTPUT_CHARS]}
+
+
+def _child_main(job, write_fd, cpu_seconds, memory_mb, install_seccomp, uid, require_isolation):
+    """Runs the submission; never returns."""
+    missing = _isolate(install_seccomp, uid)
+    if missing and require_isolation:
+        message = {"error": f"Sandbox isolation unavailable: {', '.join(missing)}"}
+    else:
+        _apply_limits(cpu_seconds, memory_mb)
+        _install_audit_hook()
+        try:
+            message = _run_job(job)
+        except MemoryError:
+            message = {"error": "Memory limit exceeded"}
+    try:
+        data = json.dumps(message).encode("utf-8")
+    except MemoryError:
+        data = b'{"error": "Memory limit exceeded"}'
+    while data:
+        data = data[os.write(write_fd, data):]
+    os._exit(0)
+
+
+def _read_message(read_fd):
+    chunks, size = [], 0
+    while size <= MAX_MESSAGE_BYTES:
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks), size > MAX_MESSAGE_BYTES
+
+
+def _worker_main(cpu_seconds, memory_mb, uid, require_isolation):
+    install_seccomp = _load_isolation()
+    job = json.loads(sys.stdin.readline())   # blocks until the pool hands out this worker
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Nothing but the pipe's write end leads out of the child
+        os.close(read_fd)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        _child_main(job, write_fd, cpu_seconds, memory_mb, install_seccomp, uid, require_isolation)
+
+    os.close(write_fd)
+    data, too_large = _read_message(read_fd)
+    if too_large:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+
+    if too_large:
+        result = {"error": "Submission output is too large"}
+    elif os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        if sig == SIGXCPU:
+            result = {"error": "CPU time limit exceeded"}
+        elif sig == signal.SIGKILL:
+            result = {"error": "Killed: CPU or memory limit exceeded"}
+        else:
+            result = {"error": f"Runner crashed (signal {sig})"}
+    else:
+        try:
+            result = json.loads(data)
+        except ValueError:
+            result = {"error": f"Runner crashed (exit {os.WEXITSTATUS(status)})"}
+    sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+    os._exit(0)   # skip interpreter teardown; the parent is waiting on EOF
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), sys.argv[4] == "1")
@@ -0,0 +1,27 @@
+# backend/serialization.py
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    """orjson with Mongo types: ObjectId -> str, datetimes as ISO 8601, NaN -> null."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Serializes raw Mongo documents with orjson, skipping FastAPI's
+    jsonable_encoder and the per-document `_id` conversion loops.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,340 @@
+# backend/session_store.py
+import abc
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import types
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.interview_session import InterviewSession
+from backend.hr_session import HRInterviewSession
+from backend.coding_session import CodingSession
+from backend.incremental_evaluator import set_score_store
+from backend.ttl_cache import TTLCache
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")          # memory | sqlite | redis
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "sessions.db")
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "redis://localhost:6379/0")
+SESSION_TTL = int(os.getenv("SESSION_TTL", 6 * 3600))          # seconds a shared-store session lives
+SESSION_MAX = int(os.getenv("SESSION_MAX", 500))                # live sessions kept in-process
+SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", 2 * 3600))  # idle seconds before in-process eviction
+SESSION_FLUSH_TO_MONGO = os.getenv("SESSION_FLUSH_TO_MONGO", "0") == "1"
+
+_SESSION_TYPES = {
+    "technical": InterviewSession,
+    "hr": HRInterviewSession,
+    "coding": CodingSession,
+}
+_KIND_BY_TYPE = {cls: kind for kind, cls in _SESSION_TYPES.items()}
+
+
+# ---------- Serialization ----------
+
+def session_to_state(session_info):
+    """Plain-JSON state for a single session object or the full-mode envelope."""
+    if isinstance(session_info, dict):
+        state = {"kind": "full"}
+        for key, value in session_info.items():
+            if key in ("tech", "hr", "code"):
+                state[key] = session_to_state(value)
+            else:
+                state[key] = value
+        return state
+
+    kind = _KIND_BY_TYPE[type(session_info)]
+    return {"kind": kind, **session_info.to_dict()}
+
+
+def session_from_state(state):
+    state = dict(state)
+    kind = state.pop("kind")
+    if kind == "full":
+        return {
+            key: session_from_state(value) if key in ("tech", "hr", "code") else value
+            for key, value in state.items()
+        }
+    return _SESSION_TYPES[kind].from_dict(state)
+
+
+def serialize_session(session_info) -> bytes:
+    raw = json.dumps(session_to_state(session_info), separators=(",", ":"), default=str)
+    return zlib.compress(raw.encode("utf-8"), 6)
+
+
+def deserialize_session(data: bytes):
+    return session_from_state(json.loads(zlib.decompress(data)))
+
+
+def estimate_size(obj, _seen=None) -> int:
+    """Approximate deep size in bytes of a session object graph."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += estimate_size(vars(obj), seen)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += estimate_size(getattr(obj, slot), seen)
+    return size
+
+
+# ---------- Archiving evicted sessions ----------
+
+_archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-archive")
+
+
+def _is_finished(session_info):
+    if isinstance(session_info, dict):
+        return bool(session_info.get("meta", {}).get("report"))
+    return bool((getattr(session_info, "meta", None) or {}).get("report"))
+
+
+def archive_session(user_id, session_info, reason):
+    """Write an evicted session's state to Mongo (session_archive) so nothing is lost."""
+    from backend.database import db
+
+    try:
+        db["session_archive"].insert_one({
+            "userId": user_id,
+            "reason": reason,
+            "finished": _is_finished(session_info),
+            "evictedAt": datetime.utcnow(),
+            "state": session_to_state(session_info),
+        })
+    except Exception as e:
+        print(f"❌ Could not archive session for {user_id}: {e}")
+
+
+# ---------- Backends ----------
+
+class SessionStore(abc.ABC):
+    """Where live interview sessions are kept, keyed by Clerk user id."""
+
+    @abc.abstractmethod
+    def get(self, user_id, default=None):
+        ...
+
+    @abc.abstractmethod
+    def put(self, user_id, session_info):
+        ...
+
+    @abc.abstractmethod
+    def delete(self, user_id):
+        ...
+
+    def sweep(self):
+        """Evict idle sessions; returns how many were dropped."""
+        return 0
+
+    def stats(self):
+        return {"backend": type(self).__name__}
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Live objects in this process, bounded by an idle TTL and LRU size cap.
+    Fast, but pinned to one worker and lost on restart. With
+    SESSION_FLUSH_TO_MONGO=1 evicted sessions are archived before dropping.
+    """
+
+    def __init__(self, max_sessions=SESSION_MAX, idle_ttl=SESSION_IDLE_TTL, flush_to_mongo=SESSION_FLUSH_TO_MONGO):
+        self.flush_to_mongo = flush_to_mongo
+        self.evicted = {"expired": 0, "lru": 0}
+        self._sessions = TTLCache(maxsize=max_sessions, ttl=idle_ttl, on_evict=self._on_evict)
+
+    def _on_evict(self, user_id, session_info, reason):
+        self.evicted[reason] += 1
+        print(f"🧹 Evicted session for {user_id} ({reason})")
+        if self.flush_to_mongo:
+            _archive_executor.submit(archive_session, user_id, session_info, reason)
+
+    def get(self, user_id, default=None):
+        return self._sessions.get(user_id, default)
+
+    def put(self, user_id, session_info):
+        self._sessions.set(user_id, session_info)
+
+    def delete(self, user_id):
+        self._sessions.pop(user_id)
+
+    def sweep(self):
+        return self._sessions.sweep()
+
+    def stats(self):
+        sizes = {user_id: estimate_size(session) for user_id, session in self._sessions.items()}
+        total = sum(sizes.values())
+        return {
+            "backend": type(self).__name__,
+            "live_sessions": len(sizes),
+            "max_sessions": self._sessions.maxsize,
+            "idle_ttl_seconds": self._sessions.ttl,
+            "evicted": dict(self.evicted),
+            "total_bytes": total,
+            "avg_bytes_per_session": total // len(sizes) if sizes else 0,
+            "max_bytes_per_session": max(sizes.values(), default=0),
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Compressed sessions in a SQLite file (WAL mode) that every worker
+    process on the node shares. Survives restarts and deploys.
+    """
+
+    def __init__(self, path=SESSION_STORE_PATH, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " user_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answer_scores ("
+            " score_key TEXT NOT NULL, idx INTEGER NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (score_key, idx))"
+        )
+
+    def get(self, user_id, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if not row or time.time() - row[1] > self.ttl:
+            return default
+        return deserialize_session(row[0])
+
+    def put(self, user_id, session_info):
+        data = serialize_session(session_info)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (user_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (user_id, data, time.time()),
+            )
+
+    def delete(self, user_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+
+    def sweep(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM answer_scores WHERE updated_at < ?", (cutoff,))
+        return cur.rowcount
+
+    # Per-answer scoring results, written by the scoring task (see incremental_evaluator.py)
+
+    def set_answer_score(self, score_key, index, result):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO answer_scores (score_key, idx, data, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(score_key, idx) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (score_key, index, json.dumps(result), time.time()),
+            )
+
+    def get_answer_scores(self, score_key):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, data FROM answer_scores WHERE score_key = ?", (score_key,)
+            ).fetchall()
+        return {idx: json.loads(data) for idx, data in rows}
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions WHERE updated_at >= ?",
+                (time.time() - self.ttl,),
+            ).fetchone()
+        return {
+            "backend": type(self).__name__,
+            "live_sessions": count,
+            "total_bytes": total,  # compressed, as stored
+            "avg_bytes_per_session": total // count if count else 0,
+        }
+
+
+class RedisSessionStore(SessionStore):
+    """Compressed sessions in Redis (or any Redis-protocol server) shared across nodes."""
+
+    def __init__(self, url=SESSION_STORE_URL, ttl=SESSION_TTL, prefix="session:", score_prefix="session_scores:"):
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.score_prefix = score_prefix    # answer-score hashes, kept apart from session strings
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, user_id, default=None):
+        data = self._redis.get(self.prefix + user_id)
+        return deserialize_session(data) if data else default
+
+    def put(self, user_id, session_info):
+        self._redis.set(self.prefix + user_id, serialize_session(session_info), ex=self.ttl)
+
+    def delete(self, user_id):
+        self._redis.delete(self.prefix + user_id)
+
+    # Per-answer scoring results, written by the scoring task (see incremental_evaluator.py)
+
+    def set_answer_score(self, score_key, index, result):
+        name = self.score_prefix + score_key
+        pipe = self._redis.pipeline()
+        pipe.hset(name, str(index), json.dumps(result))
+        pipe.expire(name, self.ttl)
+        pipe.execute()
+
+    def get_answer_scores(self, score_key):
+        data = self._redis.hgetall(self.score_prefix + score_key)
+        return {int(idx): json.loads(value) for idx, value in data.items()}
+
+    def stats(self):
+        score_prefix = self.score_prefix.encode()
+        keys = [
+            k for k in self._redis.scan_iter(match=self.prefix + "*", count=500)
+            if not k.startswith(score_prefix)
+        ]
+        total = sum(self._redis.strlen(k) for k in keys)
+        score_keys = list(self._redis.scan_iter(match=self.score_prefix + "*", count=500))
+        return {
+            "backend": type(self).__name__,
+            "live_sessions": len(keys),
+            "total_bytes": total,  # compressed, as stored
+            "avg_bytes_per_session": total // len(keys) if keys else 0,
+            "answer_score_hashes": len(score_keys),
+            "answer_score_bytes": sum(self._redis.memory_usage(k) or 0 for k in score_keys),
+        }
+
+
+def create_session_store(kind=SESSION_STORE):
+    if kind == "memory":
+        # Live objects: scoring tasks update the evaluator that later builds the report
+        return InMemorySessionStore()
+    if kind == "sqlite":
+        store = SQLiteSessionStore()
+    elif kind == "redis":
+        store = RedisSessionStore()
+    else:
+        raise ValueError(f"Unknown SESSION_STORE '{kind}'. Use memory, sqlite or redis.")
+    # Sessions are rebuilt per request, so answer scores go through the store
+    set_score_store(store)
+    return store
+
+
+user_sessions = create_session_store()
@@ -1,8 +1,19 @@
 # speech_to_text.py
-import whisper
+import os
 
-model = whisper.load_model('base')
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
 
-def transcribe(audio_path):
-    result = model.transcribe(audio_path)
+model = None
+
+def load_model(model_name=WHISPER_MODEL):
+    """Load the Whisper model once per process."""
+    global model
+    if model is None:
+        import whisper
+        model = whisper.load_model(model_name)
+    return model
+
+def transcribe(audio):
+    """`audio` is a file path or a 16 kHz mono float32 NumPy buffer."""
+    result = load_model().transcribe(audio)
     return result['text']
@@ -0,0 +1,132 @@
+# backend/streaming_asr.py
+import asyncio
+import os
+
+import numpy as np
+
+from backend.audio_pipeline import SAMPLE_RATE
+from backend.transcription_service import transcribe_async
+
+FRAME_MS = 30
+SEGMENT_SILENCE_MS = int(os.getenv("VAD_SEGMENT_SILENCE_MS", 500))   # pause that closes a segment
+END_SILENCE_MS = int(os.getenv("VAD_END_SILENCE_MS", 1500))          # pause that ends the answer
+MAX_SEGMENT_MS = int(os.getenv("VAD_MAX_SEGMENT_MS", 15000))         # force a cut in long monologues
+PRE_ROLL_MS = 200                                                    # keep onsets of the first word
+
+
+class EnergyVAD:
+    """
+    Frame-level voice activity detector. A frame is speech when its energy
+    is `margin_db` above a slowly adapting noise floor and above an absolute
+    floor, so it works without calibration across mics and rooms.
+    """
+
+    def __init__(self, sr=SAMPLE_RATE, frame_ms=FRAME_MS, margin_db=9.0, min_db=-55.0):
+        self.frame_len = sr * frame_ms // 1000
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.noise_db = None
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        db = 10.0 * np.log10(np.mean(frame ** 2) + 1e-12)
+
+        if self.noise_db is None:
+            self.noise_db = db
+        elif db < self.noise_db:
+            self.noise_db = 0.7 * self.noise_db + 0.3 * db     # fall fast
+        else:
+            self.noise_db = 0.995 * self.noise_db + 0.005 * db  # rise slowly
+
+        return db > max(self.noise_db + self.margin_db, self.min_db)
+
+
+class StreamingTranscriber:
+    """
+    Accumulates 16 kHz mono PCM16 chunks for one answer. Whenever the VAD
+    sees a pause the finished segment is sent to the Whisper pool right away,
+    so by the time the candidate stops talking most of the answer is already
+    transcribed and `finish()` only waits on the last short segment.
+    """
+
+    def __init__(self, sr=SAMPLE_RATE):
+        self.sr = sr
+        self.vad = EnergyVAD(sr)
+        self._frame_len = self.vad.frame_len
+        self._chunks = []
+        self._samples = 0
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._segment_start = None
+        self._silence_ms = 0
+        self._segment_tasks = []
+        self.end_of_speech = False
+
+    # ---------- input ----------
+
+    def feed(self, pcm16: bytes):
+        """Add raw little-endian PCM16 bytes; returns True once end-of-speech is detected."""
+        samples = np.frombuffer(pcm16, dtype="<i2").astype(np.float32) / 32768.0
+        samples = np.concatenate((self._remainder, samples))
+
+        n_frames = len(samples) // self._frame_len
+        usable = n_frames * self._frame_len
+        self._remainder = samples[usable:]
+
+        for frame in samples[:usable].reshape(n_frames, self._frame_len):
+            self._chunks.append(frame)
+            self._samples += self._frame_len
+            self._on_frame(self.vad.is_speech(frame))
+
+        return self.end_of_speech
+
+    def _on_frame(self, speech: bool):
+        if speech:
+            if self._segment_start is None:
+                pre_roll = self.sr * PRE_ROLL_MS // 1000
+                self._segment_start = max(0, self._samples - self._frame_len - pre_roll)
+            self._silence_ms = 0
+            self.end_of_speech = False
+        else:
+            self._silence_ms += FRAME_MS
+
+        if self._segment_start is not None:
+            segment_ms = (self._samples - self._segment_start) * 1000 // self.sr
+            if self._silence_ms >= SEGMENT_SILENCE_MS or segment_ms >= MAX_SEGMENT_MS:
+                self._close_segment()
+
+        if self._segment_tasks and self._silence_ms >= END_SILENCE_MS:
+            self.end_of_speech = True
+
+    def _close_segment(self):
+        segment = self.audio[self._segment_start:]
+        self._segment_start = None
+        self._segment_tasks.append(asyncio.create_task(transcribe_async(segment)))
+
+    # ---------- output ----------
+
+    @property
+    def audio(self) -> np.ndarray:
+        """Everything received so far as one float32 buffer."""
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def completed_text(self) -> str:
+        """Text of the leading segments that have already been transcribed."""
+        parts = []
+        for task in self._segment_tasks:
+            if not task.done() or task.exception():
+                break
+            parts.append(task.result().strip())
+        return " ".join(p for p in parts if p)
+
+    async def finish(self) -> str:
+        """Flush the open segment and return the full transcript in order."""
+        if self._segment_start is not None:
+            self._close_segment()
+
+        results = await asyncio.gather(*self._segment_tasks)
+        return " ".join(r.strip() for r in results if r and r.strip())
+
+    def cancel(self):
+        for task in self._segment_tasks:
+            task.cancel()
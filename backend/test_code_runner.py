@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+
+from backend.code_runner import CodeRunner
+
+PROBLEMS = json.load(open(os.path.join(os.path.dirname(__file__), "problems.json")))
+REVERSE = next(p for p in PROBLEMS if p["entry_point"] == "reverse_string")
+
+
+def run_all(*codes, **runner_options):
+    # Test images may run as root from an interpreter other users can't
+    # read; test_submission_runs_isolated covers the strict default
+    runner_options.setdefault("require_isolation", False)
+
+    async def go():
+        runner = CodeRunner(pool_size=2, **runner_options)
+        await runner.warm_up()
+        try:
+            return [await runner.run(code, REVERSE) for code in codes]
+        finally:
+            await runner.shutdown()
+    return asyncio.run(go())
+
+
+def test_every_problem_has_tests():
+    for problem in PROBLEMS:
+        assert problem["entry_point"] in problem["function_signature"]
+        assert len(problem["tests"]) >= 3
+
+
+def test_correct_and_wrong_solutions():
+    correct, wrong = run_all(
+        "def reverse_string(s):\n    print('debug output is ignored')\n    return s[::-1]\n",
+        "def reverse_string(s):\n    return s\n",
+    )
+    assert correct["solved"] and correct["passed"] == correct["total"] == len(REVERSE["tests"])
+    assert all("ms" in t for t in correct["tests"])
+
+    assert not wrong["solved"]
+    palindromes = sum(t["args"][0] == t["args"][0][::-1] for t in REVERSE["tests"])
+    assert wrong["passed"] == palindromes
+
+
+def test_code_that_cannot_run():
+    syntax, missing, empty = run_all("def reverse_string(s)\n    return s", "def other(s): return s", "   ")
+    assert syntax["error"].startswith("SyntaxError")
+    assert "reverse_string" in missing["error"]
+    assert empty["error"] == "No code submitted"
+
+
+def test_infinite_loop_times_out():
+    (result,) = run_all(
+        "def reverse_string(s):\n    while True:\n        try:\n            pass\n        except Exception:\n            pass\n",
+        test_timeout_ms=200,
+    )
+    assert result["passed"] == 0
+    assert result["tests"][0]["error"].startswith("Time limit exceeded")
+    assert result["elapsed_ms"] < 2000
+
+
+def test_sandbox_blocks_network_processes_and_files():
+    results = run_all(
+        "import socket\ndef reverse_string(s):\n    socket.create_connection(('example.com', 80))\n",
+        "import subprocess\ndef reverse_string(s):\n    return subprocess.run(['id']).stdout\n",
+        f"def reverse_string(s):\n    return open({os.path.abspath(__file__)!r}).read()\n",
+        "def reverse_string(s):\n    open('out.txt', 'w').write(s)\n    return s[::-1]\n",
+    )
+    for result in results:
+        assert result["passed"] == 0
+        assert all("PermissionError" in t["error"] for t in result["tests"])
+
+
+def test_submission_cannot_see_answers_or_forge_results():
+    frame_walk, forged = run_all(
+        # The hidden expected values aren't anywhere in the sandbox to find
+        "import sys\n"
+        "def reverse_string(s):\n"
+        "    f = sys._getframe(1)\n"
+        "    while f:\n"
+        "        for v in f.f_locals.values():\n"
+        "            if isinstance(v, dict) and 'expected' in v:\n"
+        "                return v['expected']\n"
+        "        f = f.f_back\n",
+        # Writing a fake "all passed" result to every inherited fd reaches nothing the API trusts
+        "import json, os\n"
+        f"FAKE = json.dumps({{'tests': [{{'passed': True, 'value': 'x'}}] * {len(REVERSE['tests'])}}}) + '\\n'\n"
+        "def reverse_string(s):\n"
+        "    for fd in range(64):\n"
+        "        try:\n"
+        "            os.write(fd, FAKE.encode())\n"
+        "        except OSError:\n"
+        "            pass\n"
+        "    os._exit(0)\n",
+    )
+    assert frame_walk["passed"] == 0
+    assert not forged["solved"] and forged["passed"] == 0
+
+
+def test_submission_cannot_switch_off_the_audit_hook():
+    tamper = (
+        "import __main__, os, posixpath, sys\n"
+        "__main__._BLOCKED_EVENT_PREFIXES = ()\n"
+        "os.path.realpath = lambda path: sys.prefix\n"
+        "posixpath._joinrealpath = lambda *args: (sys.prefix, True)\n"
+    )
+    results = run_all(
+        tamper + f"def reverse_string(s):\n    return open({os.path.abspath(__file__)!r}).read()\n",
+        tamper + "import _socket\ndef reverse_string(s):\n    return str(_socket.socket())\n",
+        tamper + "import gc\ndef reverse_string(s):\n    return len(gc.get_objects())\n",
+    )
+    for result in results:
+        assert result["passed"] == 0
+        assert all("PermissionError" in t["error"] for t in result["tests"])
+
+
+def test_submission_runs_isolated():
+    (result,) = run_all(
+        "import _thread, os\n"
+        "def reverse_string(s):\n"
+        "    try:\n"
+        "        _thread.start_new_thread(print, ())\n"
+        "    except RuntimeError:\n"
+        "        return os.getuid()\n",
+        require_isolation=True,
+    )
+    if result["error"]:
+        # No seccomp on this platform, or root with a Python install the sandbox uid can't read
+        assert result["error"].startswith("Sandbox isolation unavailable")
+        return
+    uid = 65534 if os.geteuid() == 0 else os.getuid()
+    assert all(t["output"] == str(uid) for t in result["tests"])
+
+
+def test_memory_limit():
+    (result,) = run_all("def reverse_string(s):\n    return bytearray(2 ** 32)\n", memory_mb=128)
+    assert result["passed"] == 0
+    assert "MemoryError" in result["tests"][0]["error"]
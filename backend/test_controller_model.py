@@ -0,0 +1,48 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from backend import controller_model
+from backend.controller_model import LABELS, _prepare, decide_batch
+from backend.model_registry import ModelRegistry
+
+ANSWERS = [
+    "I led a team of five engineers through a migration and we shipped on time",
+    "I prefer working independently",
+    "Yes",
+    "My weakness is time management but I improved it with weekly planning and reviews",
+]
+
+
+def tiny_controller():
+    """A randomly initialized few-layer phi model with a word-level tokenizer."""
+    words = sorted({w for text in ANSWERS for w in text.lower().split()} | {"user", "answer:", "action:", *LABELS})
+    vocab = {"<pad>": 0, "<unk>": 1, **{w: i + 2 for i, w in enumerate(words)}}
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="<unk>"))
+    backend.normalizer = tokenizers.normalizers.Lowercase()
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.WhitespaceSplit()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token="<pad>", unk_token="<unk>",
+        model_input_names=["input_ids", "attention_mask"],
+    )
+
+    torch.manual_seed(0)
+    config = transformers.PhiConfig(
+        vocab_size=len(vocab), hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+        num_attention_heads=4, max_position_embeddings=64, pad_token_id=0,
+    )
+    return _prepare(tokenizer, transformers.PhiForCausalLM(config), "cpu")
+
+
+def test_batched_scoring_matches_single_requests(monkeypatch):
+    registry = ModelRegistry()
+    registry.register("controller_phi2", tiny_controller, warm=False)
+    monkeypatch.setattr(controller_model, "registry", registry)
+
+    batched = decide_batch(ANSWERS)
+    single = [decide_batch([answer])[0] for answer in ANSWERS]
+
+    assert [label for label, _ in batched] == [label for label, _ in single]
+    assert [prob for _, prob in batched] == pytest.approx([prob for _, prob in single], abs=1e-5)
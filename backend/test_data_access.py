@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import mongomock
+import mongomock_motor
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")  # never connected to
+
+from backend.data_access import DataStore
+from backend.user_stats import fold_interviews
+
+LATENCY = 0.005   # simulated network round trip per Mongo call
+REQUESTS = 10     # concurrent requests, two round trips each
+DELAYED = {"find_one", "find_one_and_update", "update_one", "insert_one", "replace_one"}
+
+
+class SlowDatabase:
+    """In-memory async database whose calls each take LATENCY, like a real server hop."""
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getitem__(self, name):
+        return SlowCollection(self._target[name])
+
+
+class SlowCollection:
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in DELAYED:
+            return attr
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(LATENCY)
+            return await attr(*args, **kwargs)
+        return call
+
+
+def memory_store():
+    return DataStore(database=mongomock_motor.AsyncMongoMockClient()["test"])
+
+
+async def max_loop_lag(workload, interval=0.001):
+    """Run `workload` next to a ticker and return the worst delay the ticker saw."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    await workload()
+    done.set()
+    await task
+    return max(lags)
+
+
+def test_event_loop_lag_sync_vs_async():
+    users = mongomock.MongoClient()["test"]["users"]
+
+    async def blocking_request(i):
+        # The old path: sync pymongo calls straight from an async route/dependency
+        for _ in range(2):
+            time.sleep(LATENCY)
+            users.find_one({"clerkId": f"user_{i}"})
+
+    store = DataStore(database=SlowDatabase(mongomock_motor.AsyncMongoMockClient()["test"]))
+
+    async def async_request(i):
+        await store.get_or_create_user(f"user_{i}", f"user_{i}@example.com")
+        await store.get_user_stats(f"user_{i}")
+
+    async def run(request):
+        return await max_loop_lag(lambda: asyncio.gather(*(request(i) for i in range(REQUESTS))))
+
+    blocking_lag = asyncio.run(run(blocking_request))
+    async_lag = asyncio.run(run(async_request))
+    print(f"max event-loop lag: sync {blocking_lag * 1000:.1f} ms, async {async_lag * 1000:.1f} ms")
+
+    assert blocking_lag >= REQUESTS * 2 * LATENCY * 0.8
+    assert async_lag < blocking_lag / 4
+
+
+def test_users():
+    store = memory_store()
+
+    async def scenario():
+        user = await store.get_or_create_user("clerk_1", "a@example.com")
+        again = await store.get_or_create_user("clerk_1", "changed@example.com")
+        updated = await store.update_user("clerk_1", {"name": "Asha"})
+        missing = await store.update_user("nobody", {"name": "x"})
+        deleted = await store.soft_delete_user("clerk_1")
+        return user, again, updated, missing, deleted, await store.soft_delete_user("nobody")
+
+    user, again, updated, missing, deleted, deleted_missing = asyncio.run(scenario())
+    assert user["email"] == "a@example.com" and user["skills"] == []
+    assert again["_id"] == user["_id"] and again["email"] == "a@example.com"
+    assert updated["name"] == "Asha"
+    assert missing is None
+    assert deleted and not deleted_missing
+
+
+def test_interview_pages_and_stats():
+    store = memory_store()
+    start = datetime(2025, 1, 1)
+    interviews = [
+        {
+            "userId": "u1", "role": "Backend", "date": start + timedelta(days=i), "mode": "technical",
+            "average_confidence": 0.5, "average_focus": 0.8,
+            "feedback": {"technical": {"overall": 6}}, "transcript": "Q: ...",
+        }
+        for i in range(7)
+    ]
+
+    async def scenario():
+        ids = []
+        for doc in interviews:
+            ids.append(await store.insert_interview(dict(doc)))
+            await store.record_interview(doc)
+        pages, cursor = [], None
+        while True:
+            page, cursor = await store.interview_page("u1", limit=3, cursor=cursor)
+            pages.append(page)
+            if not cursor:
+                break
+        return ids, pages, await store.get_user_stats("u1"), await store.get_interview("u1", ids[0])
+
+    ids, pages, stats, detail = asyncio.run(scenario())
+    dates = [doc["date"] for page in pages for doc in page]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert dates == sorted(dates, reverse=True) and len(set(dates)) == 7
+    assert "transcript" not in pages[0][0]
+    assert detail["transcript"] == "Q: ..."
+
+    # The live $inc path agrees with a rebuild from history
+    rebuilt = fold_interviews(interviews, "u1")[0]
+    assert stats["total"] == rebuilt["total"] == 7
+    assert stats["scores"] == rebuilt["scores"] == {"technical": {"sum": 42, "count": 7}}
+    assert stats["confidence_sum"] == pytest.approx(rebuilt["confidence_sum"])
+
+    assert asyncio.run(store.get_interview("u2", ids[0])) is None
+    assert asyncio.run(store.get_interview("u1", "not-an-id")) is None
+
+
+def test_pages_span_unmigrated_string_dates():
+    store = memory_store()
+    dates = [datetime(2025, 1, 3), datetime(2025, 1, 2), datetime(2025, 1, 1),
+             "2024-12-31T10:00:00", "2024-12-30T10:00:00", "2024-12-29T10:00:00", None]
+
+    async def scenario():
+        for date in dates:
+            await store.insert_interview({"userId": "u1", "date": date})
+        seen, cursor = [], None
+        while True:
+            page, cursor = await store.interview_page("u1", limit=2, cursor=cursor)
+            seen += [doc["date"] for doc in page]
+            if not cursor:
+                return seen
+
+    assert asyncio.run(scenario()) == dates
+
+
+def test_first_recorded_interview_counts_existing_history():
+    store = memory_store()
+
+    async def scenario():
+        for day in (1, 2, 3):
+            await store.insert_interview({"userId": "u1", "date": datetime(2025, 1, day)})
+        # A leftover partial document from before stats were rebuilt is replaced too
+        await store.db["user_stats"].insert_one({"_id": "u1", "total": 1})
+        doc = {"userId": "u1", "date": datetime(2025, 1, 4)}
+        await store.insert_interview(dict(doc))
+        await store.record_interview(doc)
+        await store.record_interview({"userId": "u1", "date": datetime(2025, 1, 5)})
+        return await store.get_user_stats("u1")
+
+    assert asyncio.run(scenario())["total"] == 5
+
+
+def test_stats_rebuilt_on_first_read_and_resume_cache():
+    store = memory_store()
+
+    async def scenario():
+        await store.insert_interview({"userId": "u1", "date": datetime(2025, 1, 1), "average_confidence": 0.4})
+        await store.save_resume("abc", {"name": "Asha"}, 2, 10)
+        return (
+            await store.get_user_stats("u1"),
+            await store.get_user_stats("nobody"),
+            await store.load_resume("abc", 2),
+            await store.load_resume("abc", 1),
+        )
+
+    stats, empty, parsed, stale = asyncio.run(scenario())
+    assert stats["total"] == 1
+    assert empty["total"] == 0
+    assert parsed == {"name": "Asha"}
+    assert stale is None
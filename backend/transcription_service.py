@@ -0,0 +1,103 @@
+# backend/transcription_service.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.model_registry import registry
+
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+WHISPER_QUEUE_SIZE = int(os.getenv("WHISPER_QUEUE_SIZE", WHISPER_WORKERS * 4))
+
+
+class TranscriptionQueueFull(Exception):
+    """Raised when more transcriptions are pending than the queue allows."""
+
+
+# ---------- Worker process side ----------
+
+def _init_worker(model_name, torch_threads):
+    """Runs once in every worker process: pin threads and load Whisper."""
+    import torch
+    from backend.speech_to_text import load_model
+
+    torch.set_num_threads(torch_threads)
+    load_model(model_name)
+
+
+def _run_transcribe(audio):
+    from backend.speech_to_text import transcribe
+    return transcribe(audio)
+
+
+def _ping():
+    return os.getpid()
+
+
+# ---------- Event loop side ----------
+
+class TranscriptionService:
+    """
+    Pool of worker processes, each holding its own Whisper model.
+    `transcribe_async` never blocks the event loop; requests beyond
+    `max_pending` are rejected instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers=WHISPER_WORKERS, max_pending=WHISPER_QUEUE_SIZE, model_name=None):
+        from backend.speech_to_text import WHISPER_MODEL
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.model_name = model_name or WHISPER_MODEL
+        self._executor = None
+        self._pending = 0
+
+    def start(self):
+        if self._executor is None:
+            torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, torch_threads),
+            )
+        return self._executor
+
+    async def warm_up(self):
+        """Spawn every worker up front so the first answer doesn't pay the model load."""
+        loop = asyncio.get_running_loop()
+        executor = self.start()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, _ping) for _ in range(self.workers)
+        ])
+
+    async def transcribe_async(self, audio):
+        """Transcribe a file path or a 16 kHz float32 buffer in a worker process."""
+        if self._pending >= self.max_pending:
+            raise TranscriptionQueueFull(
+                f"{self._pending} transcriptions already pending (limit {self.max_pending})"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.start(), _run_transcribe, audio)
+        finally:
+            self._pending -= 1
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+transcription_service = TranscriptionService()
+registry.register("whisper", transcription_service.warm_up)
+
+
+async def transcribe_async(audio):
+    return await transcription_service.transcribe_async(audio)
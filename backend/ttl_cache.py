@@ -0,0 +1,91 @@
+# backend/ttl_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe LRU map with an idle TTL. Entries expire `ttl` seconds after
+    their last access and the least recently used entry is dropped once
+    `maxsize` is reached. `on_evict(key, value, reason)` is called for every
+    entry that is dropped ("expired" or "lru"), but not for explicit pops.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()   # key -> (value, last_access)
+        self._lock = threading.RLock()
+
+    def _expired(self, last_access, now):
+        return self.ttl is not None and now - last_access > self.ttl
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, last_access = item
+            if self._expired(last_access, now):
+                del self._data[key]
+                evicted = [(key, value, "expired")]
+            else:
+                self._data[key] = (value, now)
+                self._data.move_to_end(key)
+                return value
+        self._notify(evicted)
+        return default
+
+    def set(self, key, value):
+        evicted = []
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, (old_value, _) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value, "lru"))
+        self._notify(evicted)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[0] if item else default
+
+    def sweep(self):
+        """Drop every expired entry; returns how many were evicted."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            # Oldest access first, so stop at the first live entry
+            for key, (value, last_access) in list(self._data.items()):
+                if not self._expired(last_access, now):
+                    break
+                del self._data[key]
+                evicted.append((key, value, "expired"))
+        self._notify(evicted)
+        return len(evicted)
+
+    def items(self):
+        with self._lock:
+            return [(k, v) for k, (v, _) in self._data.items()]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._data)
+
+    def _notify(self, evicted):
+        if self.on_evict:
+            for key, value, reason in evicted:
+                self.on_evict(key, value, reason)
+
+
+_MISSING = object()
@@ -0,0 +1,39 @@
+# backend/turn.py
+
+
+class Turn:
+    """
+    One question/answer turn of an interview. Slotted instead of a dict to
+    keep long-running sessions small; still supports turn["question"] and
+    turn.get("answer") so existing callers work unchanged.
+    """
+
+    __slots__ = ("question", "answer")
+
+    def __init__(self, question, answer=None):
+        self.question = question
+        self.answer = answer
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self):
+        return {"question": self.question, "answer": self.answer}
+
+    def __repr__(self):
+        return f"Turn(question={self.question!r}, answer={self.answer!r})"
+
+
+def history_to_dicts(history):
+    """JSON-ready copy of a history list that may hold Turns or plain dicts."""
+    return [t.to_dict() if isinstance(t, Turn) else t for t in history]
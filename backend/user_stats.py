@@ -0,0 +1,213 @@
+# backend/user_stats.py
+"""
+Materialized per-user dashboard statistics.
+
+One `user_stats` document per user (_id = userId) holds running sums that
+are bumped atomically with $inc every time an interview is saved, so the
+dashboard reads a single small document no matter how long the history is.
+Documents are always created by a rebuild from the interviews collection
+(marked `rebuilt: True`); increments only ever apply to such a document, so
+a user's older interviews are never left out of their stats.
+
+Request handlers write and read these through backend.data_access, which
+applies the `stats_update` / `fold_interviews` builders below; `rebuild`
+here uses the sync client for deploys and repairs.
+
+Backfill / repair from the interviews collection:
+
+    python -m backend.user_stats --rebuild            # every user
+    python -m backend.user_stats --rebuild --user ID  # one user
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from backend.database import db, interviews_collection
+
+user_stats_collection = db["user_stats"]
+
+CATEGORIES = ("technical", "behavioral", "coding")
+MAX_MISTAKES = 5
+DAY_BUCKETS = 7          # days counted in "this week"
+STALE_DAY_BUCKETS = 30   # older day keys cleared on each write
+
+STATS_PROJECTION = {
+    "_id": 0, "userId": 1, "date": 1, "role": 1, "average_confidence": 1, "average_focus": 1,
+    **{f"feedback.{category}.{field}": 1 for category in CATEGORIES for field in ("overall", "overall_score")},
+    "feedback.coding.solved": 1, "feedback.coding.attempted": 1, "feedback.coding.common_mistakes": 1,
+}
+
+
+def _day(date):
+    if isinstance(date, datetime):
+        return date.date().isoformat()
+    return str(date or "")[:10]
+
+
+def _positive(value):
+    # Unset, zero and NaN scores are left out of averages
+    return isinstance(value, (int, float)) and value > 0
+
+
+def _overall(section):
+    # The feedback generators emit "overall"; "overall_score" is the older name
+    value = section.get("overall", section.get("overall_score"))
+    return value if isinstance(value, (int, float)) else 0
+
+
+def interview_increments(interview):
+    """$inc counters contributed by one saved interview document."""
+    inc = {"total": 1}
+    for field, key in (("average_confidence", "confidence"), ("average_focus", "focus")):
+        value = interview.get(field)
+        if _positive(value):
+            inc[f"{key}_sum"] = value
+            inc[f"{key}_count"] = 1
+
+    feedback = interview.get("feedback") or {}
+    for category in CATEGORIES:
+        section = feedback.get(category)
+        if isinstance(section, dict):
+            inc[f"scores.{category}.sum"] = _overall(section)
+            inc[f"scores.{category}.count"] = 1
+
+    coding = feedback.get("coding")
+    if isinstance(coding, dict):
+        inc["coding.attempted"] = coding.get("attempted", 0) or 0
+        inc["coding.solved"] = coding.get("solved", 0) or 0
+
+    day = _day(interview.get("date"))
+    if day:
+        inc[f"days.{day}"] = 1
+    return inc
+
+
+def _recent(interview):
+    return {
+        "role": interview.get("role"),
+        "date": interview.get("date"),
+        "confidence": round((interview.get("average_confidence") or 0) * 100, 1),
+    }
+
+
+def _mistakes(interview):
+    coding = (interview.get("feedback") or {}).get("coding")
+    mistakes = coding.get("common_mistakes") if isinstance(coding, dict) else None
+    return list(mistakes) if isinstance(mistakes, list) else []
+
+
+def stats_update(interview, now=None):
+    """The upsert that folds a just-inserted interview into its owner's stats document."""
+    now = now or datetime.now()
+    stale = {
+        f"days.{(now - timedelta(days=age)).date().isoformat()}": ""
+        for age in range(DAY_BUCKETS + 1, DAY_BUCKETS + 1 + STALE_DAY_BUCKETS)
+    }
+    update = {
+        "$inc": interview_increments(interview),
+        "$max": {"lastActive": interview.get("date")},
+        "$set": {"recent": _recent(interview), "updatedAt": now},
+        "$unset": stale,
+    }
+    mistakes = _mistakes(interview)
+    if mistakes:
+        update["$push"] = {"mistakes": {"$each": mistakes, "$slice": MAX_MISTAKES}}
+    return update
+
+
+def _inc_path(doc, dotted, value):
+    *parents, leaf = dotted.split(".")
+    for key in parents:
+        doc = doc.setdefault(key, {})
+    doc[leaf] = doc.get(leaf, 0) + value
+
+
+def fold_interviews(interviews, user_id=None, now=None):
+    """
+    Stats documents for `interviews` (oldest first, STATS_PROJECTION fields)
+    made by folding the same increments the live path applies. With
+    `user_id`, that user gets an empty document even without interviews.
+    """
+    docs = {}
+    for interview in interviews:
+        uid = interview.get("userId")
+        if not uid:
+            continue
+        doc = docs.setdefault(uid, {"_id": uid, "rebuilt": True, "mistakes": []})
+        for path, value in interview_increments(interview).items():
+            _inc_path(doc, path, value)
+        # Sorted by date, so the last one seen is the most recent
+        doc["lastActive"] = interview.get("date")
+        doc["recent"] = _recent(interview)
+        doc["mistakes"] = (doc["mistakes"] + _mistakes(interview))[:MAX_MISTAKES]
+
+    if user_id and user_id not in docs:
+        docs[user_id] = {"_id": user_id, "rebuilt": True, "total": 0}
+
+    now = now or datetime.now()
+    cutoff = (now - timedelta(days=DAY_BUCKETS + STALE_DAY_BUCKETS)).date().isoformat()
+    for doc in docs.values():
+        doc["days"] = {day: n for day, n in doc.get("days", {}).items() if day >= cutoff}
+        doc["updatedAt"] = now
+    return list(docs.values())
+
+
+def rebuild(user_id=None):
+    """Recompute stats documents from the interviews collection. Returns how many users were written."""
+    query = {"userId": user_id} if user_id else {}
+    docs = fold_interviews(interviews_collection.find(query, STATS_PROJECTION).sort("date", 1), user_id)
+    for doc in docs:
+        user_stats_collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+    return len(docs)
+
+
+def _avg(total, count):
+    return total / count if count else 0
+
+
+def stats_view(doc, now=None):
+    """Dashboard stats / performance / coding sections from a stats document."""
+    now = now or datetime.now()
+    week = {(now - timedelta(days=age)).date().isoformat() for age in range(DAY_BUCKETS)}
+    avg_confidence = round(_avg(doc.get("confidence_sum", 0), doc.get("confidence_count", 0)) * 100, 1)
+    coding = doc.get("coding", {})
+    attempted = coding.get("attempted", 0)
+    solved = coding.get("solved", 0)
+    scores = doc.get("scores", {})
+
+    return {
+        "stats": {
+            "totalInterviews": doc.get("total", 0),
+            "avgConfidence": avg_confidence,
+            "averageScore": avg_confidence,  # Alias for compatibility
+            "thisWeek": sum(count for day, count in doc.get("days", {}).items() if day in week),
+            "averageFocus": round(_avg(doc.get("focus_sum", 0), doc.get("focus_count", 0)) * 100, 1),
+            "codingAccuracy": round((solved / attempted * 100), 1) if attempted > 0 else 0,
+            "lastActive": doc.get("lastActive"),
+            "recentInterview": doc.get("recent"),
+        },
+        "performance": {
+            category: round(_avg(scores.get(category, {}).get("sum", 0), scores.get(category, {}).get("count", 0)), 2)
+            for category in CATEGORIES
+        },
+        "coding": {
+            "solved": solved,
+            "attempted": attempted,
+            "commonMistakes": doc.get("mistakes", [])[:MAX_MISTAKES],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute stats from the interviews collection")
+    parser.add_argument("--user", help="only this userId")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.error("nothing to do: pass --rebuild")
+    written = rebuild(args.user)
+    print(f"✅ Rebuilt stats for {written} user(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 # vector_memory.py
 
-from langchain_community.vectorstores.faiss import FAISS
-from langchain_community.docstore.in_memory import InMemoryDocstore
-from langchain_community.vectorstores.faiss import dependable_faiss_import
-from langchain_community.embeddings import HuggingFaceEmbeddings
+import numpy as np
+
+from backend.embedding_service import embedding_service
+
+DUPLICATE_THRESHOLD = 0.8  # cosine similarity above which two questions cover the same topic
 
 class VectorMemory:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    def __init__(self):
         self.qa_pairs = []  # List of {"question": q, "answer": a}
+        self._matrix = None      # (n_embedded, dim) normalized question embeddings
+        self._unembedded = []    # questions added since the last query
         self.stopwords = {
             'the', 'and', 'for', 'you', 'your', 'can', 'with', 'that', 'this',
             'from', 'have', 'had', 'been', 'they', 'their', 'what', 'when', 'how',
@@ -19,8 +21,32 @@ class VectorMemory:
 
     def add_qa(self, question, answer):
         self.qa_pairs.append({"question": question, "answer": answer})
+        self._unembedded.append(question)
+
+    def is_duplicate_topic(self, new_question, threshold=DUPLICATE_THRESHOLD):
+        """
+        True if `new_question` is semantically close to any past question.
+        Pending questions and the new one are encoded in a single batch, then
+        the check is one matrix-vector product.
+        """
+        if not self.qa_pairs:
+            return False
+
+        try:
+            vectors = embedding_service.encode(self._unembedded + [new_question])
+        except Exception as e:
+            print(f"[VectorMemory] embeddings unavailable, using keyword overlap: {e}")
+            return self._keyword_duplicate(new_question)
+
+        if self._unembedded:
+            new_rows = vectors[:-1]
+            self._matrix = new_rows if self._matrix is None else np.vstack((self._matrix, new_rows))
+            self._unembedded = []
+
+        similarities = self._matrix @ vectors[-1]
+        return bool(similarities.max() >= threshold)
 
-    def is_duplicate_topic(self, new_question):
+    def _keyword_duplicate(self, new_question):
         new_keywords = self._extract_keywords(new_question)
 
         for past in self.qa_pairs:
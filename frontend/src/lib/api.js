@@ -214,10 +214,23 @@ export const getInterviewFeedback = async () => {
 export const getFeedback = getInterviewFeedback;
 
 // ---------- Interview History ----------
-export const getInterviewHistory = async () => {
+// One page of interview summaries (newest first); nextCursor is null on the last page
+export const getInterviewHistoryPage = async (cursor = null, limit = 50) => {
   const headers = await applyAuthToken();
-  const response = await api.get("/api/interviews", { headers });
-  // return as-is; backend should ensure _id is string and fields present
+  const response = await api.get("/api/interviews", {
+    headers,
+    params: cursor ? { cursor, limit } : { limit },
+  });
+  return { items: response.data, nextCursor: response.headers["x-next-cursor"] || null };
+};
+
+// The few newest summaries, for the Dashboard's history table
+export const getRecentInterviews = async (limit = 5) => {
+  const headers = await applyAuthToken();
+  const response = await api.get("/api/dashboard/recent-interviews", {
+    headers,
+    params: { limit },
+  });
   return response.data;
 };
 
@@ -255,6 +268,19 @@ export const getDashboardStats = async () => {
   return response.data;
 };
 
+export const getPerformance = async () => {
+  const headers = await applyAuthToken();
+  const response = await api.get("/api/dashboard/performance", { headers });
+  return response.data;
+};
+
+// ---------- Dashboard Summary (stats, performance, coding, trend, notifications) ----------
+export const getDashboardSummary = async () => {
+  const headers = await applyAuthToken();
+  const response = await api.get("/api/dashboard/summary", { headers });
+  return response.data;
+};
+
 // ---------- User Profile ----------
 export const getUserProfile = async () => {
   const headers = await applyAuthToken();
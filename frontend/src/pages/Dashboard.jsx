@@ -1,7 +1,7 @@
 import {
   getUserProfile,
-  getDashboardStats,
-  getInterviewHistory,
+  getDashboardSummary,
+  getRecentInterviews,
   getInterview,
 } from "../lib/api";
 import { Loader2 } from "lucide-react";
@@ -92,6 +92,7 @@ const notifications = [
 ];
 
 const COLORS = ["#9333ea", "#e9d5ff"];
+const RECENT_INTERVIEWS = 5; // rows in the history table; the rest live on /interviews
 
 // =============== BADGE DEFINITIONS (v2 with progress) ===============
 
@@ -297,6 +298,7 @@ export default function Dashboard() {
   const [Profile, setProfile] = useState(null);
   const [stats, setStats] = useState(null);
   const [interviews, setInterviews] = useState([]);
+  const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
 
   const [expandedInterviewId, setExpandedInterviewId] = useState(null);
@@ -319,29 +321,13 @@ export default function Dashboard() {
 
   const navigate = useNavigate();
 
-  // ---------- Aggregations from interviews ----------
+  // ---------- Aggregations over the whole history ----------
+  // `history` is the summary's trend: one small row per interview (date,
+  // confidence %, mode, score); `interviews` only holds the recent rows
 
-  const totalInterviews = interviews.length;
+  const totalInterviews = stats?.totalInterviews ?? history.length;
 
-  const averageConfidencePercent = (() => {
-    if (!interviews || interviews.length === 0) return "0.0";
-
-    let sum = 0;
-    let count = 0;
-
-    for (const interview of interviews) {
-      const val =
-        interview.average_confidence ?? interview.avg_confidence ?? null;
-      if (typeof val === "number") {
-        sum += val;
-        count += 1;
-      }
-    }
-
-    if (count === 0) return "0.0";
-    const avg = (sum / count) * 100;
-    return avg.toFixed(1);
-  })();
+  const averageConfidencePercent = Number(stats?.avgConfidence || 0).toFixed(1);
 
   const codingAccuracyPercent = "0";
 
@@ -353,14 +339,14 @@ export default function Dashboard() {
       coding: { label: "Coding", sum: 0, count: 0 },
     };
 
-    if (!interviews || interviews.length === 0) {
+    if (history.length === 0) {
       return Object.values(categories).map((c) => ({
         category: c.label,
         value: 0,
       }));
     }
 
-    interviews.forEach((iv) => {
+    history.forEach((iv) => {
       const modeRaw = iv.mode || "";
       const mode = modeRaw.trim().toLowerCase();
 
@@ -383,14 +369,9 @@ export default function Dashboard() {
 
       if (!key) return;
 
-      const conf =
-        typeof iv.average_confidence === "number"
-          ? iv.average_confidence
-          : typeof iv.avg_confidence === "number"
-          ? iv.avg_confidence
-          : null;
-
-      if (conf == null) return;
+      // Interviews saved without a confidence come through as 0
+      const conf = iv.confidence;
+      if (!conf) return;
 
       categories[key].sum += conf;
       categories[key].count += 1;
@@ -398,7 +379,7 @@ export default function Dashboard() {
 
     return Object.values(categories).map((c) => ({
       category: c.label,
-      value: c.count ? Math.round((c.sum / c.count) * 100) : 0,
+      value: c.count ? Math.round(c.sum / c.count) : 0,
     }));
   })();
 
@@ -410,14 +391,14 @@ export default function Dashboard() {
       coding: { label: "Coding", sum: 0, count: 0 },
     };
 
-    if (!interviews || interviews.length === 0) {
+    if (history.length === 0) {
       return Object.values(categories).map((c) => ({
         category: c.label,
         value: 0,
       }));
     }
 
-    interviews.forEach((iv) => {
+    history.forEach((iv) => {
       const modeRaw = iv.mode || "";
       const mode = modeRaw.trim().toLowerCase();
 
@@ -440,20 +421,8 @@ export default function Dashboard() {
 
       if (!key) return;
 
-      const technicalScore = iv.feedback?.technical?.score;
-      const behavioralScore = iv.feedback?.behavioral?.score;
-      const codingScore = iv.feedback?.coding?.score;
-
-      const score =
-        typeof technicalScore === "number"
-          ? technicalScore
-          : typeof behavioralScore === "number"
-          ? behavioralScore
-          : typeof codingScore === "number"
-          ? codingScore
-          : null;
-
-      if (score == null) return;
+      const score = iv.score;
+      if (typeof score !== "number") return;
 
       categories[key].sum += score;
       categories[key].count += 1;
@@ -486,7 +455,7 @@ export default function Dashboard() {
     : "No data yet";
 
   const interviewCountByDate = {};
-  interviews.forEach((iv) => {
+  history.forEach((iv) => {
     if (!iv.date) return;
     const d = new Date(iv.date);
     if (isNaN(d.getTime())) return;
@@ -498,7 +467,7 @@ export default function Dashboard() {
 
   const lastInterviewDate = (() => {
     let latest = null;
-    interviews.forEach((iv) => {
+    history.forEach((iv) => {
       if (!iv.date) return;
       const d = new Date(iv.date);
       if (isNaN(d.getTime())) return;
@@ -518,13 +487,13 @@ export default function Dashboard() {
     : "No interviews yet";
 
   const thisWeekInterviews = (() => {
-    if (!interviews || interviews.length === 0) return 0;
+    if (history.length === 0) return 0;
 
     const now = new Date();
     const sevenDaysAgo = new Date();
     sevenDaysAgo.setDate(now.getDate() - 6);
 
-    return interviews.reduce((count, iv) => {
+    return history.reduce((count, iv) => {
       if (!iv.date) return count;
       const d = new Date(iv.date);
       if (isNaN(d.getTime())) return count;
@@ -536,10 +505,10 @@ export default function Dashboard() {
   })();
 
   const currentStreak = (() => {
-    if (!interviews || interviews.length === 0) return 0;
+    if (history.length === 0) return 0;
 
     const dateSet = new Set();
-    interviews.forEach((iv) => {
+    history.forEach((iv) => {
       if (!iv.date) return;
       const d = new Date(iv.date);
       if (isNaN(d.getTime())) return;
@@ -566,21 +535,15 @@ export default function Dashboard() {
   }`;
 
   const confidenceTrendData = (() => {
-    if (!interviews || interviews.length === 0) return [];
+    if (history.length === 0) return [];
 
-    const withConf = interviews
+    const withConf = history
       .filter((iv) => iv.date)
       .map((iv) => {
-        const raw =
-          typeof iv.average_confidence === "number"
-            ? iv.average_confidence
-            : typeof iv.avg_confidence === "number"
-            ? iv.avg_confidence
-            : null;
-        if (raw == null) return null;
+        if (typeof iv.confidence !== "number") return null;
         const d = new Date(iv.date);
         if (isNaN(d.getTime())) return null;
-        return { dateObj: d, conf: raw * 100 };
+        return { dateObj: d, conf: iv.confidence };
       })
       .filter(Boolean);
 
@@ -679,13 +642,16 @@ export default function Dashboard() {
       try {
         setLoading(true);
 
-        const [profileData, statsDataResp, interviewsData] = await Promise.all(
-          [getUserProfile(), getDashboardStats(), getInterviewHistory()]
-        );
+        const [profileData, summary, recentInterviews] = await Promise.all([
+          getUserProfile(),
+          getDashboardSummary(),
+          getRecentInterviews(RECENT_INTERVIEWS),
+        ]);
 
         setProfile(profileData);
-        setStats(statsDataResp);
-        setInterviews(interviewsData);
+        setStats(summary.stats);
+        setHistory(summary.trend || []);
+        setInterviews(recentInterviews);
       } catch (err) {
         console.error("Error fetching data:", err);
       } finally {
@@ -1676,6 +1642,16 @@ export default function Dashboard() {
                     </tbody>
                   </table>
                 </div>
+                {totalInterviews > interviews.length && (
+                  <div className="px-6 py-3 border-t border-gray-100 dark:border-gray-700 text-center">
+                    <button
+                      onClick={() => navigate("/interviews")}
+                      className="text-purple-600 dark:text-purple-400 hover:text-purple-700 dark:hover:text-purple-300 text-xs font-medium"
+                    >
+                      View all {totalInterviews} interviews
+                    </button>
+                  </div>
+                )}
               </div>
             </div>
           </div>
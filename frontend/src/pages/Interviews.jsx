@@ -9,13 +9,22 @@ import {
 } from "lucide-react";
 import { useNavigate, useLocation } from "react-router-dom";
 import { useState, useEffect } from "react";
-import { getInterviewHistory } from "../lib/api";
+import {
+  getDashboardStats,
+  getInterviewHistoryPage,
+  getPerformance,
+} from "../lib/api";
+
+const PAGE_SIZE = 20;
 
 export default function Interviews() {
   const navigate = useNavigate();
   const location = useLocation();
   const [interviews, setInterviews] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [summary, setSummary] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   useEffect(() => {
@@ -32,11 +41,15 @@ export default function Interviews() {
     setLoading(true);
     setError(null);
     try {
-      const data = await getInterviewHistory();
-      const sortedData = data.sort(
-        (a, b) => new Date(b.date) - new Date(a.date)
-      );
-      setInterviews(sortedData);
+      // Totals come from the stats endpoints; only the first page of rows is fetched
+      const [page, statsData, performance] = await Promise.all([
+        getInterviewHistoryPage(null, PAGE_SIZE),
+        getDashboardStats(),
+        getPerformance(),
+      ]);
+      setInterviews(page.items);
+      setNextCursor(page.nextCursor);
+      setSummary({ ...statsData, technicalScore: performance?.technical });
     } catch (err) {
       console.error("Failed to load interviews:", err);
       setError("Failed to load interview history. Please try again.");
@@ -45,6 +58,20 @@ export default function Interviews() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await getInterviewHistoryPage(nextCursor, PAGE_SIZE);
+      setInterviews((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Failed to load more interviews:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleNewInterview = () => navigate("/setup");
   const handleViewInterview = (id) => navigate(`/interviews/${id}`);
 
@@ -106,41 +133,13 @@ export default function Interviews() {
     </div>
   );
 
-  // Calculate dashboard stats
+  // Dashboard stats, over the whole history (server-side)
   const stats = {
-    total: interviews.length,
-
-    // Average confidence (0–1 -> %)
-    avgConfidence:
-      interviews.length > 0
-        ? Math.round(
-            (interviews.reduce(
-              (sum, i) => sum + (i.average_confidence || 0),
-              0
-            ) /
-              interviews.length) *
-              100
-          )
-        : 0,
-
-    // Average technical score → based on feedback.overall (0–5)
-    avgScore:
-      interviews.length > 0
-        ? (() => {
-            const valid = interviews.filter((i) => i.feedback?.overall);
-            if (valid.length === 0) return "N/A";
-
-            const sum = valid.reduce(
-              (acc, i) => acc + Number(i.feedback.overall),
-              0
-            );
-
-            const avg5 = sum / valid.length; // 0–5
-            const avgPercent = Math.round((avg5));
-
-            return avgPercent + "%";
-          })()
-        : "0%",
+    total: summary?.totalInterviews ?? interviews.length,
+    avgConfidence: Math.round(summary?.avgConfidence || 0),
+    avgScore: summary?.technicalScore
+      ? `${Math.round(summary.technicalScore)}%`
+      : "N/A",
   };
 
   // Table: primary score = feedback.overall → %
@@ -355,6 +354,22 @@ export default function Interviews() {
                   })}
                 </tbody>
               </table>
+
+              {nextCursor && (
+                <div className="flex justify-center pt-4">
+                  <Button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    variant="outline"
+                    className="text-sm"
+                  >
+                    {loadingMore && (
+                      <Loader2 className="mr-2 h-4 w-4 animate-spin" />
+                    )}
+                    Load more
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -364,7 +379,7 @@ export default function Interviews() {
         <p className="text-[11px] text-gray-500 dark:text-gray-400 text-center">
           You have completed{" "}
           <span className="font-semibold text-gray-700 dark:text-gray-200">
-            {interviews.length}
+            {stats.total}
           </span>{" "}
           interviews. Keep practicing!
         </p>